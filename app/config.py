@@ -16,8 +16,12 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'ai-food-alcohol-pairing-secret-key'
     
     # Database Settings
-    DATABASE_PATH = Path(__file__).parent / 'food_alcohol_system.db'
+    # Skor önbelleği, katalog deposu ve en iyi K indeksi bu dosyanın yanında tutulur
+    DATABASE_PATH = Path(os.environ.get('DATABASE_PATH') or Path(__file__).resolve().parent.parent / 'food_alcohol_system.db')
     DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+    # Puan yazma kipi: sync (istek başına işlem), group (toplu işlem, istek işlenene kadar bekler),
+    # async (toplu işlem, beklemeden döner; çökmede son birkaç ms'lik puanlar kaybolabilir)
+    RATING_DURABILITY = os.environ.get('RATING_DURABILITY', 'sync')
     
     # AI Algorithm Parameters
     AI_CONFIG = {
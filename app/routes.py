@@ -4,20 +4,90 @@ Tüm web endpoint'leri burada tanımlanır
 """
 
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, flash
+from app.config import Config
 from core.matcher import AIFoodAlcoholMatcher
-from app.utils.cache import load_trending_cache, save_trending_cache, TRENDING_CACHE_FILE
+from core.constraints import CatalogConstraints, PRICE_LEVELS
+from core.table_pairing import OBJECTIVES
+from core.suggest import MAX_SUGGESTIONS
+from app.utils.cache import load_trending_cache, save_trending_cache, update_trending_cache, TRENDING_CACHE_FILE
 from app.utils.translations import (
     FLAVOR_TRANSLATIONS, PRICE_TRANSLATIONS, BODY_TRANSLATIONS,
-    TYPE_TRANSLATIONS, SUBTYPE_TRANSLATIONS, REGION_TRANSLATIONS
+    TYPE_TRANSLATIONS, SUBTYPE_TRANSLATIONS, REGION_TRANSLATIONS, CUISINE_TRANSLATIONS
 )
 import random
 import os
+import numpy as np
 from pathlib import Path
 
 bp = Blueprint('main', __name__)
 
 # Global eşleştirici örneği
-matcher = AIFoodAlcoholMatcher()
+matcher = AIFoodAlcoholMatcher(database_path=Config.DATABASE_PATH, rating_durability=Config.RATING_DURABILITY)
+
+# Öneri sayfalama sınırları
+DEFAULT_RECOMMENDATION_LIMIT = 5
+MAX_RECOMMENDATION_LIMIT = 50
+MAX_BATCH_FOODS = 200
+MAX_TABLE_BOTTLES = 3
+DEFAULT_SUGGESTION_LIMIT = 8
+DEFAULT_HISTORY_LIMIT = 20
+MAX_HISTORY_LIMIT = 100
+# Öneri sayfasındaki yemek ızgarası bu boyutta sayfalarla yüklenir
+DEFAULT_FOOD_PAGE_LIMIT = 24
+MAX_FOOD_PAGE_LIMIT = 100
+
+# Trend listesine yalnızca bu skorun üzerindeki eşleştirmeler girer
+TRENDING_MIN_SCORE = 50
+
+def _trending_food(food):
+    """Trend önbelleğindeki yemek kaydı"""
+    return {
+        'id': food.id,
+        'name': food.name,
+        'cuisine_type': food.cuisine_type,
+        'intensity': food.intensity,
+        'flavor_profile': food.flavor_profile
+    }
+
+def _trending_alcohol(alcohol):
+    """Trend önbelleğindeki alkol kaydı"""
+    return {
+        'id': alcohol.id,
+        'name': alcohol.name,
+        'type': alcohol.type,
+        'alcohol_content': alcohol.alcohol_content
+    }
+
+def _refresh_trending_entries(kind, old_item, item):
+    """
+    Katalogda değişen öğeyi içeren trend kayıtlarını güncelle: silinen öğenin
+    kayıtları çıkarılır, değişen öğeninkiler yeniden skorlanır. Diğer kayıtlar
+    ve haftalık seçim olduğu gibi kalır.
+    """
+    if old_item is None:
+        return
+    
+    def update(pairings):
+        refreshed = []
+        for pairing in pairings:
+            if pairing[kind]['id'] != old_item.id:
+                refreshed.append(pairing)
+                continue
+            if item is None:
+                continue
+            food = matcher.catalog.get_food(pairing['food']['id'])
+            alcohol = matcher.catalog.get_alcohol(pairing['alcohol']['id'])
+            if food is None or alcohol is None:
+                continue
+            score = matcher.calculate_compatibility_score(food, alcohol)
+            if score > TRENDING_MIN_SCORE:
+                refreshed.append({**pairing, 'food': _trending_food(food), 'alcohol': _trending_alcohol(alcohol),
+                                  'compatibility_score': round(score, 1)})
+        return refreshed
+    
+    update_trending_cache(update)
+
+matcher.catalog_listeners.append(_refresh_trending_entries)
 
 def get_weekly_trending_pairings(count=20):
     """
@@ -38,31 +108,21 @@ def get_weekly_trending_pairings(count=20):
     foods = matcher.foods
     alcohols = matcher.alcohols
     
-    for food in foods:
-        for alcohol in alcohols:
-            # Uyumluluk skoru hesapla
-            score = matcher.calculate_compatibility_score(food, alcohol)
-            
-            # Sadece iyi eşleştirmeleri dahil et (skor > 50)
-            if score > 50:
-                all_pairings.append({
-                    'food': {
-                        'id': food.id,
-                        'name': food.name,
-                        'cuisine_type': food.cuisine_type,
-                        'intensity': food.intensity,
-                        'flavor_profile': food.flavor_profile
-                    },
-                    'alcohol': {
-                        'id': alcohol.id,
-                        'name': alcohol.name,
-                        'type': alcohol.type,
-                        'alcohol_content': alcohol.alcohol_content
-                    },
-                    'compatibility_score': round(score, 1),
-                    'popularity_count': random.randint(15, 150),
-                    'average_rating': round(random.uniform(3.5, 5.0), 1)
-                })
+    # Tüm yemek×alkol skor matrisini tek seferde hesapla
+    scores = matcher.scoring_engine.score_matrix()
+    
+    # Sadece iyi eşleştirmeleri dahil et (skor > 50)
+    for food_index, alcohol_index in zip(*np.nonzero(scores > TRENDING_MIN_SCORE)):
+        food = foods[food_index]
+        alcohol = alcohols[alcohol_index]
+        score = float(scores[food_index, alcohol_index])
+        all_pairings.append({
+            'food': _trending_food(food),
+            'alcohol': _trending_alcohol(alcohol),
+            'compatibility_score': round(score, 1),
+            'popularity_count': random.randint(15, 150),
+            'average_rating': round(random.uniform(3.5, 5.0), 1)
+        })
     
     # Eğer yeterli eşleştirme yoksa
     if len(all_pairings) < count:
@@ -101,58 +161,345 @@ def alcohols():
 
 @bp.route('/recommend')
 def recommend():
-    """Food selection for recommendations"""
-    return render_template('recommend.html', foods=matcher.foods)
+    """Food selection for recommendations (ilk sayfa; kalanı /api/foods ile yüklenir)"""
+    foods, pagination = _food_page(0, DEFAULT_FOOD_PAGE_LIMIT)
+    return render_template('recommend.html', foods=foods, pagination=pagination)
+
+def _serialize_alcohol(alcohol):
+    """Alkolün çevrilmiş özelliklerini JSON yanıt formatına çevir"""
+    return {
+        'name': alcohol.name,
+        'type': TYPE_TRANSLATIONS.get(alcohol.type, alcohol.type),
+        'subtype': SUBTYPE_TRANSLATIONS.get(alcohol.subtype, alcohol.subtype),
+        'alcohol_content': alcohol.alcohol_content,
+        'region': REGION_TRANSLATIONS.get(alcohol.region.lower(), alcohol.region),
+        'price_range': PRICE_TRANSLATIONS.get(alcohol.price_range, alcohol.price_range),
+        'flavor_profile': [FLAVOR_TRANSLATIONS.get(f, f) for f in alcohol.flavor_profile],
+        'body': BODY_TRANSLATIONS.get(alcohol.body, alcohol.body)
+    }
+
+def _serialize_ai_recommendation(alcohol, score, explanation):
+    """AI önerisini JSON yanıt formatına çevir"""
+    return {
+        **_serialize_alcohol(alcohol),
+        'score': round(score, 1),
+        'explanation': explanation,
+        'source': 'ai'
+    }
+
+def _serialize_food(food):
+    """Yemeğin çevrilmiş özelliklerini JSON yanıt formatına çevir"""
+    return {
+        'name': food.name,
+        'cuisine_type': CUISINE_TRANSLATIONS.get(food.cuisine_type.lower(), food.cuisine_type),
+        'intensity': food.intensity,
+        'price_range': PRICE_TRANSLATIONS.get(food.price_range, food.price_range),
+        'flavor_profile': [FLAVOR_TRANSLATIONS.get(f, f) for f in food.flavor_profile]
+    }
+
+def _food_page(offset, limit):
+    """Katalog sırasıyla bir yemek sayfası ve sayfalama bilgisi"""
+    total = len(matcher.foods)
+    foods = matcher.foods[offset:offset + limit]
+    next_offset = offset + len(foods)
+    return foods, {
+        'offset': offset,
+        'limit': limit,
+        'total': total,
+        'next_offset': next_offset,
+        'has_more': next_offset < total
+    }
+
+def _serialize_food_recommendation(food, score, explanation):
+    """İçecek için önerilen yemeği JSON yanıt formatına çevir"""
+    return {
+        **_serialize_food(food),
+        'score': round(score, 1),
+        'explanation': explanation,
+        'source': 'ai'
+    }
+
+def _serialize_expert_recommendation(drink, score, explanation, expert_info):
+    """Uzman önerisini JSON yanıt formatına çevir"""
+    expert_data = {
+        'name': drink,
+        'score': score,
+        'explanation': explanation,
+        'source': 'expert'
+    }
+    if expert_info:
+        expert_data['expert'] = {
+            'name': expert_info.name,
+            'country': expert_info.country,
+            'bio': expert_info.bio,
+            'michelin_stars': expert_info.michelin_stars,
+            'speciality': expert_info.speciality,
+            'famous_for': expert_info.famous_for
+        }
+    return expert_data
+
+def _current_user_profile():
+    """Oturumdaki kullanıcının profilini döndür (yoksa None)"""
+    if 'user_id' in session:
+        return matcher.get_user_profile(session['user_id'])
+    return None
+
+def _query_filters(fields):
+    """Sorgu parametrelerinden kısıt filtrelerini oku (?type=wine,beer&abv=low)"""
+    filters = {}
+    for field in fields:
+        values = [v.strip() for arg in request.args.getlist(field) for v in arg.split(',') if v.strip()]
+        if values:
+            filters[field] = values
+    return filters
+
+def _unknown_filters_response(index, filters):
+    """Kısıt indeksinde bulunmayan filtre değerleri için 400 yanıtı (hepsi biliniyorsa None)"""
+    unknown = index.unknown_values(filters)
+    if not unknown:
+        return None
+    listed = ', '.join(f'{field}={value}' for field, values in unknown.items() for value in values)
+    return jsonify({'error': f'Unknown filter values: {listed}', 'unknown_filters': unknown}), 400
+
+def _json_filters(data, fields):
+    """JSON gövdesindeki 'filters' nesnesini doğrula; hatalıysa None döndür"""
+    filters = data.get('filters') or {}
+    if not isinstance(filters, dict):
+        return None
+    for field, values in filters.items():
+        if field not in fields or not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return None
+    return filters
 
 @bp.route('/api/recommendations/<food_name>')
 def api_recommendations(food_name):
-    """Öneri almak için API uç noktası"""
-    user_profile = None
-    if 'user_id' in session and session['user_id'] in matcher.user_profiles:
-        user_profile = matcher.user_profiles[session['user_id']]
+    """Öneri almak için API uç noktası (offset/limit ile sayfalı)"""
+    user_profile = _current_user_profile()
+    
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', DEFAULT_RECOMMENDATION_LIMIT, type=int)), MAX_RECOMMENDATION_LIMIT)
     
-    all_recommendations = matcher.get_recommendations(food_name.replace('-', ' '), user_profile, top_n=5)
+    filters = _query_filters(CatalogConstraints.ALCOHOL_FILTERS)
+    error = _unknown_filters_response(matcher.constraints.alcohols, filters)
+    if error:
+        return error
+    
+    all_recommendations = matcher.get_recommendations(
+        food_name, user_profile, top_n=limit, offset=offset, filters=filters
+    )
     
     # AI önerileri
-    ai_result = []
-    for alcohol, score, explanation in all_recommendations["ai_recommendations"]:
-        ai_result.append({
-            'name': alcohol.name,
-            'type': TYPE_TRANSLATIONS.get(alcohol.type, alcohol.type),
-            'subtype': SUBTYPE_TRANSLATIONS.get(alcohol.subtype, alcohol.subtype),
-            'alcohol_content': alcohol.alcohol_content,
-            'region': REGION_TRANSLATIONS.get(alcohol.region.lower(), alcohol.region),
-            'price_range': PRICE_TRANSLATIONS.get(alcohol.price_range, alcohol.price_range),
-            'flavor_profile': [FLAVOR_TRANSLATIONS.get(f, f) for f in alcohol.flavor_profile],
-            'body': BODY_TRANSLATIONS.get(alcohol.body, alcohol.body),
-            'score': round(score, 1),
-            'explanation': explanation,
-            'source': 'ai'
-        })
+    ai_result = [
+        _serialize_ai_recommendation(alcohol, score, explanation)
+        for alcohol, score, explanation in all_recommendations["ai_recommendations"]
+    ]
     
     # Uzman önerileri
-    expert_result = []
-    for drink, score, explanation, expert_info in all_recommendations["expert_recommendations"]:
-        expert_data = {
-            'name': drink,
-            'score': score,
-            'explanation': explanation,
-            'source': 'expert'
+    expert_result = [
+        _serialize_expert_recommendation(*rec)
+        for rec in all_recommendations["expert_recommendations"]
+    ]
+    
+    total = all_recommendations["ai_total"]
+    next_offset = offset + len(ai_result)
+    
+    return jsonify({
+        'ai_recommendations': ai_result,
+        'expert_recommendations': expert_result,
+        'pagination': {
+            'offset': offset,
+            'limit': limit,
+            'total': total,
+            'next_offset': next_offset,
+            'has_more': next_offset < total
         }
-        if expert_info:
-            expert_data['expert'] = {
-                'name': expert_info.name,
-                'country': expert_info.country,
-                'bio': expert_info.bio,
-                'michelin_stars': expert_info.michelin_stars,
-                'speciality': expert_info.speciality,
-                'famous_for': expert_info.famous_for
+    })
+
+@bp.route('/api/recommendations/batch', methods=['POST'])
+def api_recommendations_batch():
+    """Bir menüdeki tüm yemekler için tek istekte öneri al (POS entegrasyonu)"""
+    data = request.get_json(silent=True) or {}
+    food_names = data.get('foods')
+    
+    if not isinstance(food_names, list) or not all(isinstance(name, str) for name in food_names):
+        return jsonify({'error': "'foods' must be a list of food names"}), 400
+    if len(food_names) > MAX_BATCH_FOODS:
+        return jsonify({'error': f'At most {MAX_BATCH_FOODS} foods per request'}), 400
+    
+    filters = _json_filters(data, CatalogConstraints.ALCOHOL_FILTERS)
+    if filters is None:
+        return jsonify({'error': f"'filters' keys must be among: {', '.join(CatalogConstraints.ALCOHOL_FILTERS)}"}), 400
+    error = _unknown_filters_response(matcher.constraints.alcohols, filters)
+    if error:
+        return error
+    
+    try:
+        top_n = int(data.get('top_n', DEFAULT_RECOMMENDATION_LIMIT))
+    except (TypeError, ValueError):
+        return jsonify({'error': "'top_n' must be an integer"}), 400
+    top_n = min(max(1, top_n), MAX_RECOMMENDATION_LIMIT)
+    batch = matcher.get_recommendations_batch(food_names, _current_user_profile(), top_n=top_n, filters=filters)
+    
+    results = []
+    for food_name in food_names:
+        recommendations = batch[food_name]
+        results.append({
+            'food': food_name,
+            'found': matcher.catalog.food_position(food_name) is not None,
+            'ai_recommendations': [
+                _serialize_ai_recommendation(alcohol, score, explanation)
+                for alcohol, score, explanation in recommendations['ai_recommendations']
+            ],
+            'expert_recommendations': [
+                _serialize_expert_recommendation(*rec)
+                for rec in recommendations['expert_recommendations']
+            ]
+        })
+    
+    return jsonify({'results': results})
+
+@bp.route('/api/foods_for/<alcohol_name>')
+def api_foods_for(alcohol_name):
+    """Bir içecek için en uyumlu yemekleri döndür (bar ekibi için ters arama)"""
+    if matcher.catalog.alcohol_position(alcohol_name) is None:
+        return jsonify({'error': 'Alcohol not found'}), 404
+    
+    limit = min(max(1, request.args.get('limit', DEFAULT_RECOMMENDATION_LIMIT, type=int)), MAX_RECOMMENDATION_LIMIT)
+    filters = _query_filters(CatalogConstraints.FOOD_FILTERS)
+    error = _unknown_filters_response(matcher.constraints.foods, filters)
+    if error:
+        return error
+    
+    recommendations = matcher.get_food_recommendations(
+        alcohol_name, _current_user_profile(), top_n=limit, filters=filters
+    )
+    
+    return jsonify({
+        'ai_recommendations': [
+            _serialize_food_recommendation(food, score, explanation)
+            for food, score, explanation in recommendations['ai_recommendations']
+        ],
+        # Uzman kayıtlarında 'name' alanı önerilen yemeği taşır
+        'expert_recommendations': [
+            _serialize_expert_recommendation(*rec)
+            for rec in recommendations['expert_recommendations']
+        ]
+    })
+
+@bp.route('/api/foods')
+def api_foods():
+    """Yemek kataloğunun bir sayfası (offset/limit ile sayfalı)"""
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', DEFAULT_FOOD_PAGE_LIMIT, type=int)), MAX_FOOD_PAGE_LIMIT)
+    foods, pagination = _food_page(offset, limit)
+    return jsonify({
+        # cuisine_code çevrilmemiş mutfak adıdır (bayrak simgesi için)
+        'foods': [{**_serialize_food(food), 'cuisine_code': food.cuisine_type} for food in foods],
+        'pagination': pagination
+    })
+
+@bp.route('/api/foods/suggest')
+def api_food_suggestions():
+    """Yazarken yemek önerileri (?q=iskender → İskender Kebap)"""
+    query = request.args.get('q', '')
+    limit = min(max(1, request.args.get('limit', DEFAULT_SUGGESTION_LIMIT, type=int)), MAX_SUGGESTIONS)
+    return jsonify({
+        'query': query,
+        'suggestions': [
+            {
+                'name': food.name,
+                'slug': matcher.catalog.food_slug(food),
+                'cuisine_type': CUISINE_TRANSLATIONS.get(food.cuisine_type.lower(), food.cuisine_type)
             }
-        expert_result.append(expert_data)
+            for food in matcher.suggest_foods(query, limit)
+        ]
+    })
+
+@bp.route('/api/similar/food/<food_name>')
+def api_similar_foods(food_name):
+    """Bir yemeğe benzeyen yemekler ("Adana Kebap gibi başka neler var?")"""
+    if matcher.catalog.food_position(food_name) is None:
+        return jsonify({'error': 'Food not found'}), 404
     
+    limit = min(max(1, request.args.get('limit', DEFAULT_RECOMMENDATION_LIMIT, type=int)), MAX_RECOMMENDATION_LIMIT)
+    filters = _query_filters(CatalogConstraints.FOOD_FILTERS)
+    error = _unknown_filters_response(matcher.constraints.foods, filters)
+    if error:
+        return error
+    similar = matcher.get_similar_foods(food_name, limit, filters)
     return jsonify({
-        'ai_recommendations': ai_result,
-        'expert_recommendations': expert_result
+        'similar': [
+            {**_serialize_food(food), 'similarity': round(similarity, 3)}
+            for food, similarity in similar
+        ]
+    })
+
+@bp.route('/api/similar/alcohol/<alcohol_name>')
+def api_similar_alcohols(alcohol_name):
+    """Bir içeceğe benzeyen içecekler (stokta olmayan şişeye alternatifler)"""
+    if matcher.catalog.alcohol_position(alcohol_name) is None:
+        return jsonify({'error': 'Alcohol not found'}), 404
+    
+    limit = min(max(1, request.args.get('limit', DEFAULT_RECOMMENDATION_LIMIT, type=int)), MAX_RECOMMENDATION_LIMIT)
+    filters = _query_filters(CatalogConstraints.ALCOHOL_FILTERS)
+    error = _unknown_filters_response(matcher.constraints.alcohols, filters)
+    if error:
+        return error
+    similar = matcher.get_similar_alcohols(alcohol_name, limit, filters)
+    return jsonify({
+        'similar': [
+            {**_serialize_alcohol(alcohol), 'similarity': round(similarity, 3)}
+            for alcohol, similarity in similar
+        ]
+    })
+
+@bp.route('/api/table_pairing', methods=['POST'])
+def api_table_pairing():
+    """Masadaki tüm yemekleri birlikte karşılayan k şişeyi seç"""
+    data = request.get_json(silent=True) or {}
+    food_names = data.get('foods')
+    objective = data.get('objective', 'min')
+    max_price_range = data.get('max_price_range')
+    
+    if not isinstance(food_names, list) or not all(isinstance(name, str) for name in food_names):
+        return jsonify({'error': "'foods' must be a list of food names"}), 400
+    if len(food_names) > MAX_BATCH_FOODS:
+        return jsonify({'error': f'At most {MAX_BATCH_FOODS} foods per request'}), 400
+    if objective not in OBJECTIVES:
+        return jsonify({'error': f"'objective' must be one of: {', '.join(OBJECTIVES)}"}), 400
+    if max_price_range is not None and max_price_range not in PRICE_LEVELS:
+        return jsonify({'error': f"'max_price_range' must be one of: {', '.join(PRICE_LEVELS)}"}), 400
+    filters = _json_filters(data, CatalogConstraints.ALCOHOL_FILTERS)
+    if filters is None:
+        return jsonify({'error': f"'filters' keys must be among: {', '.join(CatalogConstraints.ALCOHOL_FILTERS)}"}), 400
+    error = _unknown_filters_response(matcher.constraints.alcohols, filters)
+    if error:
+        return error
+    
+    try:
+        bottles = int(data.get('bottles', 1))
+    except (TypeError, ValueError):
+        return jsonify({'error': "'bottles' must be an integer"}), 400
+    bottles = min(max(1, bottles), MAX_TABLE_BOTTLES)
+    
+    pairing = matcher.get_table_pairing(
+        food_names, bottles, objective, max_price_range, _current_user_profile(), filters
+    )
+    
+    bottle_result = []
+    for alcohol in pairing['bottles']:
+        bottle = _serialize_alcohol(alcohol)
+        bottle['dishes'] = [
+            {'food': food.name, 'score': round(score, 1)}
+            for food, assigned, score in pairing['assignments'] if assigned.id == alcohol.id
+        ]
+        bottle_result.append(bottle)
+    
+    return jsonify({
+        'objective': objective,
+        'value': round(pairing['value'], 1),
+        'bottles': bottle_result,
+        'unknown_foods': pairing['unknown_foods']
     })
 
 @bp.route('/profile')
@@ -161,12 +508,34 @@ def profile():
     if 'user_id' not in session:
         return redirect(url_for('main.create_profile'))
     
-    user_profile = matcher.user_profiles.get(session['user_id'])
+    user_profile = matcher.get_user_profile(session['user_id'])
     if not user_profile:
         return redirect(url_for('main.create_profile'))
     
-    history = matcher.get_user_history(user_profile.user_id)
-    return render_template('profile.html', user=user_profile, history=history)
+    page = matcher.get_user_history_page(user_profile.user_id, DEFAULT_HISTORY_LIMIT)
+    return render_template('profile.html', user=user_profile, history=page['items'],
+                           next_cursor=page['next_cursor'])
+
+@bp.route('/api/history')
+def api_history():
+    """Oturumdaki kullanıcının eşleştirme geçmişi (limit ve cursor ile anahtar tabanlı sayfalı)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'User not logged in'}), 401
+    
+    limit = min(max(1, request.args.get('limit', DEFAULT_HISTORY_LIMIT, type=int)), MAX_HISTORY_LIMIT)
+    try:
+        page = matcher.get_user_history_page(session['user_id'], limit, request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'history': page['items'],
+        'pagination': {
+            'limit': limit,
+            'next_cursor': page['next_cursor'],
+            'has_more': page['next_cursor'] is not None
+        }
+    })
 
 @bp.route('/create_profile', methods=['GET', 'POST'])
 def create_profile():
@@ -210,6 +579,11 @@ def rate_pairing():
     
     return jsonify({'status': 'success'})
 
+@bp.route('/api/metrics/ratings')
+def api_rating_metrics():
+    """Puan yazma kuyruğunun derinliği ve yazma sayaçları"""
+    return jsonify(matcher.rating_writer.metrics())
+
 @bp.route('/trending')
 def trending():
     """Trending pairings page"""
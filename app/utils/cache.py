@@ -4,8 +4,10 @@
 
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, List
 
 TRENDING_CACHE_FILE = Path('data/trending_cache.json')
 TRENDING_CACHE_DAYS = 7
@@ -42,8 +44,35 @@ def save_trending_cache(pairings):
     }
     
     try:
-        with open(TRENDING_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        _write_trending_cache(cache)
     except Exception as e:
         print(f"⚠️ Önbellek kaydedilirken hata: {e}")
 
+
+def _write_trending_cache(cache):
+    """Önbelleği geçici dosyaya yazıp atomik olarak yerine koy (okuyucular yarım dosya görmez)"""
+    tmp_path = TRENDING_CACHE_FILE.with_name(TRENDING_CACHE_FILE.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, TRENDING_CACHE_FILE)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def update_trending_cache(update: Callable[[List], List]):
+    """
+    Önbellekteki trend eşleştirmelerini yerinde güncelle.
+    Zaman damgası korunur; önbelleğin haftalık ömrü uzamaz.
+    """
+    if not TRENDING_CACHE_FILE.exists():
+        return
+    
+    try:
+        with open(TRENDING_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        cache['pairings'] = update(cache['pairings'])
+        _write_trending_cache(cache)
+    except Exception as e:
+        print(f"⚠️ Önbellek güncellenirken hata: {e}")
@@ -0,0 +1,8 @@
+"""
+Ne Yenir? performans ölçümleri
+Sentetik kataloglar üzerinde skorlama ve öneri yollarını zamanlar; sonuçlar
+commit'ler arasında karşılaştırılabilen JSON olarak yazılır
+
+    python -m benchmarks --sizes 100 1000 10000 --output bench.json
+    python -m benchmarks.compare eski.json yeni.json
+"""
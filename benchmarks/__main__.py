@@ -0,0 +1,102 @@
+"""
+Ölçüm paketini komut satırından çalıştır
+
+    python -m benchmarks                                   # 10² … 10⁵, tüm ölçümler
+    python -m benchmarks --sizes 100 1000 --only get_recommendations --output bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.harness import MAX_CALLS, MIN_CALLS, TIME_BUDGET_S, run_safely
+from benchmarks.suite import BENCHMARKS, BenchmarkContext, scratch_directory
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+# Yemek kataloğu menü boyutunda tutulur; büyüyen taraf alkol kataloğudur
+DEFAULT_MAX_FOODS = 100
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _git_commit():
+    """Ölçülen kodun commit'i (git yoksa None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Ne Yenir? performans ölçümleri")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="alkol kataloğu boyutları (varsayılan: 100 1000 10000 100000)")
+    parser.add_argument('--max-foods', type=int, default=DEFAULT_MAX_FOODS,
+                        help="yemek kataloğunun en fazla boyutu")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="yalnızca bu ölçümler")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-calls', type=int, default=MIN_CALLS)
+    parser.add_argument('--max-calls', type=int, default=MAX_CALLS)
+    parser.add_argument('--time-budget', type=float, default=TIME_BUDGET_S,
+                        help="ölçüm başına saniye bütçesi")
+    parser.add_argument('--output', type=Path, help="JSON çıktı dosyası (varsayılan: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    names = args.only or list(BENCHMARKS)
+    options = {'min_calls': args.min_calls, 'max_calls': args.max_calls, 'time_budget_s': args.time_budget}
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'max_foods': args.max_foods,
+            'options': options,
+        },
+        'results': [],
+    }
+
+    # Uygulamanın kendi çıktıları JSON'a karışmasın diye stderr'e yönlendirilir
+    with scratch_directory(), contextlib.redirect_stdout(sys.stderr):
+        for size in args.sizes:
+            print(f"📦 {size} öğelik sentetik katalog hazırlanıyor...")
+            ctx = BenchmarkContext(size, args.max_foods, args.seed, args.max_calls)
+            for name in names:
+                result = run_safely(lambda: BENCHMARKS[name](ctx, **options))
+                report['results'].append({'benchmark': name, **ctx.shape(), **result})
+                _print_summary(name, size, result)
+
+    encoded = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(encoded + '\n', encoding='utf-8')
+    else:
+        print(encoded)
+
+
+def _print_summary(name: str, size: int, result: dict):
+    if 'skipped' in result:
+        print(f"  ⏭️  {name:<34} n={size:<7} atlandı: {result['skipped']}")
+        return
+    latency = result['latency_ms']
+    print(f"  ⏱️  {name:<34} n={size:<7} p50={latency['p50']:.3f}ms p99={latency['p99']:.3f}ms "
+          f"{result['throughput_pairs_per_s']:.0f} çift/s, tepe {result['peak_memory_bytes'] / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
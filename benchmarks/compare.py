@@ -0,0 +1,57 @@
+"""
+İki ölçüm raporunu karşılaştır
+
+    python -m benchmarks.compare eski.json yeni.json [--threshold 10]
+
+p50 gecikmesi eşikten (yüzde) fazla kötüleşen ölçüm varsa çıkış kodu 1 olur.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+def _index(report: Dict) -> Dict[Tuple[str, int], Dict]:
+    return {(r['benchmark'], r['catalog_size']): r for r in report['results'] if 'skipped' not in r}
+
+
+def _change(old: float, new: float) -> float:
+    """Yüzde değişim (pozitif = artış)"""
+    return (new - old) / old * 100 if old else 0.0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare')
+    parser.add_argument('baseline', type=Path)
+    parser.add_argument('candidate', type=Path)
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="gerileme sayılacak p50 artışı (yüzde)")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    candidate = json.loads(args.candidate.read_text(encoding='utf-8'))
+    old, new = _index(baseline), _index(candidate)
+
+    print(f"{baseline['meta'].get('git_commit') or '?'} → {candidate['meta'].get('git_commit') or '?'}")
+    print(f"{'ölçüm':<34} {'n':>7} {'p50':>9} {'p99':>9} {'verim':>9} {'bellek':>9}")
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        p50 = _change(a['latency_ms']['p50'], b['latency_ms']['p50'])
+        p99 = _change(a['latency_ms']['p99'], b['latency_ms']['p99'])
+        throughput = _change(a['throughput_pairs_per_s'] or 0, b['throughput_pairs_per_s'] or 0)
+        memory = _change(a['peak_memory_bytes'], b['peak_memory_bytes'])
+        flag = ''
+        if p50 > args.threshold:
+            regressions += 1
+            flag = '  ⚠️'
+        print(f"{key[0]:<34} {key[1]:>7} {p50:>+8.1f}% {p99:>+8.1f}% {throughput:>+8.1f}% {memory:>+8.1f}%{flag}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Ölçüm Düzeneği
+Bir çağrıyı ısınmadan sonra tekrar tekrar zamanlar; gecikme yüzdelikleri,
+saniyedeki yemek-alkol çifti sayısı ve (ayrı bir çalıştırmada) tracemalloc
+ile en yüksek bellek kullanımını raporlar
+"""
+
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+# Varsayılan ölçüm bütçesi: en az MIN_CALLS çağrı, en fazla MAX_CALLS çağrı
+# ya da TIME_BUDGET_S saniye (hangisi önce dolarsa)
+MIN_CALLS = 3
+MAX_CALLS = 1000
+TIME_BUDGET_S = 2.0
+WARMUP_CALLS = 1
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Sıralı değerlerde doğrusal aradeğerlemeyle q. yüzdelik (0-100)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def peak_memory(call: Callable[[int], object], index: int = 0) -> int:
+    """Tek bir çağrı boyunca ayrılan en yüksek bellek (bayt, tracemalloc ile)"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        call(index)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def measure(call: Callable[[int], object], pairs_per_call: int, min_calls: int = MIN_CALLS,
+            max_calls: int = MAX_CALLS, time_budget_s: float = TIME_BUDGET_S) -> Dict:
+    """
+    call(i) çağrısını i = 0, 1, ... ile zamanla. pairs_per_call bir çağrıda
+    skorlanan yemek-alkol çifti sayısıdır ve verim hesabında kullanılır.
+    """
+    for i in range(WARMUP_CALLS):
+        call(i)
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    while len(latencies) < max_calls:
+        t0 = time.perf_counter_ns()
+        call(WARMUP_CALLS + len(latencies))
+        latencies.append((time.perf_counter_ns() - t0) / 1e6)
+        if len(latencies) >= min_calls and time.perf_counter() - started >= time_budget_s:
+            break
+
+    total_s = sum(latencies) / 1000
+    ordered = sorted(latencies)
+    return {
+        'calls': len(latencies),
+        'pairs_per_call': pairs_per_call,
+        'throughput_pairs_per_s': pairs_per_call * len(latencies) / total_s if total_s > 0 else None,
+        'latency_ms': {
+            'mean': total_s * 1000 / len(latencies),
+            'p50': percentile(ordered, 50),
+            'p99': percentile(ordered, 99),
+            'max': ordered[-1],
+        },
+        'peak_memory_bytes': peak_memory(call, WARMUP_CALLS + len(latencies)),
+    }
+
+
+def skipped(reason: str) -> Dict:
+    """Çalıştırılamayan (ör. isteğe bağlı bağımlılığı eksik) ölçüm kaydı"""
+    return {'skipped': reason}
+
+
+def run_safely(measurement: Callable[[], Dict]) -> Optional[Dict]:
+    """Ölçümü çalıştır; ImportError isteğe bağlı bağımlılık eksikliği olarak raporlanır"""
+    try:
+        return measurement()
+    except ImportError as e:
+        return skipped(f"missing dependency: {e.name or e}")
@@ -0,0 +1,163 @@
+"""
+Ölçüm Tanımları
+Her ölçüm bir sentetik katalog ortamı alır ve harness.measure sonucunu döndürür
+"""
+
+import contextlib
+import io
+import logging
+import os
+import random
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.harness import measure
+from benchmarks.synthetic import synthetic_alcohols, synthetic_foods
+from core.catalog_store import CatalogStore
+from core.matcher import AIFoodAlcoholMatcher, UserProfile
+
+# Kişiselleştirilmiş ölçümlerde kullanılan sabit profil
+BENCHMARK_PROFILE = UserProfile(
+    user_id=1, name="benchmark", age=30, alcohol_tolerance="medium",
+    preferred_flavors=["fruity", "oak", "spicy"], dietary_restrictions=["vegan"],
+    budget_preference="mid-range", favorite_cuisines=["Turkish"],
+    disliked_alcohols=["beer"], previous_pairings=[],
+)
+
+# predict_compatibility öncesinde ML modellerinin eğitildiği örnek sayısı
+ML_TRAINING_EXAMPLES = 200
+
+
+class SyntheticMatcher(AIFoodAlcoholMatcher):
+    """Kataloğu verilen listelerden kuran eşleştirici; dosyalar geçerli dizine yazılır"""
+
+    def __init__(self, foods: List, alcohols: List):
+        self._synthetic_catalog = (foods, alcohols)
+        super().__init__()
+
+    def _load_catalog_store(self) -> CatalogStore:
+        return CatalogStore.build(*self._synthetic_catalog)
+
+
+class BenchmarkContext:
+    """Tek bir katalog boyutu için sentetik katalog, eşleştirici ve rastgele çiftler"""
+
+    def __init__(self, catalog_size: int, max_foods: int, seed: int, max_calls: int):
+        self.catalog_size = catalog_size
+        self.foods = synthetic_foods(min(catalog_size, max_foods), seed)
+        self.alcohols = synthetic_alcohols(catalog_size, seed)
+        self.matcher = SyntheticMatcher(self.foods, self.alcohols)
+
+        # Ölçümler arasında aynı çift dizisi kullanılır (ısınma ve bellek çağrıları dahil)
+        rng = random.Random(seed)
+        count = max_calls + 2
+        self.pairs: List[Tuple[int, int]] = [
+            (rng.randrange(len(self.foods)), rng.randrange(len(self.alcohols))) for _ in range(count)
+        ]
+        self.scores = [rng.uniform(40, 95) for _ in range(count)]
+
+    def pair(self, i: int):
+        food_index, alcohol_index = self.pairs[i % len(self.pairs)]
+        return self.foods[food_index], self.alcohols[alcohol_index]
+
+    def food_name(self, i: int) -> str:
+        return self.foods[self.pairs[i % len(self.pairs)][0]].name
+
+    def shape(self) -> Dict:
+        return {'catalog_size': self.catalog_size, 'foods': len(self.foods), 'alcohols': len(self.alcohols)}
+
+
+@contextlib.contextmanager
+def scratch_directory():
+    """Veritabanı ve önbellek dosyalarının yazılacağı geçici çalışma dizini"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="neyenir-bench-") as path:
+        os.chdir(path)
+        try:
+            yield path
+        finally:
+            os.chdir(previous)
+
+
+def bench_compatibility_score(ctx: BenchmarkContext, **options) -> Dict:
+    """Tek çift için referans (skaler) skor fonksiyonu"""
+    def call(i):
+        food, alcohol = ctx.pair(i)
+        ctx.matcher.calculate_compatibility_score(food, alcohol)
+    return measure(call, 1, **options)
+
+
+def bench_recommendations(ctx: BenchmarkContext, **options) -> Dict:
+    """Bir yemek için tüm alkollerden ilk 5 öneri"""
+    def call(i):
+        ctx.matcher.get_recommendations(ctx.food_name(i), None, top_n=5)
+    return measure(call, len(ctx.alcohols), **options)
+
+
+def bench_recommendations_personalized(ctx: BenchmarkContext, **options) -> Dict:
+    """Kullanıcı profiliyle (kişisel fark ve kısıt ön elemesi dahil) ilk 5 öneri"""
+    def call(i):
+        ctx.matcher.get_recommendations(ctx.food_name(i), BENCHMARK_PROFILE, top_n=5)
+    return measure(call, len(ctx.alcohols), **options)
+
+
+def bench_explanation(ctx: BenchmarkContext, **options) -> Dict:
+    """Rastgele çiftler için açıklama metni (önbellek isabetleri dahil)"""
+    def call(i):
+        food, alcohol = ctx.pair(i)
+        ctx.matcher._generate_explanation(food, alcohol, ctx.scores[i % len(ctx.scores)])
+    return measure(call, 1, **options)
+
+
+def bench_weekly_trending(ctx: BenchmarkContext, **options) -> Dict:
+    """Önbellek olmadan haftalık trend listesinin yeniden üretilmesi (tüm matris)"""
+    from app import routes
+
+    saved = (routes.matcher, routes.load_trending_cache, routes.save_trending_cache)
+    routes.matcher = ctx.matcher
+    routes.load_trending_cache = lambda: None
+    routes.save_trending_cache = lambda pairings: None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return measure(lambda i: routes.get_weekly_trending_pairings(20),
+                           len(ctx.foods) * len(ctx.alcohols), **options)
+    finally:
+        routes.matcher, routes.load_trending_cache, routes.save_trending_cache = saved
+
+
+def bench_ml_predict(ctx: BenchmarkContext, **options) -> Dict:
+    """Eğitilmiş ML topluluğu ile tek çift tahmini"""
+    from core.ml.engine import AdvancedFoodAlcoholMatcher, logger as ml_logger
+
+    ml = AdvancedFoodAlcoholMatcher()
+    training_data = []
+    for i in range(ML_TRAINING_EXAMPLES):
+        food, alcohol = ctx.pair(i)
+        score = ctx.matcher.calculate_compatibility_score(food, alcohol)
+        training_data.append({
+            'food_item': food, 'alcohol_item': alcohol, 'user_id': i % 10,
+            'food_id': food.id, 'alcohol_id': alcohol.id,
+            'rating': min(5, max(1, round(score / 20))),
+        })
+
+    level = ml_logger.level
+    ml_logger.setLevel(logging.WARNING)
+    try:
+        ml.train_models(training_data)
+    finally:
+        ml_logger.setLevel(level)
+
+    def call(i):
+        food, alcohol = ctx.pair(i)
+        ml.predict_compatibility(food, alcohol, BENCHMARK_PROFILE)
+    return measure(call, 1, **options)
+
+
+BENCHMARKS: Dict[str, Callable[..., Dict]] = {
+    'calculate_compatibility_score': bench_compatibility_score,
+    'get_recommendations': bench_recommendations,
+    'get_recommendations_personalized': bench_recommendations_personalized,
+    'generate_explanation': bench_explanation,
+    'get_weekly_trending_pairings': bench_weekly_trending,
+    'predict_compatibility': bench_ml_predict,
+}
@@ -0,0 +1,112 @@
+"""
+Sentetik Katalog Üretici
+core/expanded_database.py'deki alan dağılımlarından (kategori sıklıkları,
+lezzet profili uzunlukları ve lezzet sıklıkları, sayısal değerler) örnekleme
+yaparak istenen boyutta yemek ve alkol katalogları üretir
+"""
+
+import random
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Sequence, Tuple
+
+from core.matcher import Alcohol, Food
+
+FOOD_CATEGORY_FIELDS = ('cuisine_type', 'texture', 'cooking_method', 'price_range', 'serving_temp')
+FOOD_NUMERIC_FIELDS = ('intensity',)
+FOOD_LIST_FIELDS = ('flavor_profile', 'main_ingredients', 'dietary_tags')
+
+ALCOHOL_CATEGORY_FIELDS = ('type', 'subtype', 'body', 'price_range', 'region')
+ALCOHOL_NUMERIC_FIELDS = ('alcohol_content', 'sweetness', 'acidity', 'tannins', 'vintage')
+ALCOHOL_LIST_FIELDS = ('flavor_profile',)
+
+
+class FieldDistribution:
+    """Bir katalog listesinin alan bazında gözlenen (marjinal) dağılımları"""
+
+    def __init__(self, items: Sequence, scalar_fields: Sequence[str], list_fields: Sequence[str]):
+        self.names = [item.name for item in items]
+        self.scalars: Dict[str, Tuple[List, List[int]]] = {}
+        for field in scalar_fields:
+            counts = Counter(getattr(item, field) for item in items)
+            self.scalars[field] = (list(counts), list(accumulate(counts.values())))
+
+        # Liste alanları: uzunluk dağılımı ve öğe sıklıkları ayrı tutulur
+        self.lists: Dict[str, Tuple[List[int], List[int], List, List[int]]] = {}
+        for field in list_fields:
+            lengths = Counter(len(getattr(item, field)) for item in items)
+            values = Counter(v for item in items for v in getattr(item, field))
+            self.lists[field] = (list(lengths), list(accumulate(lengths.values())),
+                                 list(values), list(accumulate(values.values())))
+
+    def scalar(self, rng: random.Random, field: str):
+        values, cum_weights = self.scalars[field]
+        return rng.choices(values, cum_weights=cum_weights)[0]
+
+    def sample_list(self, rng: random.Random, field: str) -> List:
+        """Uzunluğu ve öğeleri gözlenen sıklıklarla seçilmiş, tekrarsız bir liste"""
+        lengths, length_weights, values, value_weights = self.lists[field]
+        length = min(rng.choices(lengths, cum_weights=length_weights)[0], len(values))
+        chosen: List = []
+        while len(chosen) < length:
+            value = rng.choices(values, cum_weights=value_weights)[0]
+            if value not in chosen:
+                chosen.append(value)
+        return chosen
+
+    def name(self, rng: random.Random, item_id: int) -> str:
+        """Gerçek isim uzunluklarına benzeyen, katalog içinde tekil bir isim"""
+        return f"{rng.choice(self.names)} #{item_id}"
+
+
+def _reference_catalog() -> Tuple[List[Food], List[Alcohol]]:
+    from core.expanded_database import get_expanded_alcohol_database, get_expanded_food_database
+    return get_expanded_food_database(), get_expanded_alcohol_database()
+
+
+def synthetic_foods(count: int, seed: int = 0) -> List[Food]:
+    """Genişletilmiş yemek veritabanının dağılımlarıyla `count` yemek üret"""
+    foods, _ = _reference_catalog()
+    distribution = FieldDistribution(foods, FOOD_CATEGORY_FIELDS + FOOD_NUMERIC_FIELDS, FOOD_LIST_FIELDS)
+    rng = random.Random(seed)
+    return [
+        Food(
+            id=i,
+            name=distribution.name(rng, i),
+            cuisine_type=distribution.scalar(rng, 'cuisine_type'),
+            flavor_profile=distribution.sample_list(rng, 'flavor_profile'),
+            intensity=distribution.scalar(rng, 'intensity'),
+            texture=distribution.scalar(rng, 'texture'),
+            cooking_method=distribution.scalar(rng, 'cooking_method'),
+            main_ingredients=distribution.sample_list(rng, 'main_ingredients'),
+            dietary_tags=distribution.sample_list(rng, 'dietary_tags'),
+            price_range=distribution.scalar(rng, 'price_range'),
+            serving_temp=distribution.scalar(rng, 'serving_temp'),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def synthetic_alcohols(count: int, seed: int = 0) -> List[Alcohol]:
+    """Genişletilmiş alkol veritabanının dağılımlarıyla `count` alkol üret"""
+    _, alcohols = _reference_catalog()
+    distribution = FieldDistribution(alcohols, ALCOHOL_CATEGORY_FIELDS + ALCOHOL_NUMERIC_FIELDS, ALCOHOL_LIST_FIELDS)
+    rng = random.Random(seed + 1)
+    return [
+        Alcohol(
+            id=i,
+            name=distribution.name(rng, i),
+            type=distribution.scalar(rng, 'type'),
+            subtype=distribution.scalar(rng, 'subtype'),
+            alcohol_content=distribution.scalar(rng, 'alcohol_content'),
+            flavor_profile=distribution.sample_list(rng, 'flavor_profile'),
+            body=distribution.scalar(rng, 'body'),
+            sweetness=distribution.scalar(rng, 'sweetness'),
+            acidity=distribution.scalar(rng, 'acidity'),
+            tannins=distribution.scalar(rng, 'tannins'),
+            price_range=distribution.scalar(rng, 'price_range'),
+            region=distribution.scalar(rng, 'region'),
+            vintage=distribution.scalar(rng, 'vintage'),
+        )
+        for i in range(1, count + 1)
+    ]
@@ -0,0 +1,144 @@
+"""
+Katalog İndeksi
+Yemek ve alkoller için id, Türkçe duyarlı isim ve URL slug'ı ile
+O(1) arama sağlayan indeks
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# Türkçe büyük/küçük harf dönüşümü: İ → i, I → ı
+_TURKISH_LOWER = str.maketrans({'İ': 'i', 'I': 'ı'})
+
+# Slug'larda kullanılan ASCII karşılıklar
+_ASCII_FOLD = str.maketrans({
+    'ı': 'i', 'ş': 's', 'ğ': 'g', 'ç': 'c', 'ö': 'o', 'ü': 'u',
+    'â': 'a', 'î': 'i', 'û': 'u',
+})
+
+_WHITESPACE = re.compile(r'\s+')
+_NON_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def turkish_casefold(text: str) -> str:
+    """Türkçe kurallarına göre küçük harfe çevir ve boşlukları sadeleştir"""
+    text = unicodedata.normalize('NFC', text).translate(_TURKISH_LOWER).lower()
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def ascii_fold(text: str) -> str:
+    """Türkçe küçük harfe çevirip tüm aksan ve noktalı/noktasız i farklarını kaldır"""
+    text = turkish_casefold(text).translate(_ASCII_FOLD)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def slugify(text: str) -> str:
+    """İsmi URL'de kullanılabilecek bir slug'a çevir (örn. 'Çiğ Köfte' → 'cig-kofte')"""
+    return _NON_SLUG.sub('-', ascii_fold(text)).strip('-')
+
+
+class _ItemIndex:
+    """Tek bir katalog listesi için id, isim ve slug eşlemeleri"""
+
+    def __init__(self, items: List):
+        self.items = items
+        self.by_id: Dict[int, int] = {}
+        self.by_name: Dict[str, int] = {}
+        self.by_slug: Dict[str, int] = {}
+        self.slugs: Dict[int, str] = {}
+
+        for position, item in enumerate(items):
+            self._add(position, item)
+
+    def _add(self, position: int, item):
+        self.by_id.setdefault(item.id, position)
+        self.by_name.setdefault(turkish_casefold(item.name), position)
+
+        # Aynı slug'a düşen isimler (örn. 'Manti' ve 'Mantı') id ile ayrıştırılır
+        slug = slugify(item.name) or str(item.id)
+        if slug in self.by_slug:
+            slug = f"{slug}-{item.id}"
+        self.by_slug[slug] = position
+        self.slugs[item.id] = slug
+
+    def _discard(self, position: int, item):
+        for mapping, key in ((self.by_id, item.id), (self.by_name, turkish_casefold(item.name)),
+                             (self.by_slug, self.slugs.pop(item.id, None))):
+            if mapping.get(key) == position:
+                del mapping[key]
+
+    def _shift(self, position: int, step: int):
+        """position ve sonrasındaki konumları kaydır"""
+        self.by_id, self.by_name, self.by_slug = (
+            {key: found + step if found >= position else found for key, found in mapping.items()}
+            for mapping in (self.by_id, self.by_name, self.by_slug)
+        )
+
+    def insert(self, position: int, item):
+        """Listeye position konumunda eklenen öğeyi indekse ekle"""
+        if position < len(self.items) - 1:
+            self._shift(position, 1)
+        self._add(position, item)
+
+    def replace(self, position: int, old_item, item):
+        """Konumdaki öğenin eski anahtarlarını yenileriyle değiştir"""
+        self._discard(position, old_item)
+        self._add(position, item)
+
+    def delete(self, position: int, old_item):
+        """Listeden çıkarılan öğenin anahtarlarını sil"""
+        self._discard(position, old_item)
+        self._shift(position + 1, -1)
+
+    def position(self, name_or_slug: str) -> Optional[int]:
+        """İsim ya da slug'a karşılık gelen liste konumunu bul"""
+        position = self.by_name.get(turkish_casefold(name_or_slug))
+        if position is None:
+            position = self.by_slug.get(slugify(name_or_slug))
+        return position
+
+
+class CatalogIndex:
+    """Yemek ve alkol kataloğu için birleşik arama indeksi"""
+
+    def __init__(self, foods: List, alcohols: List):
+        self.foods = _ItemIndex(foods)
+        self.alcohols = _ItemIndex(alcohols)
+
+    def food_position(self, name_or_slug: str) -> Optional[int]:
+        """Yemeğin katalog listesindeki konumunu isim ya da slug ile bul"""
+        return self.foods.position(name_or_slug)
+
+    def alcohol_position(self, name_or_slug: str) -> Optional[int]:
+        """Alkolün katalog listesindeki konumunu isim ya da slug ile bul"""
+        return self.alcohols.position(name_or_slug)
+
+    def find_food(self, name_or_slug: str):
+        """İsim ya da slug ile yemeği bul"""
+        position = self.foods.position(name_or_slug)
+        return None if position is None else self.foods.items[position]
+
+    def find_alcohol(self, name_or_slug: str):
+        """İsim ya da slug ile alkolü bul"""
+        position = self.alcohols.position(name_or_slug)
+        return None if position is None else self.alcohols.items[position]
+
+    def get_food(self, food_id: int):
+        """Id ile yemeği bul"""
+        position = self.foods.by_id.get(food_id)
+        return None if position is None else self.foods.items[position]
+
+    def get_alcohol(self, alcohol_id: int):
+        """Id ile alkolü bul"""
+        position = self.alcohols.by_id.get(alcohol_id)
+        return None if position is None else self.alcohols.items[position]
+
+    def food_slug(self, food) -> str:
+        """Yemeğin URL slug'ı"""
+        return self.foods.slugs[food.id]
+
+    def alcohol_slug(self, alcohol) -> str:
+        """Alkolün URL slug'ı"""
+        return self.alcohols.slugs[alcohol.id]
@@ -0,0 +1,390 @@
+"""
+Sütunlu Katalog Deposu
+Yemek ve alkol kataloğunu tipli sütunlar halinde (int8 yoğunluk, float32 ABV,
+sözlük kodlu kategoriler, uint64 lezzet bit maskeleri) tutar; sütunlar tek
+bir dosyaya yazılır ve çalışan süreçler arasında salt okunur bellek
+eşlemesiyle paylaşılır. Food/Alcohol nesneleri yalnızca istendiğinde üretilir.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Dosya düzeni değiştiğinde artırılır, eski depolar otomatik geçersiz olur
+CATALOG_STORE_FORMAT = 1
+
+# Sütunlar bu bayt sınırına hizalanır (bellek eşlemesinde hizalı okuma için)
+COLUMN_ALIGNMENT = 64
+
+# float32 ABV değerleri bu hassasiyete yuvarlanarak geri okunur (13.5, 4.8, ...)
+ABV_DECIMALS = 2
+
+# Yıllanma bilgisi olmayan alkoller için vintage sütunundaki değer
+NO_VINTAGE = 0
+
+# Kategorik alanlar; sözlük adı alan adıdır (price_range iki katalogda ortaktır)
+FOOD_CATEGORIES = ('cuisine_type', 'texture', 'cooking_method', 'price_range', 'serving_temp')
+ALCOHOL_CATEGORIES = ('type', 'subtype', 'body', 'price_range', 'region')
+
+# Liste alanları: alan → sözlük adı (sıra korunarak değişken uzunluklu kod dizisi olarak tutulur)
+FOOD_LISTS = {
+    'flavor_profile': 'flavor',
+    'main_ingredients': 'ingredient',
+    'dietary_tags': 'dietary_tag',
+}
+ALCOHOL_LISTS = {
+    'flavor_profile': 'flavor',
+}
+
+# Bit maskesi olarak da tutulan liste alanları
+FOOD_BITMASKS = ('flavor_profile', 'dietary_tags')
+ALCOHOL_BITMASKS = ('flavor_profile',)
+
+# Sayısal alanlar ve sütun tipleri
+FOOD_NUMERIC = {'id': np.int64, 'intensity': np.int8}
+ALCOHOL_NUMERIC = {
+    'id': np.int64,
+    'alcohol_content': np.float32,
+    'sweetness': np.int8,
+    'acidity': np.int8,
+    'tannins': np.int8,
+    'vintage': np.int16,
+}
+
+
+def _code_dtype(vocabulary_size: int):
+    """Sözlük boyutuna yetecek en küçük işaretsiz tamsayı tipi"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if vocabulary_size <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+def bit_words(n_bits: int) -> int:
+    """n_bits bit için gereken uint64 kelime sayısı (en az bir)"""
+    return max(1, (n_bits + 63) // 64)
+
+
+def encode_ragged(lists: Sequence, vocabulary: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Liste sütununu (ofsetler, kodlar) çiftine çevir; yeni değerler sözlüğe eklenir"""
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    codes = []
+    for row, values in enumerate(lists):
+        codes.extend(vocabulary.setdefault(v, len(vocabulary)) for v in values)
+        offsets[row + 1] = len(codes)
+    return offsets, np.array(codes, dtype=np.int64)
+
+
+def pack_code_rows(offsets: np.ndarray, codes: np.ndarray, n_bits: int) -> np.ndarray:
+    """Değişken uzunluklu kod satırlarını (satır, kelime) uint64 bit maskelerine paketle"""
+    n_rows = len(offsets) - 1
+    bits = np.zeros((n_rows, bit_words(n_bits)), dtype=np.uint64)
+    rows = np.repeat(np.arange(n_rows), np.diff(offsets))
+    codes = codes.astype(np.int64)
+    np.bitwise_or.at(bits, (rows, codes // 64), np.left_shift(np.uint64(1), (codes % 64).astype(np.uint64)))
+    return bits
+
+
+def has_code(bits: np.ndarray, code: int) -> np.ndarray:
+    """Bit maskesinde verilen kodun işaretli olduğu satırlar"""
+    word, bit = divmod(code, 64)
+    return ((bits[:, word] >> np.uint64(bit)) & np.uint64(1)) == 1
+
+
+def _decode_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """UTF-8 bayt bloğunu ofsetlere göre dizgelere aç"""
+    blob = data.tobytes()
+    return [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _encode_strings(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Dizgeleri tek bir UTF-8 bayt bloğu ve ofset dizisine çevir"""
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _record_types():
+    """Food ve Alcohol sınıfları (core.matcher bu modülü içe aktardığı için geç yüklenir)"""
+    from core.matcher import Alcohol, Food
+    return Food, Alcohol
+
+
+class _RecordSequence(Sequence):
+    """Katalog kayıtlarını yalnızca erişildiğinde üreten salt okunur liste görünümü"""
+
+    def __init__(self, size: int, factory: Callable[[int], object]):
+        self._size = size
+        self._factory = factory
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._factory(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("catalog index out of range")
+        return self._factory(index)
+
+
+class CatalogStore:
+    """
+    Yemek ve alkol kataloğunun sütunlu gösterimi.
+    Sütunlar 'food.<alan>' ve 'alcohol.<alan>' adlarıyla tutulur; kategoriler ve
+    liste öğeleri paylaşılan sözlüklerdeki kodlarla saklanır.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], vocabularies: Dict[str, List[str]],
+                 content_hash: str):
+        self.columns = columns
+        self.vocabularies = vocabularies
+        self.content_hash = content_hash
+        self.n_foods = len(columns['food.id'])
+        self.n_alcohols = len(columns['alcohol.id'])
+
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._names: Dict[str, List[str]] = {}
+        self.foods = _RecordSequence(self.n_foods, self.food)
+        self.alcohols = _RecordSequence(self.n_alcohols, self.alcohol)
+
+    # --- Oluşturma ---------------------------------------------------------
+
+    @classmethod
+    def build(cls, foods: Sequence, alcohols: Sequence) -> 'CatalogStore':
+        """Food/Alcohol listelerinden sütunlu depoyu oluştur"""
+        vocabularies: Dict[str, Dict[str, int]] = {}
+        columns: Dict[str, np.ndarray] = {}
+
+        for kind, items, numeric, categories, lists in (
+            ('food', foods, FOOD_NUMERIC, FOOD_CATEGORIES, FOOD_LISTS),
+            ('alcohol', alcohols, ALCOHOL_NUMERIC, ALCOHOL_CATEGORIES, ALCOHOL_LISTS),
+        ):
+            for field, dtype in numeric.items():
+                values = [getattr(item, field) for item in items]
+                if field == 'vintage':
+                    values = [NO_VINTAGE if v is None else v for v in values]
+                columns[f'{kind}.{field}'] = np.array(values, dtype=dtype)
+
+            data, offsets = _encode_strings(item.name for item in items)
+            columns[f'{kind}.name.data'] = data
+            columns[f'{kind}.name.offsets'] = offsets
+
+            for field in categories:
+                vocabulary = vocabularies.setdefault(field, {})
+                columns[f'{kind}.{field}'] = np.array(
+                    [vocabulary.setdefault(getattr(item, field), len(vocabulary)) for item in items],
+                    dtype=np.int64)
+
+            for field, vocabulary_name in lists.items():
+                vocabulary = vocabularies.setdefault(vocabulary_name, {})
+                offsets, codes = encode_ragged([getattr(item, field) for item in items], vocabulary)
+                columns[f'{kind}.{field}.offsets'] = offsets
+                columns[f'{kind}.{field}.codes'] = codes
+
+        # Kod tipleri ve bit maskesi genişlikleri sözlükler tamamlandıktan sonra belirlenir
+        for kind, categories, lists, bitmasks in (
+            ('food', FOOD_CATEGORIES, FOOD_LISTS, FOOD_BITMASKS),
+            ('alcohol', ALCOHOL_CATEGORIES, ALCOHOL_LISTS, ALCOHOL_BITMASKS),
+        ):
+            for field in categories:
+                dtype = _code_dtype(len(vocabularies[field]))
+                columns[f'{kind}.{field}'] = columns[f'{kind}.{field}'].astype(dtype)
+            for field, vocabulary_name in lists.items():
+                size = len(vocabularies[vocabulary_name])
+                codes = columns[f'{kind}.{field}.codes']
+                if field in bitmasks:
+                    columns[f'{kind}.{field}.bits'] = pack_code_rows(columns[f'{kind}.{field}.offsets'], codes, size)
+                columns[f'{kind}.{field}.codes'] = codes.astype(_code_dtype(size))
+
+        vocabulary_lists = {name: list(vocabulary) for name, vocabulary in vocabularies.items()}
+        return cls(columns, vocabulary_lists, cls._content_hash(columns, vocabulary_lists))
+
+    @staticmethod
+    def _content_hash(columns: Dict[str, np.ndarray], vocabularies: Dict[str, List[str]]) -> str:
+        """Sütun baytları ve sözlüklerin içerik özeti (SHA-256)"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'format': CATALOG_STORE_FORMAT, 'vocabularies': vocabularies},
+                                 ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        for name in sorted(columns):
+            column = np.ascontiguousarray(columns[name])
+            digest.update(f'{name}:{column.dtype.str}:{column.shape}'.encode('utf-8'))
+            digest.update(column.tobytes())
+        return digest.hexdigest()
+
+    # --- Kalıcılık ---------------------------------------------------------
+
+    @staticmethod
+    def _meta_path(path: Path) -> Path:
+        return Path(path).with_suffix('.json')
+
+    def save(self, path: Path, source_version: str):
+        """Sütunları tek bir dosyaya, düzen ve sözlükleri .json dosyasına atomik olarak yaz"""
+        path = Path(path)
+        meta_path = self._meta_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+
+        try:
+            layout = {}
+            offset = 0
+            tmp_data = path.with_name(path.name + suffix)
+            with open(tmp_data, 'wb') as f:
+                for name in sorted(self.columns):
+                    column = np.ascontiguousarray(self.columns[name])
+                    padding = -offset % COLUMN_ALIGNMENT
+                    f.write(b'\0' * padding)
+                    offset += padding
+                    layout[name] = {'offset': offset, 'dtype': column.dtype.str, 'shape': list(column.shape)}
+                    f.write(column.tobytes())
+                    offset += column.nbytes
+            os.replace(tmp_data, path)
+
+            # Meta en son yazılır; yalnızca tam bir sütun dosyasını işaret eder
+            meta = {
+                'format': CATALOG_STORE_FORMAT,
+                'source_version': source_version,
+                'content_hash': self.content_hash,
+                'size': offset,
+                'columns': layout,
+                'vocabularies': self.vocabularies,
+                'created_at': datetime.now().isoformat(),
+            }
+            tmp_meta = meta_path.with_name(meta_path.name + suffix)
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            print(f"⚠️ Katalog deposu kaydedilemedi: {e}")
+
+    @classmethod
+    def open(cls, path: Path, source_version: str) -> Optional['CatalogStore']:
+        """Kaynak sürümü eşleşirse depoyu salt okunur bellek eşlemesiyle aç"""
+        path = Path(path)
+        meta_path = cls._meta_path(path)
+        if not path.exists() or not meta_path.exists():
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format') != CATALOG_STORE_FORMAT or meta.get('source_version') != source_version:
+                return None
+            if path.stat().st_size != meta['size']:
+                return None
+
+            # Tüm sütunlar aynı dosya eşlemesinin görünümleridir
+            buffer = np.memmap(path, dtype=np.uint8, mode='r') if meta['size'] else np.empty(0, dtype=np.uint8)
+            columns = {}
+            for name, spec in meta['columns'].items():
+                dtype = np.dtype(spec['dtype'])
+                shape = tuple(spec['shape'])
+                nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+                columns[name] = buffer[spec['offset']:spec['offset'] + nbytes].view(dtype).reshape(shape)
+            return cls(columns, meta['vocabularies'], meta['content_hash'])
+        except Exception as e:
+            print(f"⚠️ Katalog deposu okunamadı: {e}")
+            return None
+
+    # --- Sütun erişimi -----------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """Adı verilen sütun (ör. 'food.intensity', 'alcohol.flavor_profile.bits')"""
+        return self.columns[name]
+
+    def codes(self, vocabulary_name: str) -> Dict[str, int]:
+        """Sözlükteki değer → kod eşlemesi"""
+        codes = self._codes.get(vocabulary_name)
+        if codes is None:
+            codes = {value: code for code, value in enumerate(self.vocabularies.get(vocabulary_name, []))}
+            self._codes[vocabulary_name] = codes
+        return codes
+
+    def names(self, kind: str) -> List[str]:
+        """'food' ya da 'alcohol' kataloğundaki tüm isimler (ilk çağrıda çözülür)"""
+        names = self._names.get(kind)
+        if names is None:
+            names = _decode_strings(self.columns[f'{kind}.name.data'], self.columns[f'{kind}.name.offsets'])
+            self._names[kind] = names
+        return names
+
+    def abv(self) -> np.ndarray:
+        """Alkol oranları, kaynak verideki ondalık değerlerle aynı float64 olarak"""
+        return np.round(self.columns['alcohol.alcohol_content'].astype(np.float64), ABV_DECIMALS)
+
+    def list_counts(self, kind: str, field: str, index: Dict[str, int]) -> np.ndarray:
+        """Liste alanını verilen sözlük sırasında (tekrarları koruyarak) sayım matrisine çevir"""
+        vocabulary = self.vocabularies[(FOOD_LISTS if kind == 'food' else ALCOHOL_LISTS)[field]]
+        remap = np.array([index[value] for value in vocabulary], dtype=np.int64)
+        offsets = self.columns[f'{kind}.{field}.offsets']
+        codes = self.columns[f'{kind}.{field}.codes']
+
+        n_rows = len(offsets) - 1
+        counts = np.zeros((n_rows, len(index)), dtype=np.float64)
+        rows = np.repeat(np.arange(n_rows), np.diff(offsets))
+        if len(codes):
+            np.add.at(counts, (rows, remap[codes]), 1)
+        return counts
+
+    # --- Kayıt görünümleri -------------------------------------------------
+
+    def _string(self, kind: str, position: int) -> str:
+        offsets = self.columns[f'{kind}.name.offsets']
+        data = self.columns[f'{kind}.name.data']
+        return data[offsets[position]:offsets[position + 1]].tobytes().decode('utf-8')
+
+    def _category(self, kind: str, field: str, position: int) -> str:
+        return self.vocabularies[field][self.columns[f'{kind}.{field}'][position]]
+
+    def _list(self, kind: str, field: str, vocabulary_name: str, position: int) -> List[str]:
+        offsets = self.columns[f'{kind}.{field}.offsets']
+        codes = self.columns[f'{kind}.{field}.codes'][offsets[position]:offsets[position + 1]]
+        vocabulary = self.vocabularies[vocabulary_name]
+        return [vocabulary[code] for code in codes.tolist()]
+
+    def food(self, position: int):
+        """Konumdaki yemeği Food nesnesi olarak üret"""
+        Food, _ = _record_types()
+        c = self.columns
+        return Food(
+            id=int(c['food.id'][position]),
+            name=self._string('food', position),
+            cuisine_type=self._category('food', 'cuisine_type', position),
+            flavor_profile=self._list('food', 'flavor_profile', 'flavor', position),
+            intensity=int(c['food.intensity'][position]),
+            texture=self._category('food', 'texture', position),
+            cooking_method=self._category('food', 'cooking_method', position),
+            main_ingredients=self._list('food', 'main_ingredients', 'ingredient', position),
+            dietary_tags=self._list('food', 'dietary_tags', 'dietary_tag', position),
+            price_range=self._category('food', 'price_range', position),
+            serving_temp=self._category('food', 'serving_temp', position),
+        )
+
+    def alcohol(self, position: int):
+        """Konumdaki alkolü Alcohol nesnesi olarak üret"""
+        _, Alcohol = _record_types()
+        c = self.columns
+        vintage = int(c['alcohol.vintage'][position])
+        return Alcohol(
+            id=int(c['alcohol.id'][position]),
+            name=self._string('alcohol', position),
+            type=self._category('alcohol', 'type', position),
+            subtype=self._category('alcohol', 'subtype', position),
+            alcohol_content=round(float(c['alcohol.alcohol_content'][position]), ABV_DECIMALS),
+            flavor_profile=self._list('alcohol', 'flavor_profile', 'flavor', position),
+            body=self._category('alcohol', 'body', position),
+            sweetness=int(c['alcohol.sweetness'][position]),
+            acidity=int(c['alcohol.acidity'][position]),
+            tannins=int(c['alcohol.tannins'][position]),
+            price_range=self._category('alcohol', 'price_range', position),
+            region=self._category('alcohol', 'region', position),
+            vintage=None if vintage == NO_VINTAGE else vintage,
+        )
@@ -0,0 +1,239 @@
+"""
+Kısıt İndeksi
+Katalog öğelerini diyet etiketi, fiyat bandı, tür/alt tür, bölge ve alkol
+oranı (ABV) aralıklarına göre bit kümelerinde (uint64 kelimeler) tutar;
+kullanıcı kısıtları ve istek filtreleri skorlamadan önce birkaç bit
+işlemiyle uygulanır
+"""
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+import numpy as np
+
+# ABV aralıkları: (üst sınır, etiket); üst sınır hariçtir
+ABV_BUCKETS = [
+    (0.5, 'non-alcoholic'),
+    (10.0, 'low'),
+    (20.0, 'medium'),
+    (35.0, 'high'),
+    (float('inf'), 'spirit'),
+]
+
+# Fiyat bantları ucuzdan pahalıya
+PRICE_LEVELS = ['budget', 'mid-range', 'premium']
+
+
+def abv_bucket(alcohol_content: float) -> str:
+    """Alkol oranını ABV aralık etiketine çevir"""
+    for upper, label in ABV_BUCKETS:
+        if alcohol_content < upper:
+            return label
+    return ABV_BUCKETS[-1][1]
+
+
+def price_bands_up_to(max_price_range: str) -> List[str]:
+    """Verilen banda kadar (dahil) olan fiyat bantları"""
+    if max_price_range not in PRICE_LEVELS:
+        raise ValueError(f"Unknown price range: {max_price_range}")
+    return PRICE_LEVELS[:PRICE_LEVELS.index(max_price_range) + 1]
+
+
+def pack_bits(mask: np.ndarray) -> np.ndarray:
+    """Boolean maskeyi uint64 kelimelerine paketle (bit i = öğe i)"""
+    n_words = (len(mask) + 63) // 64
+    padded = np.zeros(n_words * 64, dtype=bool)
+    padded[:len(mask)] = mask
+    return np.packbits(padded, bitorder='little').view('<u8')
+
+
+def unpack_bits(words: np.ndarray, size: int) -> np.ndarray:
+    """uint64 kelimelerini ilk `size` öğe için boolean maskeye aç"""
+    return np.unpackbits(words.view(np.uint8), bitorder='little')[:size].astype(bool)
+
+
+class ConstraintIndex:
+    """Tek bir katalog listesi için alan → değer → bit kümesi indeksi"""
+
+    def __init__(self, items: List, fields: Mapping[str, Callable]):
+        self.fields = fields
+        self._resize(len(items))
+
+        # Alan değeri tek bir değer ya da (diyet etiketleri gibi) bir liste olabilir.
+        # Her alan (öğe konumu, değer kodu) kayıtları olarak tutulur; bit kümeleri
+        # ilk kullanımda paketlenir (isim gibi tekil alanlar n×n bit gerektirmez)
+        self.vocabularies: Dict[str, Dict[str, int]] = {}
+        self.entry_positions: Dict[str, np.ndarray] = {}
+        self.entry_codes: Dict[str, np.ndarray] = {}
+        self.bitsets: Dict[str, Dict[str, np.ndarray]] = {}
+        for field, getter in fields.items():
+            vocabulary = self.vocabularies[field] = {}
+            positions: List[int] = []
+            codes: List[int] = []
+            for position, item in enumerate(items):
+                for value in self._values(getter, item):
+                    positions.append(position)
+                    codes.append(vocabulary.setdefault(value, len(vocabulary)))
+            self.entry_positions[field] = np.array(positions, dtype=np.int64)
+            self.entry_codes[field] = np.array(codes, dtype=np.int64)
+            self.bitsets[field] = {}
+
+    def _resize(self, size: int):
+        self.size = size
+        self.n_words = (self.size + 63) // 64
+        self.full = pack_bits(np.ones(self.size, dtype=bool))
+        self.empty = np.zeros(self.n_words, dtype='<u8')
+
+    @staticmethod
+    def _values(getter: Callable, item) -> List:
+        values = getter(item)
+        if isinstance(values, str) or not isinstance(values, Iterable):
+            return [values]
+        return list(values)
+
+    def bitset(self, field: str, value) -> Optional[np.ndarray]:
+        """Alanı `value` olan öğelerin bit kümesi (değer yoksa None)"""
+        field_bitsets = self.bitsets[field]
+        words = field_bitsets.get(value)
+        if words is None:
+            code = self.vocabularies[field].get(value)
+            if code is None:
+                return None
+            found = self.entry_positions[field][self.entry_codes[field] == code]
+            words = np.zeros(self.n_words, dtype='<u8')
+            np.bitwise_or.at(words, found >> 6, np.left_shift(np.uint64(1), (found & 63).astype(np.uint64)))
+            field_bitsets[value] = words
+        return words
+
+    # --- Artımlı güncellemeler ---------------------------------------------
+
+    def _link(self, position: int, item):
+        """Öğenin alan değerlerini kayıtlara ekle; etkilenen bit kümeleri yeniden paketlenir"""
+        for field, getter in self.fields.items():
+            vocabulary = self.vocabularies[field]
+            values = self._values(getter, item)
+            codes = np.array([vocabulary.setdefault(value, len(vocabulary)) for value in values], dtype=np.int64)
+            self.entry_positions[field] = np.append(self.entry_positions[field],
+                                                    np.full(len(codes), position, dtype=np.int64))
+            self.entry_codes[field] = np.append(self.entry_codes[field], codes)
+            for value in values:
+                self.bitsets[field].pop(value, None)
+
+    def _unlink(self, position: int, item):
+        """Öğenin kayıtlarını çıkar"""
+        for field, getter in self.fields.items():
+            keep = self.entry_positions[field] != position
+            self.entry_positions[field] = self.entry_positions[field][keep]
+            self.entry_codes[field] = self.entry_codes[field][keep]
+            for value in self._values(getter, item):
+                self.bitsets[field].pop(value, None)
+
+    def _shift(self, position: int, step: int):
+        """position ve sonrasındaki konumları kaydır; önbellekteki bit kümeleri atılır"""
+        for field, positions in self.entry_positions.items():
+            positions[positions >= position] += step
+            self.bitsets[field].clear()
+
+    def _resize_words(self, size: int):
+        """Boyutu güncelle; kelime sayısı değişirse önbellekteki bit kümeleri atılır"""
+        n_words = self.n_words
+        self._resize(size)
+        if self.n_words != n_words:
+            for field_bitsets in self.bitsets.values():
+                field_bitsets.clear()
+
+    def insert(self, position: int, item):
+        """Katalog listesine position konumunda eklenen öğeyi indekse ekle"""
+        if position < self.size:
+            self._shift(position, 1)
+        self._resize_words(self.size + 1)
+        self._link(position, item)
+
+    def replace(self, position: int, old_item, item):
+        """Konumdaki öğe değiştiğinde yalnızca eski ve yeni değerlerin kümelerini güncelle"""
+        self._unlink(position, old_item)
+        self._link(position, item)
+
+    def delete(self, position: int, old_item):
+        """Katalog listesinden çıkarılan öğeyi indeksten çıkar"""
+        self._unlink(position, old_item)
+        self._shift(position + 1, -1)
+        self._resize_words(self.size - 1)
+
+    def any_of(self, field: str, values: Iterable) -> np.ndarray:
+        """Alanı verilen değerlerden herhangi birine eşit olan öğelerin bit kümesi"""
+        if field not in self.bitsets:
+            raise ValueError(f"Unknown constraint field: {field}")
+        words = self.empty.copy()
+        for value in values:
+            bitset = self.bitset(field, value)
+            if bitset is not None:
+                words |= bitset
+        return words
+
+    def unknown_values(self, filters: Optional[Mapping[str, Iterable]]) -> Dict[str, List]:
+        """Filtrelerde indekste hiç geçmeyen değerler (alan → değerler); hepsi biliniyorsa boş"""
+        unknown = {}
+        for field, values in (filters or {}).items():
+            if field not in self.vocabularies:
+                raise ValueError(f"Unknown constraint field: {field}")
+            missing = [value for value in values if value not in self.vocabularies[field]]
+            if missing:
+                unknown[field] = missing
+        return unknown
+
+    def apply_filters(self, words: np.ndarray, filters: Optional[Mapping[str, Iterable]]) -> np.ndarray:
+        """Her alan filtresi (değerlerden biri) ile bit kümesini daralt"""
+        for field, values in (filters or {}).items():
+            words = words & self.any_of(field, values)
+        return words
+
+    def positions(self, words: np.ndarray) -> np.ndarray:
+        """Bit kümesindeki öğelerin liste konumları"""
+        return np.flatnonzero(unpack_bits(words, self.size))
+
+    def count(self, words: np.ndarray) -> int:
+        """Bit kümesindeki öğe sayısı"""
+        return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+class CatalogConstraints:
+    """Yemek ve alkol katalogları için kısıt indeksleri"""
+
+    FOOD_FIELDS = {
+        'dietary_tags': lambda f: f.dietary_tags,
+        'price_range': lambda f: f.price_range,
+        'cuisine_type': lambda f: f.cuisine_type,
+    }
+
+    ALCOHOL_FIELDS = {
+        'name': lambda a: a.name,
+        'type': lambda a: a.type,
+        'subtype': lambda a: a.subtype,
+        'region': lambda a: a.region,
+        'price_range': lambda a: a.price_range,
+        'abv': lambda a: abv_bucket(a.alcohol_content),
+    }
+
+    # İstek filtresi olarak kabul edilen alanlar
+    FOOD_FILTERS = ('price_range', 'cuisine_type')
+    ALCOHOL_FILTERS = ('type', 'subtype', 'region', 'price_range', 'abv')
+
+    def __init__(self, foods: List, alcohols: List):
+        self.foods = ConstraintIndex(foods, self.FOOD_FIELDS)
+        self.alcohols = ConstraintIndex(alcohols, self.ALCOHOL_FIELDS)
+
+    def eligible_alcohols(self, user_profile=None, filters: Optional[Mapping[str, Iterable]] = None) -> np.ndarray:
+        """Kullanıcının sevmediği alkoller çıkarılmış ve filtrelenmiş alkol bit kümesi"""
+        words = self.alcohols.apply_filters(self.alcohols.full, filters)
+        if user_profile and user_profile.disliked_alcohols:
+            # Sevilmeyenler isim ya da tür olarak verilebilir
+            disliked = (self.alcohols.any_of('name', user_profile.disliked_alcohols) |
+                        self.alcohols.any_of('type', user_profile.disliked_alcohols))
+            words = words & ~disliked
+        return words
+
+    def eligible_foods(self, user_profile=None, filters: Optional[Mapping[str, Iterable]] = None) -> np.ndarray:
+        """Kullanıcının diyet kısıtlarına takılan yemekler çıkarılmış ve filtrelenmiş yemek bit kümesi"""
+        words = self.foods.apply_filters(self.foods.full, filters)
+        if user_profile and user_profile.dietary_restrictions:
+            words = words & ~self.foods.any_of('dietary_tags', user_profile.dietary_restrictions)
+        return words
@@ -0,0 +1,117 @@
+"""
+Uzman Eşleştirme Deposu
+Gurme uzmanlarının yemek-içecek önerilerini katalog yemek id'sine göre
+indeksler. Uzman kayıtlarındaki yemek adları (örn. 'Adana Kebab') takma ad
+tablosu ve Türkçe duyarlı anahtarlarla katalog yemeklerine bağlanır; içecekten
+yemeklere ters indeks ve yanıtlarda kullanılan biçimlendirilmiş kayıtlar
+yükleme sırasında bir kez hazırlanır
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from core.catalog import turkish_casefold
+from core.suggest import search_key
+
+# Uzman önerilerindeki içecek adlarının başındaki emoji ve işaretler
+_DRINK_PREFIX = re.compile(r'^[^\w(]+')
+# Katalog adlarındaki parantezli ek bilgi (örn. 'Port Wine (Vintage)')
+_PARENTHESIZED = re.compile(r'\s*\([^)]*\)')
+_PARENTHESIZED_CONTENT = re.compile(r'\(([^)]*)\)')
+
+
+def drink_key(drink_name: str) -> str:
+    """Uzman önerisindeki içecek adını ('🥃 Rakı') katalog adıyla karşılaştırılabilir hale getir"""
+    return turkish_casefold(_DRINK_PREFIX.sub('', drink_name))
+
+
+def catalog_drink_keys(drink_name: str) -> List[str]:
+    """
+    Katalog adının uzmanların yazdığı kısa adlarla da eşleşmesi için anahtarlar:
+    'Port Wine (Vintage)' → 'Port Wine', 'Lager (Mexican)' → 'Mexican Lager',
+    'Turkish Red Wine (Kalecik Karası)' → 'Kalecik Karası'
+    """
+    outer = _PARENTHESIZED.sub('', drink_name)
+    names = [drink_name, outer]
+    for inner in _PARENTHESIZED_CONTENT.findall(drink_name):
+        names.extend([inner, f"{inner} {outer}"])
+    return list(dict.fromkeys(drink_key(name) for name in names))
+
+
+def format_explanation(expert_name: str, explanation: str) -> str:
+    return f"👨‍🍳 {expert_name}: {explanation}"
+
+
+class ExpertPairingStore:
+    """
+    Uzman kayıtlarının indeksli hali. Yemek önerileri (içecek, skor, açıklama, uzman),
+    içecek önerileri (yemek adı, skor, açıklama, uzman) olarak hazır döner.
+    """
+
+    def __init__(self, experts: Iterable, pairings: Dict[str, List[Tuple]], foods: Sequence,
+                 aliases: Optional[Dict[str, List[str]]] = None):
+        aliases = aliases or {}
+        self.experts = {expert.name: expert for expert in experts}
+        # Uzman kaydındaki yemek adı → kayıt sırasıyla biçimlendirilmiş öneriler
+        self.by_name: Dict[str, List[Tuple]] = {}
+        # İçecek anahtarı → skora göre azalan (uzman yemek adı, skor, açıklama, uzman)
+        self.by_drink: Dict[str, List[Tuple]] = {}
+        # Katalog adı anahtarı → o ada bağlanan uzman yemek adları
+        self.names_by_key: Dict[str, List[str]] = {}
+        # Katalog yemek id'si ↔ uzman yemek adları
+        self.names_by_food: Dict[int, List[str]] = {}
+        self.foods_by_name: Dict[str, List] = {}
+
+        for food_name, entries in pairings.items():
+            expert_results = []
+            for expert_name, drink, explanation, score in entries:
+                expert = self.experts.get(expert_name)
+                formatted = format_explanation(expert_name, explanation)
+                expert_results.append((drink, score, formatted, expert))
+                self.by_drink.setdefault(drink_key(drink), []).append((food_name, score, formatted, expert))
+            self.by_name[food_name] = expert_results
+            self.foods_by_name[food_name] = []
+            for target in [food_name, *aliases.get(food_name, ())]:
+                names = self.names_by_key.setdefault(search_key(target), [])
+                if food_name not in names:
+                    names.append(food_name)
+
+        for results in self.by_drink.values():
+            results.sort(key=lambda result: result[1], reverse=True)
+        for food in foods:
+            self.link_food(food)
+
+    def link_food(self, food):
+        """Katalog yemeğini adıyla eşleşen uzman kayıtlarına bağla"""
+        for food_name in self.names_by_key.get(search_key(food.name), ()):
+            self.names_by_food.setdefault(food.id, []).append(food_name)
+            self.foods_by_name[food_name].append(food)
+
+    def unlink_food(self, food):
+        """Katalogdan çıkan (ya da adı değişen) yemeğin bağlarını kaldır"""
+        for food_name in self.names_by_food.pop(food.id, ()):
+            self.foods_by_name[food_name] = [f for f in self.foods_by_name[food_name] if f.id != food.id]
+
+    def for_food(self, food_id: int, top_n: int) -> List[Tuple]:
+        """Yemeğe ait uzman önerileri (kayıt sırasıyla)"""
+        names = self.names_by_food.get(food_id)
+        if not names:
+            return []
+        if len(names) == 1:
+            return self.by_name[names[0]][:top_n]
+        return [result for name in names for result in self.by_name[name]][:top_n]
+
+    def for_drink(self, drink_name: str, top_n: int) -> List[Tuple]:
+        """İçeceği öneren uzman kayıtları; yemek adı bağlıysa katalogdaki adıyla döner"""
+        matches = []
+        for key in catalog_drink_keys(drink_name):
+            matches.extend(self.by_drink.get(key, ())[:top_n])
+        matches.sort(key=lambda result: result[1], reverse=True)
+
+        results = []
+        for food_name, score, explanation, expert in matches[:top_n]:
+            linked = self.foods_by_name.get(food_name)
+            results.append((linked[0].name if linked else food_name, score, explanation, expert))
+        return results
+
+    def expert(self, expert_name: str):
+        return self.experts.get(expert_name)
@@ -6,41 +6,106 @@ Author: Ne Yenir? Ekibi
 Version: 2.0
 """
 
+import base64
+import binascii
+import hashlib
 import json
 import random
 import sqlite3
+import sys
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Optional, Union
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, replace
 import pickle
 import os
 from pathlib import Path
+from core.scoring import CompatibilityEngine, compile_pairing_rules, top_k_indices
+from core.score_cache import ScoreMatrixCache
+from core.precompute import DEFAULT_TILE_SIZE, precompute_score_matrix
+from core.catalog import CatalogIndex
+from core.catalog_store import CatalogStore
+from core.table_pairing import optimize_table_pairing
+from core.constraints import CatalogConstraints, price_bands_up_to, unpack_bits
+from core.similarity import SimilarityIndex, alcohol_embeddings, food_embeddings
+from core.topk_index import TopKIndex
+from core.suggest import NameSuggester
+from core.experts import ExpertPairingStore
+from core.storage import Database, WriteBehindWriter
+from core.profiles import UserProfileStore
 
-@dataclass
-class Food:
+# Varsayılan SQLite veritabanı; türetilen dosyalar veritabanının yanına, adına ek getirilerek yazılır
+DATABASE_FILE = 'food_alcohol_system.db'
+# Önceden hesaplanmış skor matrisi
+SCORE_CACHE_SUFFIX = '.scores.npy'
+# Çalışan süreçler arasında bellek eşlemesiyle paylaşılan sütunlu katalog
+CATALOG_STORE_SUFFIX = '.catalog.bin'
+# Profilsiz öneriler için yemek başına en iyi K alkol indeksi
+TOPK_INDEX_SUFFIX = '.topk.npz'
+# Katalog deposunun kaynağı olan modüller; içerikleri değişince depo yeniden oluşturulur
+CATALOG_SOURCE_FILES = [Path(__file__), Path(__file__).with_name('expanded_database.py')]
+
+# Uzman kayıtlarındaki yemek adlarının katalogdaki karşılıkları; burada olmayan adlar
+# Türkçe duyarlı anahtarıyla eşleşir ('Manti' hem 'Manti' hem 'Mantı' yemeğine bağlanır)
+EXPERT_FOOD_ALIASES = {
+    "Adana Kebab": ["Adana Kebap"],
+    "İskender Kebab": ["İskender Kebap"],
+    "Döner Kebab": ["Döner Kebap"],
+    "Margherita Pizza": ["Pizza Margherita"],
+    "Ramen": ["Ramen Çorbası"],
+}
+
+class _FrozenRecord:
+    """
+    __slots__ kullanan değiştirilemez kayıtlar için ortak davranış.
+    Kategori alanları sys.intern ile paylaşılır, liste alanları tuple'a çevrilir.
+    """
+    __slots__ = ()
+
+    def _freeze(self, categories: Iterable[str], lists: Iterable[str]):
+        for name in categories:
+            object.__setattr__(self, name, sys.intern(getattr(self, name)))
+        for name in lists:
+            object.__setattr__(self, name, tuple(sys.intern(v) for v in getattr(self, name)))
+
+    def __reduce__(self):
+        # Dondurulmuş __slots__ nesneleri varsayılan yolla kopyalanamaz; __init__ üzerinden yeniden kurulur
+        return self.__class__, tuple(getattr(self, f.name) for f in fields(self))
+
+@dataclass(frozen=True)
+class Food(_FrozenRecord):
     """Detaylı özelliklere sahip yemek öğesi"""
+    __slots__ = ('id', 'name', 'cuisine_type', 'flavor_profile', 'intensity', 'texture', 'cooking_method',
+                 'main_ingredients', 'dietary_tags', 'price_range', 'serving_temp', 'flavor_set')
     id: int
     name: str
     cuisine_type: str
-    flavor_profile: List[str]  # tatlı, tuzlu, eksi, acı, umami, baharatlı
+    flavor_profile: Tuple[str, ...]  # tatlı, tuzlu, eksi, acı, umami, baharatlı
     intensity: int  # 1-10 ölçeği
     texture: str  # kremsi, çıtır, yumuşak, çiğnenen
     cooking_method: str
-    main_ingredients: List[str]
-    dietary_tags: List[str]  # vejetaryen, vegan, gluten-free, vb.
+    main_ingredients: Tuple[str, ...]
+    dietary_tags: Tuple[str, ...]  # vejetaryen, vegan, gluten-free, vb.
     price_range: str  # ekonomik, orta, premium
     serving_temp: str  # sıcak, soğuk, oda sıcaklığı
 
-@dataclass 
-class Alcohol:
+    def __post_init__(self):
+        self._freeze(('cuisine_type', 'texture', 'cooking_method', 'price_range', 'serving_temp'),
+                     ('flavor_profile', 'main_ingredients', 'dietary_tags'))
+        # Lezzet üyelik testleri için önceden hesaplanmış küme (alan değildir)
+        object.__setattr__(self, 'flavor_set', frozenset(self.flavor_profile))
+
+@dataclass(frozen=True)
+class Alcohol(_FrozenRecord):
     """Detaylı özelliklere sahip alkollü içecek"""
+    __slots__ = ('id', 'name', 'type', 'subtype', 'alcohol_content', 'flavor_profile', 'body', 'sweetness',
+                 'acidity', 'tannins', 'price_range', 'region', 'vintage', 'flavor_set')
     id: int
     name: str
     type: str  # şarap, bira, spirits, kokteyl
     subtype: str  # kırmızı şarap, IPA, viski, vb.
     alcohol_content: float
-    flavor_profile: List[str]
+    flavor_profile: Tuple[str, ...]
     body: str  # hafif, orta, yoğun
     sweetness: int  # 1-10 ölçeği
     acidity: int  # 1-10 ölçeği
@@ -49,36 +114,238 @@ class Alcohol:
     region: str
     vintage: Optional[int]
 
-@dataclass
-class UserProfile:
+    def __post_init__(self):
+        self._freeze(('type', 'subtype', 'body', 'price_range', 'region'), ('flavor_profile',))
+        object.__setattr__(self, 'flavor_set', frozenset(self.flavor_profile))
+
+@dataclass(frozen=True)
+class UserProfile(_FrozenRecord):
     """Kullanıcı tercihleri ve geçmişi"""
+    __slots__ = ('user_id', 'name', 'age', 'alcohol_tolerance', 'preferred_flavors', 'dietary_restrictions',
+                 'budget_preference', 'favorite_cuisines', 'disliked_alcohols', 'previous_pairings')
     user_id: int
     name: str
     age: int
     alcohol_tolerance: str  # düşük, orta, yüksek
-    preferred_flavors: List[str]
-    dietary_restrictions: List[str]
+    preferred_flavors: Tuple[str, ...]
+    dietary_restrictions: Tuple[str, ...]
     budget_preference: str
-    favorite_cuisines: List[str]
-    disliked_alcohols: List[str]
-    previous_pairings: List[Tuple[int, int, int]]  # food_id, alcohol_id, rating
+    favorite_cuisines: Tuple[str, ...]
+    disliked_alcohols: Tuple[str, ...]
+    previous_pairings: Tuple[Tuple[int, int, int], ...]  # food_id, alcohol_id, rating
 
-@dataclass
-class GourmetExpert:
+    def __post_init__(self):
+        self._freeze(('alcohol_tolerance', 'budget_preference'),
+                     ('preferred_flavors', 'dietary_restrictions', 'favorite_cuisines', 'disliked_alcohols'))
+        # map(tuple, ...) zaten demet olan kayıtları kopyalamaz; her puanla büyüyen geçmişte önemli
+        object.__setattr__(self, 'previous_pairings', tuple(map(tuple, self.previous_pairings)))
+
+@dataclass(frozen=True)
+class GourmetExpert(_FrozenRecord):
     """Uzmanlık alanlarıyla ünlü gurme uzmanı"""
+    __slots__ = ('name', 'country', 'speciality', 'bio', 'michelin_stars', 'famous_for')
     name: str
     country: str
-    speciality: List[str]
+    speciality: Tuple[str, ...]
     bio: str
     michelin_stars: int
-    famous_for: List[str]
+    famous_for: Tuple[str, ...]
+
+    def __post_init__(self):
+        self._freeze(('country',), ('speciality', 'famous_for'))
+
+# Açıklamalarda kullanılan Türkçe lezzet karşılıkları
+EXPLANATION_FLAVOR_TRANSLATIONS = {
+    "spicy": "baharatlı", "sweet": "tatlı", "salty": "tuzlu", "sour": "ekşi",
+    "bitter": "acı", "umami": "umami", "rich": "zengin", "fresh": "taze",
+    "smoky": "dumanlı", "savory": "lezzetli", "acidic": "asitli", "mineral": "mineral",
+    "fruity": "meyveli", "floral": "çiçeksi", "earthy": "toprak", "creamy": "kremsi",
+    "crispy": "gevrek", "briny": "tuzlu"
+}
+
+# Açıklamalarda belirtilen tamamlayıcı lezzet çiftleri (her iki yönde)
+EXPLANATION_COMPLEMENTARY_PAIRS = frozenset(
+    pair
+    for f1, f2 in (("spicy", "sweet"), ("salty", "sweet"), ("rich", "acidic"))
+    for pair in ((f1, f2), (f2, f1))
+)
+
+# Önbellekte tutulacak en fazla açıklama sayısı
+EXPLANATION_CACHE_SIZE = 50000
+
+# Veritabanı şeması ve sık çalışan ifadeler (aynı metin bağlantının hazır ifade önbelleğinden gelir)
+SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        name TEXT,
+        age INTEGER,
+        alcohol_tolerance TEXT,
+        preferred_flavors TEXT,
+        dietary_restrictions TEXT,
+        budget_preference TEXT,
+        favorite_cuisines TEXT,
+        disliked_alcohols TEXT,
+        version INTEGER NOT NULL DEFAULT 0  -- her profil güncellemesinde artar (süreç önbellekleri için)
+    );
+    
+    CREATE TABLE IF NOT EXISTS pairings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        food_id INTEGER,
+        alcohol_id INTEGER,
+        rating INTEGER,
+        timestamp TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    
+    -- Geçmiş sayfaları bu sırayla okunur: (timestamp, id) anahtarından sonraki ilk satırlar
+    CREATE INDEX IF NOT EXISTS idx_pairings_user_history ON pairings (user_id, timestamp DESC, id);
+    
+    -- Yemek-alkol çifti başına puan toplamları; pairings'e yazan her yol tetikleyicilerle günceller
+    CREATE TABLE IF NOT EXISTS pairing_stats (
+        food_id INTEGER NOT NULL,
+        alcohol_id INTEGER NOT NULL,
+        rating_sum INTEGER NOT NULL,
+        rating_count INTEGER NOT NULL,
+        last_rated_at TEXT,
+        PRIMARY KEY (food_id, alcohol_id)
+    ) WITHOUT ROWID;
+    
+    -- Trend sorgusu bu sıradaki ilk satırları okur (tablo taranmaz, sıralama yapılmaz)
+    CREATE INDEX IF NOT EXISTS idx_pairing_stats_trending ON pairing_stats (
+        (CAST(rating_sum AS REAL) / rating_count) DESC, rating_count DESC, food_id, alcohol_id, rating_sum
+    ) WHERE rating_count >= 2;
+    
+    -- Tetikleyiciler her açılışta yeniden kurulur; eski tanımlı veritabanları da güncel sürümü alır.
+    -- Puansız kayıtlar toplamlara katılmaz; tanımlar ve ilk aktarım tek işlemde yapılır
+    BEGIN IMMEDIATE;
+    
+    DROP TRIGGER IF EXISTS pairings_stats_insert;
+    DROP TRIGGER IF EXISTS pairings_stats_delete;
+    DROP TRIGGER IF EXISTS pairings_stats_update;
+    DROP TRIGGER IF EXISTS pairings_stats_update_old;
+    DROP TRIGGER IF EXISTS pairings_stats_update_new;
+    
+    CREATE TRIGGER pairings_stats_insert AFTER INSERT ON pairings
+    WHEN NEW.rating IS NOT NULL BEGIN
+        INSERT INTO pairing_stats (food_id, alcohol_id, rating_sum, rating_count, last_rated_at)
+        VALUES (NEW.food_id, NEW.alcohol_id, NEW.rating, 1, NEW.timestamp)
+        ON CONFLICT (food_id, alcohol_id) DO UPDATE SET
+            rating_sum = rating_sum + excluded.rating_sum,
+            rating_count = rating_count + 1,
+            last_rated_at = MAX(COALESCE(last_rated_at, excluded.last_rated_at),
+                                COALESCE(excluded.last_rated_at, last_rated_at));
+    END;
+    
+    CREATE TRIGGER pairings_stats_delete AFTER DELETE ON pairings
+    WHEN OLD.rating IS NOT NULL BEGIN
+        UPDATE pairing_stats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+        WHERE food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id;
+        DELETE FROM pairing_stats
+        WHERE food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id AND rating_count <= 0;
+    END;
+    
+    -- Güncelleme eski puanı düşen ve yeni puanı ekleyen iki tetikleyiciye bölünür
+    CREATE TRIGGER pairings_stats_update_old AFTER UPDATE OF food_id, alcohol_id, rating, timestamp ON pairings
+    WHEN OLD.rating IS NOT NULL BEGIN
+        UPDATE pairing_stats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+        WHERE food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id;
+        DELETE FROM pairing_stats
+        WHERE food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id AND rating_count <= 0;
+    END;
+    
+    CREATE TRIGGER pairings_stats_update_new AFTER UPDATE OF food_id, alcohol_id, rating, timestamp ON pairings
+    WHEN NEW.rating IS NOT NULL BEGIN
+        INSERT INTO pairing_stats (food_id, alcohol_id, rating_sum, rating_count, last_rated_at)
+        VALUES (NEW.food_id, NEW.alcohol_id, NEW.rating, 1, NEW.timestamp)
+        ON CONFLICT (food_id, alcohol_id) DO UPDATE SET
+            rating_sum = rating_sum + excluded.rating_sum,
+            rating_count = rating_count + 1,
+            last_rated_at = MAX(COALESCE(last_rated_at, excluded.last_rated_at),
+                                COALESCE(excluded.last_rated_at, last_rated_at));
+    END;
+    
+    -- Toplamlar tablosundan önce kaydedilmiş puanlar bir kez aktarılır
+    INSERT INTO pairing_stats (food_id, alcohol_id, rating_sum, rating_count, last_rated_at)
+    SELECT food_id, alcohol_id, SUM(rating), COUNT(rating), MAX(timestamp) FROM pairings
+    WHERE rating IS NOT NULL AND NOT EXISTS (SELECT 1 FROM pairing_stats)
+    GROUP BY food_id, alcohol_id;
+    
+    COMMIT;
+'''
+
+USERS_VERSION_COLUMN_SQL = 'ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 0'
+
+INSERT_PAIRING_SQL = '''
+    INSERT INTO pairings (user_id, food_id, alcohol_id, rating, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Sıralama idx_pairings_user_history ile aynıdır (aynı zamanlı kayıtlar id'ye göre artan);
+# "timestamp <= ?" koşulu sonraki sayfanın indekste doğrudan imlecin yerinden başlamasını sağlar
+USER_HISTORY_SQL = '''
+    SELECT id, food_id, alcohol_id, rating, timestamp FROM pairings
+    WHERE user_id = ?
+    ORDER BY timestamp DESC, id
+    LIMIT ?
+'''
+
+USER_HISTORY_AFTER_SQL = '''
+    SELECT id, food_id, alcohol_id, rating, timestamp FROM pairings
+    WHERE user_id = ? AND timestamp <= ? AND (timestamp < ? OR id > ?)
+    ORDER BY timestamp DESC, id
+    LIMIT ?
+'''
+
+# İfadeler idx_pairing_stats_trending ile birebir aynı olmalı
+TRENDING_PAIRINGS_SQL = '''
+    SELECT food_id, alcohol_id, CAST(rating_sum AS REAL) / rating_count AS avg_rating, rating_count
+    FROM pairing_stats
+    WHERE rating_count >= 2
+    ORDER BY (CAST(rating_sum AS REAL) / rating_count) DESC, rating_count DESC
+    LIMIT ?
+'''
+
+def _encode_history_cursor(timestamp: str, pairing_id: int) -> str:
+    """Geçmiş sayfasının son kaydından sonraki sayfanın imleci"""
+    return base64.urlsafe_b64encode(json.dumps([timestamp, pairing_id]).encode()).decode().rstrip('=')
+
+def _decode_history_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        timestamp, pairing_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError("Geçersiz geçmiş imleci") from e
+    if not isinstance(timestamp, str) or not isinstance(pairing_id, int):
+        raise ValueError("Geçersiz geçmiş imleci")
+    return timestamp, pairing_id
+
+def _quality_band(score: float) -> str:
+    """Skoru Türkçe kalite bandına çevir"""
+    if score >= 80:
+        return "Mükemmel"
+    elif score >= 70:
+        return "Çok İyi"
+    elif score >= 60:
+        return "İyi"
+    else:
+        return "Uygun"
+
+def _catalog_source_version() -> str:
+    """Katalog kaynak dosyalarının içerik özeti (depo geçerliliği için)"""
+    digest = hashlib.sha256()
+    for path in CATALOG_SOURCE_FILES:
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
 
 class GourmetRecommendationSystem:
     """Gurme uzmanı önerileri için sistem"""
     
-    def __init__(self):
+    def __init__(self, foods: Sequence = ()):
         self.experts = self._load_gourmet_experts()
         self.expert_pairings = self._load_expert_pairings()
+        # Katalog yemek id'sine göre indeksli, içecekten yemeğe ters indeksli depo
+        self.store = ExpertPairingStore(self.experts, self.expert_pairings, foods, EXPERT_FOOD_ALIASES)
     
     def _load_gourmet_experts(self) -> List[GourmetExpert]:
         """Dünya çapında ünlü gurme uzmanlarını yükle"""
@@ -296,35 +563,109 @@ class GourmetRecommendationSystem:
             ]
         }
     
-    def get_expert_recommendations(self, food_name: str, top_n: int = 3) -> List[Tuple]:
-        """Bir yemek için uzman önerilerini al"""
-        if food_name not in self.expert_pairings:
-            return []
-        
-        expert_recs = self.expert_pairings[food_name]
-        return expert_recs[:top_n]
+    def get_expert_recommendations(self, food_id: int, top_n: int = 3) -> List[Tuple]:
+        """Bir yemek için uzman önerilerini (içecek, skor, açıklama, uzman) olarak al"""
+        return self.store.for_food(food_id, top_n)
+    
+    def get_drink_recommendations(self, drink_name: str, top_n: int = 3) -> List[Tuple]:
+        """Bir içeceği öneren uzman eşleştirmelerini (yemek, skor, açıklama, uzman) olarak al"""
+        return self.store.for_drink(drink_name, top_n)
     
     def get_expert_info(self, expert_name: str) -> GourmetExpert:
         """Belirli bir uzman hakkında bilgi al"""
-        for expert in self.experts:
-            if expert.name == expert_name:
-                return expert
-        return None
+        return self.store.expert(expert_name)
 
 class AIFoodAlcoholMatcher:
     """Yemek-alkol eşleştirmesi için gelişmiş Yapay Zeka sistemi"""
     
-    def __init__(self):
-        self.foods = self._load_food_database()
-        self.alcohols = self._load_alcohol_database()
+    def __init__(self, precompute: bool = True, database_path: Union[str, Path] = DATABASE_FILE,
+                 rating_durability: str = 'sync'):
+        """
+        precompute=False ise en iyi K indeksi ve skor matrisi açılışta yüklenmez. Yoğun skor
+        matrisi açılışta hiç hesaplanmaz; precompute_scores ile hazırlanmışsa bellek eşlemesiyle açılır.
+        rating_durability puanların yazılma kipidir (sync, group, async; bkz. core.storage).
+        """
+        self.db = Database(database_path)
+        # Bellek içi veritabanında türetilen dosyalar için dosya yolu yoktur; varsayılan ad kullanılır
+        artifact_base = Path(DATABASE_FILE if str(database_path) == ':memory:' else database_path)
+        self.score_cache_file = artifact_base.with_suffix(SCORE_CACHE_SUFFIX)
+        self.catalog_store_file = artifact_base.with_suffix(CATALOG_STORE_SUFFIX)
+        self.top_k_index_file = artifact_base.with_suffix(TOPK_INDEX_SUFFIX)
+        self.catalog_store = self._load_catalog_store()
+        self.foods = self.catalog_store.foods
+        self.alcohols = self.catalog_store.alcohols
+        self.catalog = CatalogIndex(self.foods, self.alcohols)
+        self.food_suggester = NameSuggester(self.foods)
+        self.constraints = CatalogConstraints(self.foods, self.alcohols)
         self.pairing_rules = self._load_pairing_rules()
-        self.user_profiles = {}
+        self.compiled_rules = compile_pairing_rules(self.pairing_rules)
         self.pairing_history = []
+        # (yemek id, yemek kuşağı, alkol id, alkol kuşağı, kalite bandı) → açıklama şablonu
+        self._explanation_cache: Dict[Tuple[int, int, int, int, str], Tuple[str, str]] = {}
+        # Değişen öğenin kuşağı artar; eski açıklamalar taranmadan geçersiz olur, boyut sınırıyla temizlenir
+        self._item_generations: Dict[Tuple[str, int], int] = {}
+        # Katalog değişikliklerinde (tür, eski öğe, yeni öğe) ile çağrılır; eklemede eski,
+        # silmede yeni öğe None'dır. Uygulama katmanı kendi önbelleklerini buradan günceller.
+        self.catalog_listeners: List[Callable[[str, Optional[object], Optional[object]], None]] = []
         self.ml_model = None
-        self.gourmet_system = GourmetRecommendationSystem()  # Gurme sistem entegrasyonu
+        self.gourmet_system = GourmetRecommendationSystem(self.foods)  # Gurme sistem entegrasyonu
+        self.scoring_engine = CompatibilityEngine(self.foods, self.alcohols, self.compiled_rules,
+                                                  store=self.catalog_store)
+        self.top_k: Optional[TopKIndex] = None
+        if precompute:
+            # Profilsiz öneriler en iyi K indeksinden sunulur; indeks yoksa karo karo kurulur
+            self.scoring_engine.precompute(ScoreMatrixCache(self.score_cache_file), compute=False)
+            self.top_k = self._load_top_k_index()
+        
+        # "Buna benzer yemekler" ve "stokta yoksa alternatifler" için benzerlik indeksleri
+        self.food_similarity = SimilarityIndex(food_embeddings(self.scoring_engine))
+        self.alcohol_similarity = SimilarityIndex(alcohol_embeddings(self.scoring_engine))
         self._initialize_database()
+        self.rating_writer = WriteBehindWriter(self.db, INSERT_PAIRING_SQL, rating_durability)
+        # Profiller users tablosundan okunur; süreçler ve iş parçacıkları arasında ortaktır
+        self.user_profiles: UserProfileStore[UserProfile] = UserProfileStore(
+            self.db, UserProfile, before_load=self.rating_writer.flush)
         self._train_model()
     
+    def precompute_scores(self, workers: Optional[int] = None, tile_size: int = DEFAULT_TILE_SIZE,
+                          force: bool = False) -> Dict:
+        """
+        Skor matrisini çok süreçli karolar halinde hesaplayıp önbelleğe yaz ve yükle.
+        İşçiler kataloğu diskteki depodan açar; bellekte değiştirilmiş katalogda kullanılamaz.
+        """
+        if self.scoring_engine.store is None:
+            raise RuntimeError("Katalog bellekte değiştirildi; ön hesaplama diskteki depoyla yapılamaz")
+        cache = ScoreMatrixCache(self.score_cache_file)
+        report = precompute_score_matrix(self.catalog_store_file, _catalog_source_version(), self.pairing_rules,
+                                         cache, workers, tile_size, force)
+        self.scoring_engine.precompute(cache)
+        self.top_k = self._load_top_k_index()
+        return report
+    
+    def _load_top_k_index(self) -> TopKIndex:
+        """En iyi K indeksini diskten yükle; yoksa ya da katalog değiştiyse kurup kaydet"""
+        version = self.scoring_engine.catalog_version()
+        index = TopKIndex.load(self.top_k_index_file, version, len(self.foods))
+        if index is None:
+            index = TopKIndex.build(self.scoring_engine)
+            index.save(self.top_k_index_file, version)
+        return index
+    
+    def _load_catalog_store(self) -> CatalogStore:
+        """
+        Sütunlu katalog deposunu diskten aç; yoksa ya da kaynak değiştiyse
+        katalog listelerinden bir kez oluşturup kaydet
+        """
+        version = _catalog_source_version()
+        store = CatalogStore.open(self.catalog_store_file, version)
+        if store is not None:
+            return store
+        
+        store = CatalogStore.build(self._load_food_database(), self._load_alcohol_database())
+        store.save(self.catalog_store_file, version)
+        # Kaydedilen dosya yeniden açılır; sütunlar süreç belleği yerine paylaşılan eşlemeden okunur
+        return CatalogStore.open(self.catalog_store_file, version) or store
+    
     def _load_food_database(self) -> List[Food]:
         """Kapsamlı yemek veritabanını yükle"""
         # Import the expanded database
@@ -451,43 +792,24 @@ class AIFoodAlcoholMatcher:
     
     def _initialize_database(self):
         """Kullanıcı verilerini ve geçmişi saklamak için SQLite veritabanını başlat"""
-        # Remove the class-level connection, use get_db_connection instead
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                name TEXT,
-                age INTEGER,
-                alcohol_tolerance TEXT,
-                preferred_flavors TEXT,
-                dietary_restrictions TEXT,
-                budget_preference TEXT,
-                favorite_cuisines TEXT,
-                disliked_alcohols TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pairings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                food_id INTEGER,
-                alcohol_id INTEGER,
-                rating INTEGER,
-                timestamp TEXT,
-                FOREIGN KEY (user_id) REFERENCES users (user_id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        self.db.executescript(SCHEMA_SQL)
+        # version sütunundan önce oluşturulmuş veritabanları
+        if 'version' not in {row[1] for row in self.db.query("PRAGMA table_info(users)")}:
+            try:
+                self.db.execute(USERS_VERSION_COLUMN_SQL)
+            except sqlite3.OperationalError as e:
+                # Aynı anda açılan başka bir süreç sütunu eklemiş olabilir
+                if 'duplicate column' not in str(e):
+                    raise
     
     def get_db_connection(self):
-        """Her istek için yeni veritabanı bağlantısı al (thread-safe)"""
-        return sqlite3.connect('food_alcohol_system.db', check_same_thread=False)
+        """Bu iş parçacığının kalıcı veritabanı bağlantısı (kapatılmamalıdır)"""
+        return self.db.connection()
+    
+    def close(self):
+        """Bekleyen puanları yazıp veritabanı bağlantılarını kapat"""
+        self.rating_writer.close()
+        self.db.close()
     
     def _train_model(self):
         """Daha iyi öneriler için basit bir ML modeli eğit"""
@@ -500,23 +822,153 @@ class AIFoodAlcoholMatcher:
             'regional_weight': 0.1
         }
     
+    # --- Katalog değişiklikleri -------------------------------------------
+    # Tek bir öğe eklendiğinde, değiştiğinde ya da çıkarıldığında yalnızca o
+    # öğenin skor matrisi satırı/sütunu, indeks kayıtları ve benzerlik gömmesi
+    # yeniden hesaplanır; açıklama önbelleğinde yalnızca o öğenin kayıtları silinir.
+    # Değişiklikler süreç belleğindedir; katalog deposu kaynağından yeniden kurulur.
+    
+    def add_food(self, food: Food) -> Food:
+        """Kataloğa yeni bir yemek ekle"""
+        return self._add_catalog_item('food', food)
+    
+    def update_food(self, food: Food) -> Food:
+        """Aynı id'li yemeği yeni haliyle değiştir; eski hali döndürülür"""
+        return self._update_catalog_item('food', food)
+    
+    def remove_food(self, food_id: int) -> Food:
+        """Yemeği katalogdan çıkar ve döndür"""
+        return self._remove_catalog_item('food', food_id)
+    
+    def add_alcohol(self, alcohol: Alcohol) -> Alcohol:
+        """Kataloğa yeni bir alkol ekle"""
+        return self._add_catalog_item('alcohol', alcohol)
+    
+    def update_alcohol(self, alcohol: Alcohol) -> Alcohol:
+        """Aynı id'li alkolü yeni haliyle değiştir; eski hali döndürülür"""
+        return self._update_catalog_item('alcohol', alcohol)
+    
+    def remove_alcohol(self, alcohol_id: int) -> Alcohol:
+        """Alkolü katalogdan çıkar ve döndür"""
+        return self._remove_catalog_item('alcohol', alcohol_id)
+    
+    def _materialize_catalog(self):
+        """Depo görünümlerini değiştirilebilir listelere çevir (ilk değişiklikte bir kez)"""
+        if not isinstance(self.foods, list):
+            self.foods = list(self.foods)
+            self.catalog.foods.items = self.foods
+        if not isinstance(self.alcohols, list):
+            self.alcohols = list(self.alcohols)
+            self.catalog.alcohols.items = self.alcohols
+        self.scoring_engine.detach_store(self.foods, self.alcohols)
+    
+    def _catalog_position(self, kind: str, item_id: int) -> int:
+        position = getattr(self.catalog, f'{kind}s').by_id.get(item_id)
+        if position is None:
+            raise ValueError(f"Unknown {kind} id: {item_id}")
+        return position
+    
+    def _add_catalog_item(self, kind: str, item):
+        if item.id in getattr(self.catalog, f'{kind}s').by_id:
+            raise ValueError(f"Duplicate {kind} id: {item.id}")
+        self._materialize_catalog()
+        items = getattr(self, f'{kind}s')
+        position = len(items)
+        items.append(item)
+        
+        getattr(self.catalog, f'{kind}s').insert(position, item)
+        getattr(self.constraints, f'{kind}s').insert(position, item)
+        getattr(self.scoring_engine, f'insert_{kind}')(position, item)
+        self._update_similarity(kind, position, 'insert')
+        self._update_top_k(kind, position, None, 'insert')
+        self._catalog_changed(kind, None, item)
+        return item
+    
+    def _update_catalog_item(self, kind: str, item):
+        position = self._catalog_position(kind, item.id)
+        self._materialize_catalog()
+        items = getattr(self, f'{kind}s')
+        old_item = items[position]
+        items[position] = item
+        
+        getattr(self.catalog, f'{kind}s').replace(position, old_item, item)
+        getattr(self.constraints, f'{kind}s').replace(position, old_item, item)
+        getattr(self.scoring_engine, f'replace_{kind}')(position, item)
+        self._update_similarity(kind, position, 'replace')
+        self._update_top_k(kind, position, old_item, 'replace')
+        self._catalog_changed(kind, old_item, item)
+        return old_item
+    
+    def _remove_catalog_item(self, kind: str, item_id: int):
+        position = self._catalog_position(kind, item_id)
+        self._materialize_catalog()
+        old_item = getattr(self, f'{kind}s').pop(position)
+        
+        getattr(self.catalog, f'{kind}s').delete(position, old_item)
+        getattr(self.constraints, f'{kind}s').delete(position, old_item)
+        getattr(self.scoring_engine, f'delete_{kind}')(position)
+        self._update_similarity(kind, position, 'delete')
+        self._update_top_k(kind, position, old_item, 'delete')
+        self._catalog_changed(kind, old_item, None)
+        return old_item
+    
+    def _update_similarity(self, kind: str, position: int, action: str):
+        """Benzerlik indeksinde yalnızca değişen öğenin gömmesini güncelle"""
+        attribute = f'{kind}_similarity'
+        index = getattr(self, attribute)
+        if action == 'delete':
+            index.delete(position)
+            return
+        
+        embed = food_embeddings if kind == 'food' else alcohol_embeddings
+        vector = embed(self.scoring_engine, [position])[0]
+        if len(vector) != index.dim:
+            # Yeni lezzet ya da kategori gömme boyutunu değiştirdi; indeks yeniden kurulur
+            setattr(self, attribute, SimilarityIndex(embed(self.scoring_engine)))
+        elif action == 'insert':
+            index.insert(position, vector)
+        else:
+            index.replace(position, vector)
+    
+    def _update_top_k(self, kind: str, position: int, old_item, action: str):
+        """En iyi K indeksinde yalnızca değişen yemeğin satırını ya da alkolün girdiği satırları güncelle"""
+        if self.top_k is None:
+            return
+        engine = self.scoring_engine
+        if kind == 'food':
+            if action == 'delete':
+                self.top_k.delete_food(position)
+            else:
+                getattr(self.top_k, f'{action}_food')(engine, position)
+        elif action == 'insert':
+            self.top_k.insert_alcohol(engine, position, self.catalog.alcohols.by_id)
+        elif action == 'replace':
+            self.top_k.replace_alcohol(engine, position, old_item.id, self.catalog.alcohols.by_id)
+        else:
+            self.top_k.delete_alcohol(engine, old_item.id)
+    
+    def _catalog_changed(self, kind: str, old_item, item):
+        """Değişen öğenin açıklamalarını geçersiz kıl, öneri ve uzman indekslerini güncelle, dinleyicileri bilgilendir"""
+        if old_item is not None:
+            generation = (kind, old_item.id)
+            self._item_generations[generation] = self._item_generations.get(generation, 0) + 1
+        if kind == 'food':
+            if old_item is not None:
+                self.food_suggester.delete(old_item)
+                self.gourmet_system.store.unlink_food(old_item)
+            if item is not None:
+                self.food_suggester.insert(item)
+                self.gourmet_system.store.link_food(item)
+        for listener in self.catalog_listeners:
+            listener(kind, old_item, item)
+    
     def calculate_compatibility_score(self, food: Food, alcohol: Alcohol, user_profile: Optional[UserProfile] = None) -> float:
         """Yemek ve alkol arasında AI destekli uyumluluk puanı hesapla"""
         score = 0.0
         max_score = 0.0
         
-        # 1. Flavor Profile Matching
-        flavor_score = 0.0
-        for food_flavor in food.flavor_profile:
-            for alcohol_flavor in alcohol.flavor_profile:
-                # Check complementary flavors
-                for (f1, f2), weight in self.pairing_rules["flavor_matching"]["complementary"].items():
-                    if (food_flavor == f1 and alcohol_flavor == f2) or (food_flavor == f2 and alcohol_flavor == f1):
-                        flavor_score += weight
-                
-                # Check similar flavors
-                if food_flavor == alcohol_flavor:
-                    flavor_score += self.pairing_rules["flavor_matching"]["similar"].get((food_flavor, alcohol_flavor), 0.5)
+        # 1. Flavor Profile Matching (derlenmiş etkileşim tablosundan arama)
+        flavor_score = self.compiled_rules.flavor_score(food.flavor_profile, alcohol.flavor_profile)
         
         score += flavor_score * 0.4
         max_score += 0.4
@@ -548,7 +1000,7 @@ class AIFoodAlcoholMatcher:
             
             # Preferred flavors
             for pref_flavor in user_profile.preferred_flavors:
-                if pref_flavor in alcohol.flavor_profile:
+                if pref_flavor in alcohol.flavor_set:
                     user_score += 0.3
             
             # Budget matching
@@ -571,73 +1023,263 @@ class AIFoodAlcoholMatcher:
         final_score = (score / max_score) * 100 if max_score > 0 else 0
         return min(100, max(0, final_score))
     
-    def get_recommendations(self, food_name: str, user_profile: Optional[UserProfile] = None, top_n: int = 5) -> Dict:
-        """Belirli bir yemek için hem AI hem de uzman görüşleriyle en iyi N alkol önerisini al"""
-        # Find the food
-        food = None
-        for f in self.foods:
-            if f.name.lower() == food_name.lower():
-                food = f
-                break
+    def get_recommendations(self, food_name: str, user_profile: Optional[UserProfile] = None, top_n: int = 5,
+                            offset: int = 0, filters: Optional[Dict[str, List[str]]] = None) -> Dict:
+        """
+        Belirli bir yemek için hem AI hem de uzman görüşleriyle en iyi N alkol önerisini al.
+        offset ile sıralamanın sonraki sayfaları yeniden skorlama yapılmadan alınabilir.
+        filters (örn. {'type': ['wine'], 'abv': ['low']}) ve kullanıcının sevmediği
+        alkoller adayları skorlamadan önce eler.
+        """
+        # Find the food (isim ya da URL slug'ı ile)
+        food_index = self.catalog.food_position(food_name)
+        if food_index is None:
+            return {"ai_recommendations": [], "expert_recommendations": [], "ai_total": 0}
         
-        if not food:
-            return {"ai_recommendations": [], "expert_recommendations": []}
+        # AI Recommendations - yalnızca uygun alkoller tek vektörel geçişte skorlanır
+        candidates = self._eligible_alcohols(user_profile, filters)
+        if (not user_profile and candidates is None and self.top_k is not None
+                and offset + top_n <= self.top_k.k):
+            return self._top_k_recommendations(food_index, top_n, offset)
+        if candidates is None:
+            scores = self.scoring_engine.score_row(food_index, user_profile)
+        else:
+            scores = self.scoring_engine.score_matrix([food_index], candidates, user_profile)[0]
+        return self._build_recommendations(self.foods[food_index], scores, top_n, offset, candidates)
+    
+    def get_recommendations_batch(self, food_names: List[str], user_profile: Optional[UserProfile] = None,
+                                  top_n: int = 5, filters: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict]:
+        """
+        Bir menüdeki birden çok yemek için önerileri tek seferde al.
+        Tüm yemekler tek bir kişiselleştirme ve vektörel skorlama geçişini paylaşır.
+        """
+        positions = {}
+        for food_name in food_names:
+            food_index = self.catalog.food_position(food_name)
+            if food_index is not None:
+                positions.setdefault(food_index, len(positions))
+        
+        candidates = self._eligible_alcohols(user_profile, filters)
+        scores = self.scoring_engine.score_matrix(list(positions), candidates, user_profile) if positions else None
+        
+        results = {}
+        for food_name in food_names:
+            food_index = self.catalog.food_position(food_name)
+            if food_index is None:
+                results[food_name] = {"ai_recommendations": [], "expert_recommendations": [], "ai_total": 0}
+            else:
+                row = scores[positions[food_index]]
+                results[food_name] = self._build_recommendations(self.foods[food_index], row, top_n, 0, candidates)
+        return results
+    
+    def _eligible_alcohols(self, user_profile: Optional[UserProfile],
+                           filters: Optional[Dict[str, List[str]]]) -> Optional[np.ndarray]:
+        """Kısıtlardan geçen alkollerin konumları; hiçbiri elenmiyorsa None (tam katalog)"""
+        words = self.constraints.eligible_alcohols(user_profile, filters)
+        if np.array_equal(words, self.constraints.alcohols.full):
+            return None
+        return self.constraints.alcohols.positions(words)
+    
+    def _eligible_foods(self, user_profile: Optional[UserProfile],
+                        filters: Optional[Dict[str, List[str]]]) -> Optional[np.ndarray]:
+        """Kısıtlardan geçen yemeklerin konumları; hiçbiri elenmiyorsa None (tam katalog)"""
+        words = self.constraints.eligible_foods(user_profile, filters)
+        if np.array_equal(words, self.constraints.foods.full):
+            return None
+        return self.constraints.foods.positions(words)
+    
+    def get_food_recommendations(self, alcohol_name: str, user_profile: Optional[UserProfile] = None,
+                                 top_n: int = 5, filters: Optional[Dict[str, List[str]]] = None) -> Dict:
+        """
+        Belirli bir içecek için en uyumlu N yemeği al (bar ekibi şişeden başlar).
+        Skorlar önbellekteki skor matrisinin ilgili sütunundan gelir; kullanıcının
+        diyet kısıtlarına takılan ve filtrelere uymayan yemekler skorlanmaz.
+        """
+        alcohol_index = self.catalog.alcohol_position(alcohol_name)
+        if alcohol_index is None:
+            return {"ai_recommendations": [], "expert_recommendations": [], "ai_total": 0}
+        
+        alcohol = self.alcohols[alcohol_index]
+        candidates = self._eligible_foods(user_profile, filters)
+        if candidates is None:
+            scores = self.scoring_engine.score_column(alcohol_index, user_profile)
+        else:
+            scores = self.scoring_engine.score_matrix(candidates, [alcohol_index], user_profile)[:, 0]
         
-        # AI Recommendations
         ai_recommendations = []
-        for alcohol in self.alcohols:
-            score = self.calculate_compatibility_score(food, alcohol, user_profile)
-            explanation = self._generate_explanation(food, alcohol, score)
-            ai_recommendations.append((alcohol, score, explanation))
+        for position in top_k_indices(scores, top_n):
+            food_index = position if candidates is None else candidates[position]
+            food = self.foods[food_index]
+            score = float(scores[position])
+            ai_recommendations.append((food, score, self._generate_explanation(food, alcohol, score)))
         
-        # Sort AI recommendations by score
-        ai_recommendations.sort(key=lambda x: x[1], reverse=True)
-        ai_recommendations = ai_recommendations[:top_n]
+        return {
+            "ai_recommendations": ai_recommendations,
+            # Bu içeceği öneren uzman eşleştirmeleri
+            "expert_recommendations": self.gourmet_system.get_drink_recommendations(alcohol.name, top_n),
+            "ai_total": len(scores)
+        }
+    
+    def suggest_foods(self, query: str, limit: int = 10) -> List[Food]:
+        """Yazılmakta olan sorguya uyan yemekler (Türkçe harf ve aksan farkları, yazım hataları tolere edilir)"""
+        return [self.catalog.get_food(food_id) for food_id in self.food_suggester.suggest(query, limit)]
+    
+    def get_similar_foods(self, food_name: str, top_n: int = 5,
+                          filters: Optional[Dict[str, List[str]]] = None) -> List[Tuple[Food, float]]:
+        """Bir yemeğe en çok benzeyen yemekleri (yemek, benzerlik) olarak al"""
+        food_index = self.catalog.food_position(food_name)
+        if food_index is None:
+            return []
+        
+        allowed = None
+        if filters:
+            allowed = unpack_bits(self.constraints.eligible_foods(None, filters), len(self.foods))
+        return [(self.foods[i], similarity)
+                for i, similarity in self.food_similarity.neighbours(food_index, top_n, allowed)]
+    
+    def get_similar_alcohols(self, alcohol_name: str, top_n: int = 5,
+                             filters: Optional[Dict[str, List[str]]] = None) -> List[Tuple[Alcohol, float]]:
+        """Bir içeceğe en çok benzeyen içecekleri (örn. stokta olmayan şişeye alternatif) al"""
+        alcohol_index = self.catalog.alcohol_position(alcohol_name)
+        if alcohol_index is None:
+            return []
+        
+        allowed = None
+        if filters:
+            allowed = unpack_bits(self.constraints.eligible_alcohols(None, filters), len(self.alcohols))
+        return [(self.alcohols[i], similarity)
+                for i, similarity in self.alcohol_similarity.neighbours(alcohol_index, top_n, allowed)]
+    
+    def get_table_pairing(self, food_names: List[str], bottles: int = 1, objective: str = 'min',
+                          max_price_range: Optional[str] = None,
+                          user_profile: Optional[UserProfile] = None,
+                          filters: Optional[Dict[str, List[str]]] = None) -> Dict:
+        """
+        Masadaki tüm yemekleri birlikte en iyi karşılayan en fazla `bottles` şişeyi seç.
+        objective='min' en kötü eşleşen yemeğin skorunu, 'mean' ortalama skoru en büyükler.
+        """
+        positions = []
+        unknown_foods = []
+        for food_name in food_names:
+            food_index = self.catalog.food_position(food_name)
+            if food_index is None:
+                unknown_foods.append(food_name)
+            elif food_index not in positions:
+                positions.append(food_index)
+        
+        # Bütçe filtresi: seçilen banttan pahalı şişeler aday olmaz
+        filters = dict(filters or {})
+        if max_price_range is not None:
+            filters['price_range'] = price_bands_up_to(max_price_range)
+        candidates = self._eligible_alcohols(user_profile, filters)
+        if candidates is None:
+            candidates = np.arange(len(self.alcohols))
         
-        # Expert Recommendations
-        expert_recommendations = self.gourmet_system.get_expert_recommendations(food_name, top_n)
+        result = {"bottles": [], "value": 0.0, "assignments": [], "unknown_foods": unknown_foods}
+        if not positions or not len(candidates):
+            return result
         
-        # Format expert recommendations with emoji prefix
-        formatted_expert_recs = []
-        for expert_name, drink, explanation, score in expert_recommendations:
-            expert_info = self.gourmet_system.get_expert_info(expert_name)
-            formatted_explanation = f"👨‍🍳 {expert_name}: {explanation}"
-            formatted_expert_recs.append((drink, score, formatted_explanation, expert_info))
+        scores = self.scoring_engine.score_matrix(positions, candidates, user_profile)
+        selected, value = optimize_table_pairing(scores, bottles, objective)
+        
+        # Depo destekli katalog her erişimde yeni kayıt kurar; atamalar aynı şişe nesnelerini kullanır
+        chosen = {c: self.alcohols[candidates[c]] for c in selected}
+        result["bottles"] = list(chosen.values())
+        result["value"] = value
+        # Her yemek, seçilen şişelerden kendisiyle en uyumlu olana atanır
+        for row, food_index in enumerate(positions):
+            best = max(selected, key=lambda c: scores[row, c])
+            result["assignments"].append((self.foods[food_index], chosen[best], float(scores[row, best])))
+        return result
+    
+    def _top_k_recommendations(self, food_index: int, top_n: int, offset: int) -> Dict:
+        """
+        Profilsiz önerileri en iyi K indeksinden sun: adaylar indeksten gelir,
+        yalnızca bu K aday kesin skorlarla yeniden sıralanır (katalog boyutundan bağımsız)
+        """
+        food = self.foods[food_index]
+        by_id = self.catalog.alcohols.by_id
+        positions = np.fromiter((by_id[int(alcohol_id)] for alcohol_id in self.top_k.row(food_index)), dtype=np.int64)
+        scores = self.scoring_engine.score_matrix([food_index], positions)[0] if len(positions) else np.empty(0)
+        
+        # Dizideki float16 skorlar yerine kesin skorlarla sırala (eşitlikte konum, tam satırla aynı)
+        ai_recommendations = []
+        for i in np.lexsort((positions, -scores))[offset:offset + top_n]:
+            alcohol = self.alcohols[int(positions[i])]
+            score = float(scores[i])
+            ai_recommendations.append((alcohol, score, self._generate_explanation(food, alcohol, score)))
+        return self._recommendation_response(food, ai_recommendations, top_n, offset, len(self.alcohols))
+    
+    def _build_recommendations(self, food: Food, scores: np.ndarray, top_n: int, offset: int,
+                               candidates: Optional[np.ndarray] = None) -> Dict:
+        """
+        Skor satırından AI ve uzman önerilerini içeren yanıtı oluştur.
+        candidates verilirse skorlar yalnızca bu alkol konumlarına aittir.
+        """
+        # Tam sıralama yerine yalnızca istenen sayfa seçilir
+        ai_recommendations = []
+        for position in top_k_indices(scores, top_n, offset):
+            alcohol = self.alcohols[position if candidates is None else candidates[position]]
+            score = float(scores[position])
+            explanation = self._generate_explanation(food, alcohol, score)
+            ai_recommendations.append((alcohol, score, explanation))
+        return self._recommendation_response(food, ai_recommendations, top_n, offset, len(scores))
+    
+    def _recommendation_response(self, food: Food, ai_recommendations: List, top_n: int, offset: int,
+                                 ai_total: int) -> Dict:
+        """AI önerilerine uzman önerilerini ekleyerek yanıtı oluştur"""
+        # Uzman önerileri yalnızca ilk sayfada döner
+        if offset > 0:
+            return {
+                "ai_recommendations": ai_recommendations,
+                "expert_recommendations": [],
+                "ai_total": ai_total
+            }
         
         return {
             "ai_recommendations": ai_recommendations,
-            "expert_recommendations": formatted_expert_recs
+            # Uzman önerileri yüklemede biçimlendirilmiş olarak gelir
+            "expert_recommendations": self.gourmet_system.get_expert_recommendations(food.id, top_n),
+            "ai_total": ai_total
         }
     
     def _generate_explanation(self, food: Food, alcohol: Alcohol, score: float) -> str:
         """Eşleştirme önerisi için AI açıklaması oluştur"""
+        quality = _quality_band(score)
+        
+        # Açıklama metni (yemek, alkol, kalite bandı) için bir kez oluşturulur
+        generations = self._item_generations
+        key = (food.id, generations.get(('food', food.id), 0),
+               alcohol.id, generations.get(('alcohol', alcohol.id), 0), quality)
+        template = self._explanation_cache.get(key)
+        if template is None:
+            if len(self._explanation_cache) >= EXPLANATION_CACHE_SIZE:
+                self._explanation_cache.clear()
+            template = self._build_explanation_template(food, alcohol, quality)
+            self._explanation_cache[key] = template
+        
+        head, tail = template
+        return f"{head}{score:.1f}{tail}"
+    
+    def _build_explanation_template(self, food: Food, alcohol: Alcohol, quality: str) -> Tuple[str, str]:
+        """Skor değeri dışındaki açıklama metnini (ön ek, son ek) olarak oluştur"""
         explanations = []
         
         # Flavor explanations - Türkçe lezzet açıklamaları
-        flavor_translations = {
-            "spicy": "baharatlı", "sweet": "tatlı", "salty": "tuzlu", "sour": "ekşi",
-            "bitter": "acı", "umami": "umami", "rich": "zengin", "fresh": "taze",
-            "smoky": "dumanlı", "savory": "lezzetli", "acidic": "asitli", "mineral": "mineral",
-            "fruity": "meyveli", "floral": "çiçeksi", "earthy": "toprak", "creamy": "kremsi",
-            "crispy": "gevrek", "briny": "tuzlu"
-        }
-        
-        common_flavors = set(food.flavor_profile) & set(alcohol.flavor_profile)
+        common_flavors = food.flavor_set & alcohol.flavor_set
         if common_flavors:
-            tr_flavors = [flavor_translations.get(f, f) for f in common_flavors]
+            tr_flavors = [EXPLANATION_FLAVOR_TRANSLATIONS.get(f, f) for f in common_flavors]
             explanations.append(f"Ortak {', '.join(tr_flavors)} lezzet notaları")
         
-        # Complementary flavors - Tamamlayıcı lezzetler
-        complementary_pairs = [
-            ("spicy", "sweet"), ("salty", "sweet"), ("rich", "acidic")
-        ]
+        # Complementary flavors - Tamamlayıcı lezzetler (yalnızca ilk iki neden gösterilir)
         for food_flavor in food.flavor_profile:
+            if len(explanations) >= 2:
+                break
             for alcohol_flavor in alcohol.flavor_profile:
-                for pair in complementary_pairs:
-                    if (food_flavor, alcohol_flavor) == pair or (alcohol_flavor, food_flavor) == pair:
-                        tr_food = flavor_translations.get(food_flavor, food_flavor)
-                        tr_alcohol = flavor_translations.get(alcohol_flavor, alcohol_flavor)
-                        explanations.append(f"Tamamlayıcı {tr_food}-{tr_alcohol} dengesi")
+                if (food_flavor, alcohol_flavor) in EXPLANATION_COMPLEMENTARY_PAIRS:
+                    tr_food = EXPLANATION_FLAVOR_TRANSLATIONS.get(food_flavor, food_flavor)
+                    tr_alcohol = EXPLANATION_FLAVOR_TRANSLATIONS.get(alcohol_flavor, alcohol_flavor)
+                    explanations.append(f"Tamamlayıcı {tr_food}-{tr_alcohol} dengesi")
         
         # Regional matching - Bölgesel uyum
         if food.cuisine_type.lower() == alcohol.region.lower():
@@ -647,27 +1289,15 @@ class AIFoodAlcoholMatcher:
         if abs(food.intensity - (alcohol.alcohol_content / 5)) < 2:
             explanations.append("İyi dengeli yoğunluk seviyeleri")
         
-        # Turkish quality descriptions
-        if score >= 80:
-            quality = "Mükemmel"
-        elif score >= 70:
-            quality = "Çok İyi"
-        elif score >= 60:
-            quality = "İyi"
-        else:
-            quality = "Uygun"
-        
-        base_explanation = f"🤖 AI: {quality} eşleştirme ({score:.1f}/100)"
+        head = f"🤖 AI: {quality} eşleştirme ("
         if explanations:
-            return f"{base_explanation}: {'. '.join(explanations[:2])}"
+            return head, f"/100): {'. '.join(explanations[:2])}"
         else:
-            return base_explanation
+            return head, "/100)"
     
     def create_user_profile(self, name: str, age: int, preferences: Dict) -> UserProfile:
-        """Yeni kullanıcı profili oluştur"""
-        user_id = len(self.user_profiles) + 1
-        profile = UserProfile(
-            user_id=user_id,
+        """Yeni kullanıcı profili oluştur (id'yi veritabanı atar)"""
+        return self.user_profiles.create(
             name=name,
             age=age,
             alcohol_tolerance=preferences.get('alcohol_tolerance', 'medium'),
@@ -675,93 +1305,84 @@ class AIFoodAlcoholMatcher:
             dietary_restrictions=preferences.get('dietary_restrictions', []),
             budget_preference=preferences.get('budget_preference', 'mid-range'),
             favorite_cuisines=preferences.get('favorite_cuisines', []),
-            disliked_alcohols=preferences.get('disliked_alcohols', []),
-            previous_pairings=[]
+            disliked_alcohols=preferences.get('disliked_alcohols', [])
         )
-        
-        self.user_profiles[user_id] = profile
-        self._save_user_to_db(profile)
-        return profile
-    
-    def _save_user_to_db(self, profile: UserProfile):
-        """Kullanıcı profilini veritabanına kaydet"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO users 
-            (user_id, name, age, alcohol_tolerance, preferred_flavors, 
-             dietary_restrictions, budget_preference, favorite_cuisines, disliked_alcohols)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            profile.user_id, profile.name, profile.age, profile.alcohol_tolerance,
-            json.dumps(profile.preferred_flavors), json.dumps(profile.dietary_restrictions),
-            profile.budget_preference, json.dumps(profile.favorite_cuisines),
-            json.dumps(profile.disliked_alcohols)
-        ))
-        conn.commit()
-        conn.close()
+    
+    def get_user_profile(self, user_id: int) -> Optional[UserProfile]:
+        """Kullanıcı profilini getir (önbellekte yoksa veritabanından); kullanıcı yoksa None"""
+        return self.user_profiles.get(user_id)
+    
+    def update_user_profile(self, profile: UserProfile):
+        """Değiştirilmiş profili veritabanına ve önbelleğe yaz"""
+        self.user_profiles.save(profile)
     
     def rate_pairing(self, user_id: int, food_name: str, alcohol_name: str, rating: int):
         """Öğrenme için bir yemek-alkol eşleştirmesini puanla"""
-        food_id = next((f.id for f in self.foods if f.name == food_name), None)
-        alcohol_id = next((a.id for a in self.alcohols if a.name == alcohol_name), None)
-        
-        if food_id and alcohol_id and user_id in self.user_profiles:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO pairings (user_id, food_id, alcohol_id, rating, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, food_id, alcohol_id, rating, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
-            
-            # Update user profile
-            self.user_profiles[user_id].previous_pairings.append((food_id, alcohol_id, rating))
-    
-    def get_user_history(self, user_id: int) -> List[Dict]:
-        """Kullanıcının eşleştirme geçmişini al"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT food_id, alcohol_id, rating, timestamp FROM pairings 
-            WHERE user_id = ? ORDER BY timestamp DESC
-        ''', (user_id,))
-        
-        history = []
-        for row in cursor.fetchall():
-            food_id, alcohol_id, rating, timestamp = row
-            food_name = next((f.name for f in self.foods if f.id == food_id), "Bilinmeyen")
-            alcohol_name = next((a.name for a in self.alcohols if a.id == alcohol_id), "Bilinmeyen")
+        food = self.catalog.find_food(food_name)
+        alcohol = self.catalog.find_alcohol(alcohol_name)
+        
+        if food and alcohol and user_id in self.user_profiles:
+            food_id, alcohol_id = food.id, alcohol.id
+            self.rating_writer.submit((user_id, food_id, alcohol_id, rating, datetime.now().isoformat()))
             
-            history.append({
-                'food': food_name,
-                'alcohol': alcohol_name,
-                'rating': rating,
-                'timestamp': timestamp
-            })
+            # Önbellekteki profil (profiller değiştirilemez; yeni geçmişle yerine konur)
+            self.user_profiles.update_cached(user_id, lambda profile: replace(
+                profile, previous_pairings=self.user_profiles.recent_pairings(
+                    profile.previous_pairings, (food_id, alcohol_id, rating))))
+    
+    def _food_name(self, food_id: int) -> str:
+        """Id'ye karşılık gelen yemek adı"""
+        food = self.catalog.get_food(food_id)
+        return food.name if food else "Bilinmeyen"
+    
+    def _alcohol_name(self, alcohol_id: int) -> str:
+        """Id'ye karşılık gelen alkol adı"""
+        alcohol = self.catalog.get_alcohol(alcohol_id)
+        return alcohol.name if alcohol else "Bilinmeyen"
+    
+    def _history_entry(self, row: Tuple) -> Dict:
+        _, food_id, alcohol_id, rating, timestamp = row
+        return {
+            'food': self._food_name(food_id),
+            'alcohol': self._alcohol_name(alcohol_id),
+            'rating': rating,
+            'timestamp': timestamp
+        }
+    
+    def get_user_history(self, user_id: int, limit: Optional[int] = None) -> List[Dict]:
+        """Kullanıcının eşleştirme geçmişini al (en yeni önce; limit verilirse yalnızca ilk kayıtlar)"""
+        self.rating_writer.flush()
+        rows = self.db.query(USER_HISTORY_SQL, (user_id, -1 if limit is None else limit))
+        return [self._history_entry(row) for row in rows]
+    
+    def get_user_history_page(self, user_id: int, limit: int, cursor: Optional[str] = None) -> Dict:
+        """
+        Geçmişin bir sayfası (en yeni önce). next_cursor sonraki sayfayı getirir,
+        son sayfada None'dır; sayfa başına yalnızca limit + 1 satır okunur.
+        """
+        self.rating_writer.flush()
+        limit = max(1, limit)
+        if cursor:
+            timestamp, pairing_id = _decode_history_cursor(cursor)
+            rows = self.db.query(USER_HISTORY_AFTER_SQL, (user_id, timestamp, timestamp, pairing_id, limit + 1))
+        else:
+            rows = self.db.query(USER_HISTORY_SQL, (user_id, limit + 1))
         
-        conn.close()
-        return history
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last_id, _, _, _, last_timestamp = page[-1]
+            next_cursor = _encode_history_cursor(last_timestamp, last_id)
+        return {'items': [self._history_entry(row) for row in page], 'next_cursor': next_cursor}
     
     def get_trending_pairings(self, top_n: int = 10) -> List[Dict]:
         """Puanlamalara göre trend yemek-alkol eşleştirmelerini al"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT food_id, alcohol_id, AVG(rating) as avg_rating, COUNT(*) as count
-            FROM pairings 
-            GROUP BY food_id, alcohol_id 
-            HAVING count >= 2
-            ORDER BY avg_rating DESC, count DESC
-            LIMIT ?
-        ''', (top_n,))
-        
+        self.rating_writer.flush()
         trending = []
-        for row in cursor.fetchall():
+        for row in self.db.query(TRENDING_PAIRINGS_SQL, (top_n,)):
             food_id, alcohol_id, avg_rating, count = row
-            food_name = next((f.name for f in self.foods if f.id == food_id), "Bilinmeyen")
-            alcohol_name = next((a.name for a in self.alcohols if a.id == alcohol_id), "Bilinmeyen")
+            food_name = self._food_name(food_id)
+            alcohol_name = self._alcohol_name(alcohol_id)
             
             trending.append({
                 'food': food_name,
@@ -770,7 +1391,6 @@ class AIFoodAlcoholMatcher:
                 'votes': count
             })
         
-        conn.close()
         return trending
 
 def main():
@@ -956,13 +1576,13 @@ def main():
                 continue
                 
             print(f"\n📊 {current_user.name.upper()} İÇİN EŞLEŞTİRME GEÇMİŞİ:")
-            history = matcher.get_user_history(current_user.user_id)
+            history = matcher.get_user_history(current_user.user_id, limit=10)
             
             if not history:
                 print("Henüz eşleştirme geçmişi yok. Bazı eşleştirmeleri puanlamayı deneyin!")
             else:
                 print("-" * 60)
-                for entry in history[:10]:  # Show last 10
+                for entry in history:  # Son 10 kayıt
                     stars = "⭐" * entry['rating']
                     date = datetime.fromisoformat(entry['timestamp']).strftime("%Y-%m-%d %H:%M")
                     print(f"{entry['food']} + {entry['alcohol']}")
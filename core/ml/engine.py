@@ -3,6 +3,7 @@ Yemek-Alkol Eşleştirmesi için Gelişmiş Makine Öğrenimi Modülü
 Sinir ağları, işbirlikçi filtreleme ve öneri algoritmalarını içerir
 """
 
+import heapq
 import numpy as np
 import json
 import pickle
@@ -479,21 +480,20 @@ class AdvancedFoodAlcoholMatcher:
         if not alcohol_items:
             return []
         
-        recommendations = []
+        predictions = [
+            (alcohol_item, *self.predict_compatibility(food_item, alcohol_item, user_profile))
+            for alcohol_item in alcohol_items
+        ]
         
-        for alcohol_item in alcohol_items:
-            compatibility_score, model_scores = self.predict_compatibility(
-                food_item, alcohol_item, user_profile
-            )
-            
+        # Partial top-k selection (heap) instead of sorting every candidate
+        top_predictions = heapq.nlargest(top_n, predictions, key=lambda x: x[1])
+        
+        recommendations = []
+        for alcohol_item, compatibility_score, model_scores in top_predictions:
             explanation = self._generate_ml_explanation(food_item, alcohol_item, model_scores)
-            
             recommendations.append((alcohol_item, compatibility_score, explanation, model_scores))
         
-        # Sort by compatibility score
-        recommendations.sort(key=lambda x: x[1], reverse=True)
-        
-        return recommendations[:top_n]
+        return recommendations
     
     def _generate_ml_explanation(self, food_item, alcohol_item, model_scores) -> str:
         """Generate explanation based on ML model contributions"""
@@ -411,6 +411,28 @@ class EnhancedDatabaseManager:
                 )
             ''')
             
+            # Gün ve yemek-alkol çifti başına puan toplamları; aşağıdaki tetikleyicilerle güncel tutulur.
+            # Puansız ya da tarihi okunamayan kayıtlar toplamlara katılmaz. (day, ...) birincil
+            # anahtarı kümelenmiş (WITHOUT ROWID) olduğundan bir gün aralığı kapsayan indeks okumasıdır
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS pairing_daily_stats (
+                    day TEXT NOT NULL,
+                    food_id INTEGER NOT NULL,
+                    alcohol_id INTEGER NOT NULL,
+                    rating_sum INTEGER NOT NULL,
+                    rating_count INTEGER NOT NULL,
+                    PRIMARY KEY (day, food_id, alcohol_id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Tetikleyiciler yalnızca bu yöneticinin pairings şemasında (created_at sütunu) kurulur;
+            # dosya başka bir şemayla paylaşılıyorsa o şemanın tablo ve tetikleyicilerine dokunulmaz
+            pairing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(pairings)")}
+            if 'created_at' in pairing_columns:
+                self._install_daily_stats_triggers(cursor)
+            else:
+                logger.warning("pairings has no created_at column; daily rating aggregates are disabled")
+            
             # User sessions table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS user_sessions (
@@ -446,6 +468,9 @@ class EnhancedDatabaseManager:
                 "CREATE INDEX IF NOT EXISTS idx_pairings_alcohol_id ON pairings(alcohol_id)",
                 "CREATE INDEX IF NOT EXISTS idx_pairings_rating ON pairings(rating)",
                 "CREATE INDEX IF NOT EXISTS idx_pairings_created_at ON pairings(created_at)",
+                # Trend penceresinin ilk (yarım) günü için kapsayan indeks: tabloya dönülmez
+                "CREATE INDEX IF NOT EXISTS idx_pairings_created_at_rating "
+                "ON pairings(created_at, food_id, alcohol_id, rating)",
                 "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
                 "CREATE INDEX IF NOT EXISTS idx_foods_cuisine_type ON foods(cuisine_type)",
                 "CREATE INDEX IF NOT EXISTS idx_alcohols_type ON alcohols(type)",
@@ -467,6 +492,68 @@ class EnhancedDatabaseManager:
             conn.rollback()
             raise
     
+    @staticmethod
+    def _install_daily_stats_triggers(cursor):
+        """pairing_daily_stats tetikleyicilerini (yeniden) kur ve ilk aktarımı yap"""
+        # Tetikleyiciler her açılışta yeniden kurulur, eski tanımlar güncellenir;
+        # yalnızca bu yöneticinin pairings_daily_stats_* nesneleri silinir
+        cursor.executescript('''
+            BEGIN IMMEDIATE;
+            
+            DROP TRIGGER IF EXISTS pairings_daily_stats_insert;
+            DROP TRIGGER IF EXISTS pairings_daily_stats_delete;
+            DROP TRIGGER IF EXISTS pairings_daily_stats_update_old;
+            DROP TRIGGER IF EXISTS pairings_daily_stats_update_new;
+            
+            CREATE TRIGGER pairings_daily_stats_insert AFTER INSERT ON pairings
+            WHEN NEW.rating IS NOT NULL AND date(NEW.created_at) IS NOT NULL BEGIN
+                INSERT INTO pairing_daily_stats (day, food_id, alcohol_id, rating_sum, rating_count)
+                VALUES (date(NEW.created_at), NEW.food_id, NEW.alcohol_id, NEW.rating, 1)
+                ON CONFLICT (day, food_id, alcohol_id) DO UPDATE SET
+                    rating_sum = rating_sum + excluded.rating_sum,
+                    rating_count = rating_count + 1;
+            END;
+            
+            CREATE TRIGGER pairings_daily_stats_delete AFTER DELETE ON pairings
+            WHEN OLD.rating IS NOT NULL AND date(OLD.created_at) IS NOT NULL BEGIN
+                UPDATE pairing_daily_stats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+                WHERE day = date(OLD.created_at) AND food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id;
+                DELETE FROM pairing_daily_stats
+                WHERE day = date(OLD.created_at) AND food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id
+                  AND rating_count <= 0;
+            END;
+            
+            -- Güncelleme eski puanı düşen ve yeni puanı ekleyen iki tetikleyiciye bölünür
+            CREATE TRIGGER pairings_daily_stats_update_old
+            AFTER UPDATE OF food_id, alcohol_id, rating, created_at ON pairings
+            WHEN OLD.rating IS NOT NULL AND date(OLD.created_at) IS NOT NULL BEGIN
+                UPDATE pairing_daily_stats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+                WHERE day = date(OLD.created_at) AND food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id;
+                DELETE FROM pairing_daily_stats
+                WHERE day = date(OLD.created_at) AND food_id = OLD.food_id AND alcohol_id = OLD.alcohol_id
+                  AND rating_count <= 0;
+            END;
+            
+            CREATE TRIGGER pairings_daily_stats_update_new
+            AFTER UPDATE OF food_id, alcohol_id, rating, created_at ON pairings
+            WHEN NEW.rating IS NOT NULL AND date(NEW.created_at) IS NOT NULL BEGIN
+                INSERT INTO pairing_daily_stats (day, food_id, alcohol_id, rating_sum, rating_count)
+                VALUES (date(NEW.created_at), NEW.food_id, NEW.alcohol_id, NEW.rating, 1)
+                ON CONFLICT (day, food_id, alcohol_id) DO UPDATE SET
+                    rating_sum = rating_sum + excluded.rating_sum,
+                    rating_count = rating_count + 1;
+            END;
+            
+            -- Toplamlar tablosundan önce kaydedilmiş puanlar bir kez aktarılır
+            INSERT INTO pairing_daily_stats (day, food_id, alcohol_id, rating_sum, rating_count)
+            SELECT date(created_at), food_id, alcohol_id, SUM(rating), COUNT(rating) FROM pairings
+            WHERE rating IS NOT NULL AND date(created_at) IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM pairing_daily_stats)
+            GROUP BY date(created_at), food_id, alcohol_id;
+            
+            COMMIT;
+        ''')
+    
     def create_user(self, user_profile: EnhancedUserProfile) -> int:
         """Create a new user in the database"""
         conn = self.get_connection()
@@ -522,28 +609,43 @@ class EnhancedDatabaseManager:
             logger.error(f"Error logging event: {e}")
     
     def get_trending_pairings(self, limit: int = 10, days: int = 30) -> List[TrendingPairing]:
-        """Get trending pairings with advanced analytics"""
+        """
+        Get trending pairings with advanced analytics.
+        Yalnızca son `days` gün içinde verilen puanlar toplanır: tam günler pairing_daily_stats
+        anahtarının gün aralığından, ilk (yarım) gün idx_pairings_created_at_rating indeksinden
+        okunur; ikisi de kapsayan aralık okumasıdır. Gruplama maliyeti puan sayısıyla değil,
+        penceredeki (gün × o gün puanlanan çift) kayıt sayısıyla büyür.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
+        window = f'-{int(days)} days'
         
         try:
-            # Complex query to get trending pairings
             cursor.execute('''
+                WITH windowed AS (
+                    SELECT food_id, alcohol_id, rating_sum, rating_count
+                    FROM pairing_daily_stats
+                    WHERE day >= date('now', ?, '+1 day')
+                    UNION ALL
+                    SELECT food_id, alcohol_id, rating, 1
+                    FROM pairings
+                    WHERE created_at >= datetime('now', ?) AND created_at < date('now', ?, '+1 day')
+                      AND rating IS NOT NULL
+                )
                 SELECT 
-                    p.food_id, p.alcohol_id,
+                    w.food_id, w.alcohol_id,
                     f.name as food_name, a.name as alcohol_name,
-                    AVG(p.rating) as avg_rating,
-                    COUNT(*) as rating_count,
-                    COUNT(*) * AVG(p.rating) as trend_score
-                FROM pairings p
-                JOIN foods f ON p.food_id = f.id
-                JOIN alcohols a ON p.alcohol_id = a.id
-                WHERE p.created_at >= datetime('now', '-{} days')
-                GROUP BY p.food_id, p.alcohol_id
-                HAVING COUNT(*) >= 2
+                    CAST(SUM(w.rating_sum) AS REAL) / SUM(w.rating_count) as avg_rating,
+                    SUM(w.rating_count) as rating_count,
+                    SUM(w.rating_sum) as trend_score
+                FROM windowed w
+                JOIN foods f ON w.food_id = f.id
+                JOIN alcohols a ON w.alcohol_id = a.id
+                GROUP BY w.food_id, w.alcohol_id
+                HAVING SUM(w.rating_count) >= 2
                 ORDER BY trend_score DESC, avg_rating DESC
                 LIMIT ?
-            '''.format(days), (limit,))
+            ''', (window, window, window, limit))
             
             results = cursor.fetchall()
             trending_pairings = []
@@ -553,7 +655,7 @@ class EnhancedDatabaseManager:
                     food_id=row[0], alcohol_id=row[1],
                     food_name=row[2], alcohol_name=row[3],
                     average_rating=round(row[4], 2), rating_count=row[5],
-                    trend_score=row[6], popularity_rank=i + 1,
+                    trend_score=float(row[6]), popularity_rank=i + 1,
                     growth_rate=0.0  # Could be calculated with more complex query
                 )
                 trending_pairings.append(pairing)
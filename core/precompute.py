@@ -0,0 +1,126 @@
+"""
+Paralel Skor Matrisi Ön Hesaplaması
+Yemek×alkol uzayını karolara böler; karolar ProcessPoolExecutor işçilerinde
+CompatibilityEngine ile skorlanır ve bellek eşlemeli tek bir .npy dosyasına
+yazılır. Sonuç, tek süreçte hesaplanan ham skor matrisiyle birebir aynıdır.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from core.catalog_store import CatalogStore
+from core.score_cache import ScoreMatrixCache
+from core.scoring import CompatibilityEngine, compile_pairing_rules
+
+# Karo kenar uzunluğu (2048×2048 float64 karo 32 MiB)
+DEFAULT_TILE_SIZE = 2048
+# İlerleme satırları arasındaki en az süre
+PROGRESS_INTERVAL_S = 2.0
+
+# İşçi süreç durumu (_init_worker ile her süreçte bir kez kurulur)
+_worker_engine: Optional[CompatibilityEngine] = None
+_worker_output: Optional[np.ndarray] = None
+
+
+def _open_engine(store_path: Path, source_version: str, pairing_rules: Dict) -> CompatibilityEngine:
+    """Katalog deposunu açıp eşleştiricinin kullandığı motoru kur"""
+    store = CatalogStore.open(store_path, source_version)
+    if store is None:
+        raise RuntimeError(f"Katalog deposu açılamadı: {store_path}")
+    return CompatibilityEngine(store.foods, store.alcohols, compile_pairing_rules(pairing_rules), store=store)
+
+
+def _init_worker(store_path: Path, source_version: str, pairing_rules: Dict, output_path: Path):
+    global _worker_engine, _worker_output
+    _worker_engine = _open_engine(store_path, source_version, pairing_rules)
+    _worker_output = np.load(output_path, mmap_mode='r+')
+
+
+def _score_tile(tile: Tuple[int, int, int, int]) -> Tuple[int, int, float]:
+    """Karoyu skorla ve çıktıya yaz; (süreç kimliği, çift sayısı, süre) döndür"""
+    f0, f1, a0, a1 = tile
+    started = time.perf_counter()
+    _worker_output[f0:f1, a0:a1] = _worker_engine._base_scores(np.arange(f0, f1), np.arange(a0, a1))
+    return os.getpid(), (f1 - f0) * (a1 - a0), time.perf_counter() - started
+
+
+def tiles(shape: Tuple[int, int], tile_size: int) -> List[Tuple[int, int, int, int]]:
+    """Matrisi (yemek başı, yemek sonu, alkol başı, alkol sonu) karolarına böl"""
+    n_foods, n_alcohols = shape
+    return [
+        (f0, min(f0 + tile_size, n_foods), a0, min(a0 + tile_size, n_alcohols))
+        for f0 in range(0, n_foods, tile_size)
+        for a0 in range(0, n_alcohols, tile_size)
+    ]
+
+
+def precompute_score_matrix(store_path: Path, source_version: str, pairing_rules: Dict,
+                            cache: ScoreMatrixCache, workers: Optional[int] = None,
+                            tile_size: int = DEFAULT_TILE_SIZE, force: bool = False,
+                            log: Callable[[str], None] = print) -> Dict:
+    """
+    Ham skor matrisini çok süreçli olarak hesaplayıp skor önbelleğine yaz.
+    Önbellek güncel katalogla zaten eşleşiyorsa (force verilmedikçe) hesaplama atlanır.
+    Süre, verim ve işçi başına istatistikleri içeren bir rapor döndürür.
+    """
+    engine = _open_engine(store_path, source_version, pairing_rules)
+    shape = (len(engine.foods), len(engine.alcohols))
+    version = engine.catalog_version()
+    workers = workers or os.cpu_count() or 1
+    report = {'shape': list(shape), 'version': version, 'workers': workers, 'tile_size': tile_size}
+
+    if not force and cache.load(version, shape) is not None:
+        log("✅ Skor matrisi önbelleği güncel, ön hesaplama atlandı")
+        return {**report, 'skipped': True}
+
+    plan = tiles(shape, tile_size)
+    log(f"🧮 {shape[0]}×{shape[1]} skor matrisi {len(plan)} karoda, {workers} işçiyle hesaplanıyor...")
+
+    output = cache.allocate(shape)
+    per_worker: Dict[int, Dict] = {}
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store_path, source_version, pairing_rules, output)) as pool:
+            futures = [pool.submit(_score_tile, tile) for tile in plan]
+            done = pairs_done = 0
+            last_log = started
+            for future in as_completed(futures):
+                pid, pairs, seconds = future.result()
+                stats = per_worker.setdefault(pid, {'tiles': 0, 'pairs': 0, 'busy_s': 0.0})
+                stats['tiles'] += 1
+                stats['pairs'] += pairs
+                stats['busy_s'] += seconds
+                done += 1
+                pairs_done += pairs
+
+                now = time.perf_counter()
+                if now - last_log >= PROGRESS_INTERVAL_S or done == len(plan):
+                    last_log = now
+                    log(f"⏳ {done}/{len(plan)} karo (%{100 * done / len(plan):.0f}), "
+                        f"{pairs_done / (now - started):,.0f} çift/s")
+        cache.publish(version, output, shape)
+    finally:
+        if output.exists():
+            output.unlink()
+
+    elapsed = time.perf_counter() - started
+    workers_report = []
+    for pid, stats in sorted(per_worker.items()):
+        throughput = stats['pairs'] / stats['busy_s'] if stats['busy_s'] > 0 else None
+        workers_report.append({'pid': pid, **stats, 'throughput_pairs_per_s': throughput})
+        log(f"   👷 {pid}: {stats['tiles']} karo, {stats['pairs']:,} çift, "
+            f"{stats['busy_s']:.1f} s, {throughput or 0:,.0f} çift/s")
+    total_pairs = shape[0] * shape[1]
+    log(f"✅ Skor matrisi {elapsed:.1f} s'de hesaplandı ({total_pairs / elapsed:,.0f} çift/s)")
+
+    return {
+        **report,
+        'tiles': len(plan),
+        'seconds': elapsed,
+        'throughput_pairs_per_s': total_pairs / elapsed if elapsed > 0 else None,
+        'per_worker': workers_report,
+    }
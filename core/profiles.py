@@ -0,0 +1,186 @@
+"""
+Kullanıcı Profili Deposu
+Profiller users tablosundan istek üzerine okunur ve sınırlı bir LRU önbellekte
+tutulur. Id'leri SQLite atar, güncellemeler önce veritabanına yazılır ve
+users.version sütununu artırır; önbellekteki profil her okumada bu sürümle
+karşılaştırıldığından aynı veritabanını kullanan tüm süreçler aynı profilleri görür.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import fields as dataclass_fields
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+P = TypeVar('P')
+
+# Süreç başına önbellekte tutulan en fazla profil
+PROFILE_CACHE_SIZE = 10000
+
+# Profilde tutulan en yeni puan sayısı; geçmişin tamamı sayfalı geçmiş API'sindedir
+PROFILE_HISTORY_LIMIT = 50
+
+INSERT_USER_SQL = '''
+    INSERT INTO users
+    (name, age, alcohol_tolerance, preferred_flavors,
+     dietary_restrictions, budget_preference, favorite_cuisines, disliked_alcohols)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+UPDATE_USER_SQL = '''
+    UPDATE users SET
+        name = ?, age = ?, alcohol_tolerance = ?, preferred_flavors = ?,
+        dietary_restrictions = ?, budget_preference = ?, favorite_cuisines = ?, disliked_alcohols = ?,
+        version = version + 1
+    WHERE user_id = ?
+'''
+
+USER_VERSION_SQL = '''
+    SELECT version FROM users WHERE user_id = ?
+'''
+
+SELECT_USER_SQL = '''
+    SELECT version, name, age, alcohol_tolerance, preferred_flavors,
+           dietary_restrictions, budget_preference, favorite_cuisines, disliked_alcohols
+    FROM users WHERE user_id = ?
+'''
+
+# idx_pairings_user_history sırasıyla okunur: kullanıcının yalnızca en yeni limit satırı
+USER_PAIRINGS_SQL = '''
+    SELECT food_id, alcohol_id, rating FROM pairings
+    WHERE user_id = ?
+    ORDER BY timestamp DESC, id
+    LIMIT ?
+'''
+
+
+def _columns(values: Dict) -> Tuple:
+    """Profil alanlarını users tablosu sütun sırasına çevir (listeler JSON olarak)"""
+    return (
+        values['name'], values['age'], values['alcohol_tolerance'],
+        json.dumps(list(values['preferred_flavors'])), json.dumps(list(values['dietary_restrictions'])),
+        values['budget_preference'], json.dumps(list(values['favorite_cuisines'])),
+        json.dumps(list(values['disliked_alcohols'])),
+    )
+
+
+class UserProfileStore(Generic[P]):
+    """
+    users tablosunun önünde okuma-geçişli (read-through), yazma-geçişli
+    (write-through) LRU önbellek. Profiller profile_type(**alanlar) ile kurulur.
+    Önbellekteki her profil okunduğu users.version değeriyle tutulur; get her
+    isabette bu değeri (birincil anahtarla tek sütun) okur ve başka bir süreç
+    profili güncellediyse profili yeniden yükler. Yalnızca previous_pairings
+    geçmişi, başka süreçte verilen puanları profil yeniden yüklenene kadar
+    içermeyebilir; en yeni history_limit puanla sınırlıdır (eskiden yeniye).
+    before_load verilirse her veritabanı okumasından önce çağrılır (ör. bekleyen
+    puanları yazmak için).
+    """
+
+    def __init__(self, db, profile_type: Callable[..., P], capacity: int = PROFILE_CACHE_SIZE,
+                 history_limit: int = PROFILE_HISTORY_LIMIT,
+                 before_load: Optional[Callable[[], None]] = None):
+        self.db = db
+        self.profile_type = profile_type
+        self.capacity = capacity
+        self.history_limit = history_limit
+        self.before_load = before_load
+        # user_id → (users.version, profil)
+        self._cache: 'OrderedDict[int, Tuple[int, P]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[P]:
+        """Profili önbellekten (sürümü güncelse), yoksa veritabanından getir; kullanıcı yoksa None"""
+        with self._lock:
+            entry = self._cache.get(user_id)
+        if entry is not None:
+            rows = self.db.query(USER_VERSION_SQL, (user_id,))
+            if rows and rows[0][0] == entry[0]:
+                with self._lock:
+                    if user_id in self._cache:
+                        self._cache.move_to_end(user_id)
+                return entry[1]
+
+        loaded = self._load(user_id)
+        if loaded is None:
+            with self._lock:
+                self._cache.pop(user_id, None)
+            return None
+        version, profile = loaded
+        self._remember(user_id, version, profile)
+        return profile
+
+    def __contains__(self, user_id) -> bool:
+        """Kullanıcı var mı (önbellekte değilse yalnızca varlık sorgusu; profil yüklenmez)"""
+        with self._lock:
+            if user_id in self._cache:
+                return True
+        return bool(self.db.query(USER_VERSION_SQL, (user_id,)))
+
+    def __getitem__(self, user_id: int) -> P:
+        profile = self.get(user_id)
+        if profile is None:
+            raise KeyError(user_id)
+        return profile
+
+    def create(self, **fields) -> P:
+        """Profili veritabanına ekle (id'yi SQLite atar) ve önbelleğe al"""
+        user_id = self.db.execute(INSERT_USER_SQL, _columns(fields))
+        profile = self.profile_type(user_id=user_id, previous_pairings=(), **fields)
+        self._remember(user_id, 0, profile)
+        return profile
+
+    def save(self, profile: P):
+        """Güncellenen profili önce veritabanına, sonra önbelleğe yaz"""
+        values = {field.name: getattr(profile, field.name) for field in dataclass_fields(profile)}
+        params = (*_columns(values), profile.user_id)
+
+        def update(conn):
+            # Yeni sürüm aynı işlemde okunur; araya giren başka bir güncelleme karışmaz
+            conn.execute(UPDATE_USER_SQL, params)
+            return conn.execute(USER_VERSION_SQL, (profile.user_id,)).fetchone()[0]
+
+        self._remember(profile.user_id, self.db.run(update, write=True), profile)
+
+    def update_cached(self, user_id: int, update: Callable[[P], P]):
+        """
+        Veritabanına başka yoldan yazılmış bir değişikliği önbellekteki profile
+        uygula (profil önbellekte değilse bir sonraki okumada zaten güncel gelir)
+        """
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is not None:
+                self._cache[user_id] = (entry[0], update(entry[1]))
+
+    def _remember(self, user_id: int, version: int, profile: P):
+        with self._lock:
+            self._cache[user_id] = (version, profile)
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def recent_pairings(self, pairings: Tuple, *new: Tuple) -> Tuple:
+        """Geçmişe yeni puanları ekle, yalnızca en yeni history_limit kaydı tut"""
+        return (tuple(pairings) + new)[-self.history_limit:] if self.history_limit > 0 else ()
+
+    def _load(self, user_id: int) -> Optional[Tuple[int, P]]:
+        """(users.version, profil); kullanıcı yoksa None"""
+        if self.before_load is not None:
+            self.before_load()
+        rows = self.db.query(SELECT_USER_SQL, (user_id,))
+        if not rows:
+            return None
+        (version, name, age, alcohol_tolerance, preferred_flavors, dietary_restrictions,
+         budget_preference, favorite_cuisines, disliked_alcohols) = rows[0]
+        return version, self.profile_type(
+            user_id=user_id,
+            name=name,
+            age=age,
+            alcohol_tolerance=alcohol_tolerance,
+            preferred_flavors=json.loads(preferred_flavors or '[]'),
+            dietary_restrictions=json.loads(dietary_restrictions or '[]'),
+            budget_preference=budget_preference,
+            favorite_cuisines=json.loads(favorite_cuisines or '[]'),
+            disliked_alcohols=json.loads(disliked_alcohols or '[]'),
+            previous_pairings=self.db.query(USER_PAIRINGS_SQL, (user_id, self.history_limit))[::-1],
+        )
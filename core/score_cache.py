@@ -0,0 +1,132 @@
+"""
+Önceden Hesaplanmış Skor Matrisi Önbelleği
+Kural tabanlı ham skor matrisini katalog ve kuralların içerik özetiyle
+birlikte diske kaydeder; özet değiştiğinde önbellek geçersiz sayılır.
+Sürüm, .npy verisinin ardına eklenen sabit boyutlu bir son ekte (trailer)
+tutulur; matris ile sürümü aynı dosyadan okunduğundan birbirinden ayrılamaz.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Dosya düzeni değiştiğinde artırılır, eski önbellekler otomatik geçersiz olur
+SCORE_CACHE_FORMAT = 2
+
+# Son ek: sihirli baytlar + boşlukla doldurulmuş JSON ({'format', 'version'})
+_TRAILER_MAGIC = b'NYSCORES'
+_TRAILER_SIZE = 256
+
+
+def _canonical(value):
+    """Kural sözlüklerini (tuple anahtarlı) JSON'a uygun, sıralı bir yapıya çevir"""
+    if isinstance(value, dict):
+        return [[_canonical(k), _canonical(v)] for k, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def catalog_fingerprint(foods: List, alcohols: List, pairing_rules: Dict,
+                        catalog_hash: Optional[str] = None) -> str:
+    """
+    Katalog ve eşleştirme kurallarının içerik özetini (SHA-256) hesapla.
+    catalog_hash verilirse (katalog deposunun içerik özeti) öğeler tek tek özetlenmez.
+    """
+    payload = {'format': SCORE_CACHE_FORMAT}
+    if catalog_hash is None:
+        payload['foods'] = [_canonical(asdict(f)) for f in foods]
+        payload['alcohols'] = [_canonical(asdict(a)) for a in alcohols]
+    else:
+        payload['catalog'] = catalog_hash
+    payload['rules'] = _canonical(pairing_rules)
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _trailer(version: str) -> bytes:
+    payload = json.dumps({'format': SCORE_CACHE_FORMAT, 'version': version}).encode('ascii')
+    return _TRAILER_MAGIC + payload.ljust(_TRAILER_SIZE - len(_TRAILER_MAGIC))
+
+
+def _read_trailer(f) -> Optional[Dict]:
+    """Açık dosyanın sonundaki sürüm bilgisi (son ek yoksa None)"""
+    f.seek(0, os.SEEK_END)
+    if f.tell() < _TRAILER_SIZE:
+        return None
+    f.seek(-_TRAILER_SIZE, os.SEEK_END)
+    trailer = f.read(_TRAILER_SIZE)
+    if not trailer.startswith(_TRAILER_MAGIC):
+        return None
+    return json.loads(trailer[len(_TRAILER_MAGIC):].decode('ascii'))
+
+
+class ScoreMatrixCache:
+    """Ham skor matrisini, sürüm bilgisini dosya sonunda taşıyan tek bir .npy dosyasında tutan disk önbelleği"""
+
+    def __init__(self, matrix_path: Path):
+        self.matrix_path = Path(matrix_path)
+
+    def load(self, version: str, shape: Tuple[int, int]) -> Optional[np.ndarray]:
+        """Sürüm ve boyut eşleşirse matrisi salt okunur bellek eşlemesiyle yükle"""
+        if not self.matrix_path.exists():
+            return None
+
+        try:
+            # Son ek ve eşleme aynı açık dosyadan okunur; dosya bu arada yenisiyle değiştirilse de tutarlıdır
+            with open(self.matrix_path, 'rb') as f:
+                meta = _read_trailer(f)
+                if not meta or meta.get('format') != SCORE_CACHE_FORMAT or meta.get('version') != version:
+                    return None
+
+                f.seek(0)
+                major, _ = np.lib.format.read_magic(f)
+                if major == 1:
+                    stored_shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    stored_shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                if stored_shape != tuple(shape):
+                    return None
+                return np.memmap(f, dtype=dtype, mode='r', shape=stored_shape,
+                                 order='F' if fortran_order else 'C', offset=f.tell())
+        except Exception as e:
+            print(f"⚠️ Skor matrisi önbelleği okunamadı: {e}")
+            return None
+
+    def _tmp_path(self, path: Path) -> Path:
+        return path.with_name(path.name + f".{os.getpid()}.tmp")
+
+    def save(self, version: str, matrix: np.ndarray):
+        """Matrisi sürüm bilgisiyle birlikte atomik olarak diske yaz"""
+        self.matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            tmp_matrix = self._tmp_path(self.matrix_path)
+            with open(tmp_matrix, 'wb') as f:
+                np.save(f, np.ascontiguousarray(matrix))
+                f.write(_trailer(version))
+            os.replace(tmp_matrix, self.matrix_path)
+        except Exception as e:
+            print(f"⚠️ Skor matrisi önbelleği kaydedilemedi: {e}")
+
+    def allocate(self, shape: Tuple[int, int]) -> Path:
+        """
+        Parça parça doldurulacak geçici .npy dosyasını oluştur ve yolunu döndür.
+        Yazan süreçler dosyayı np.load(..., mmap_mode='r+') ile açar; dosya
+        publish çağrılana kadar önbellek olarak görünmez.
+        """
+        self.matrix_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_matrix = self._tmp_path(self.matrix_path)
+        matrix = np.lib.format.open_memmap(tmp_matrix, mode='w+', dtype=np.float64, shape=tuple(shape))
+        del matrix
+        return tmp_matrix
+
+    def publish(self, version: str, tmp_matrix: Path, shape: Tuple[int, int]):
+        """allocate ile oluşturulup doldurulan matrise sürümü ekleyip önbellek olarak yerine koy"""
+        with open(tmp_matrix, 'ab') as f:
+            f.write(_trailer(version))
+        os.replace(tmp_matrix, self.matrix_path)
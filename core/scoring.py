@@ -0,0 +1,593 @@
+"""
+Vektörel Uyumluluk Skorlama Motoru
+Yemek ve alkol kataloglarını bir kez sayısal dizilere kodlar ve
+yemek×alkol skor matrisini tek bir toplu işlemle hesaplar
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from core.score_cache import ScoreMatrixCache, catalog_fingerprint
+from core.catalog_store import bit_words, encode_ragged, has_code, pack_code_rows
+
+# calculate_compatibility_score ile aynı bileşen ağırlıkları
+FLAVOR_WEIGHT = 0.4
+INTENSITY_WEIGHT = 0.2
+TEXTURE_BODY_WEIGHT = 0.15
+REGIONAL_WEIGHT = 0.1
+TEMPERATURE_WEIGHT = 0.05
+USER_WEIGHT = 0.1
+
+# Referans fonksiyondaki max_score ile aynı sırada toplanır
+BASE_MAX_SCORE = FLAVOR_WEIGHT + INTENSITY_WEIGHT + TEXTURE_BODY_WEIGHT + REGIONAL_WEIGHT + TEMPERATURE_WEIGHT
+USER_MAX_SCORE = BASE_MAX_SCORE + USER_WEIGHT
+
+# Kurallarda bulunmayan eşleşmeler için varsayılan değerler
+DEFAULT_SIMILAR_FLAVOR = 0.5
+DEFAULT_TEXTURE_BODY = 0.5
+DEFAULT_REGIONAL = 0.3
+DEFAULT_TEMPERATURE = 0.6
+
+# Kullanıcı profili bileşeninin ham katkıları
+PREFERRED_FLAVOR_BONUS = 0.3
+BUDGET_MATCH_BONUS = 0.2
+DIETARY_PENALTY = 0.5
+DISLIKED_PENALTY = 0.8
+
+# Bellekte tutulan en fazla farklı profil vektörü sayısı
+USER_DELTA_CACHE_SIZE = 1024
+
+
+def _intern_codes(values: Sequence[str], vocabulary: Dict[str, int]) -> np.ndarray:
+    """Kategorik değerleri sözlüğe ekleyerek tamsayı kodlarına çevir"""
+    return np.array([vocabulary.setdefault(v, len(vocabulary)) for v in values], dtype=np.int64)
+
+
+def top_k_indices(scores: np.ndarray, k: int, offset: int = 0) -> np.ndarray:
+    """
+    Tüm diziyi sıralamadan en yüksek skorlu [offset, offset + k) sıralarının
+    indekslerini döndür. Eşit skorlarda düşük indeks önce gelir (kararlı sıralama).
+    """
+    n = min(offset + k, len(scores))
+    if k <= 0 or n <= offset:
+        return np.empty(0, dtype=np.int64)
+
+    if n < len(scores):
+        # n'inci en yüksek skor eşiği; eşitlerin tamamı aday olarak tutulur
+        threshold = -np.partition(-scores, n - 1)[n - 1]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][offset:n]
+
+
+class CompiledPairingRules:
+    """
+    Lezzet eşleştirme kurallarının derlenmiş hali: lezzet sözlüğü indeksi ve
+    köşegeninde benzer lezzet ağırlıkları bulunan simetrik etkileşim matrisi
+    """
+
+    def __init__(self, pairing_rules: Dict):
+        self.rules = pairing_rules
+        self.flavor_index: Dict[str, int] = {}
+
+        flavor_rules = pairing_rules["flavor_matching"]
+        for table in (flavor_rules["complementary"], flavor_rules["similar"]):
+            for pair in table:
+                for flavor in pair:
+                    self.flavor_index.setdefault(flavor, len(self.flavor_index))
+
+        vocabulary_size = len(self.flavor_index)
+        self.flavor_matrix = np.zeros((vocabulary_size, vocabulary_size), dtype=np.float64)
+        for (f1, f2), weight in flavor_rules["complementary"].items():
+            i, j = self.flavor_index[f1], self.flavor_index[f2]
+            self.flavor_matrix[i, j] += weight
+            if i != j:
+                self.flavor_matrix[j, i] += weight
+        for flavor, i in self.flavor_index.items():
+            self.flavor_matrix[i, i] += flavor_rules["similar"].get((flavor, flavor), DEFAULT_SIMILAR_FLAVOR)
+
+        rows, cols = np.nonzero(self.flavor_matrix)
+        vocabulary = list(self.flavor_index)
+        self.pair_weights = {
+            (vocabulary[i], vocabulary[j]): float(self.flavor_matrix[i, j]) for i, j in zip(rows, cols)
+        }
+
+    def add_flavors(self, flavors: Iterable[str]):
+        """Sözlükte olmayan lezzetleri varsayılan benzerlik ağırlığıyla ekle"""
+        new_flavors = []
+        for flavor in flavors:
+            if flavor not in self.flavor_index:
+                self.flavor_index[flavor] = len(self.flavor_index)
+                new_flavors.append(flavor)
+        if not new_flavors:
+            return
+
+        grow = len(new_flavors)
+        self.flavor_matrix = np.pad(self.flavor_matrix, ((0, grow), (0, grow)))
+        # Kurallarda geçmeyen lezzetler yalnızca kendileriyle benzerdir
+        for flavor in new_flavors:
+            i = self.flavor_index[flavor]
+            self.flavor_matrix[i, i] = DEFAULT_SIMILAR_FLAVOR
+            self.pair_weights[(flavor, flavor)] = DEFAULT_SIMILAR_FLAVOR
+
+    def encode(self, profiles: Sequence[Sequence[str]]) -> np.ndarray:
+        """Lezzet profillerini (tekrarları koruyarak) sayım vektörlerine çevir"""
+        self.add_flavors(f for profile in profiles for f in profile)
+        counts = np.zeros((len(profiles), len(self.flavor_index)), dtype=np.float64)
+        for row, profile in enumerate(profiles):
+            for flavor in profile:
+                counts[row, self.flavor_index[flavor]] += 1
+        return counts
+
+    def flavor_score(self, food_flavors: Sequence[str], alcohol_flavors: Sequence[str]) -> float:
+        """Tek bir yemek-alkol çifti için lezzet skorunu tablo aramasıyla hesapla"""
+        score = 0.0
+        for food_flavor in food_flavors:
+            for alcohol_flavor in alcohol_flavors:
+                score += self.pair_weights.get(
+                    (food_flavor, alcohol_flavor),
+                    DEFAULT_SIMILAR_FLAVOR if food_flavor == alcohol_flavor else 0.0
+                )
+        return score
+
+
+def compile_pairing_rules(pairing_rules: Dict) -> CompiledPairingRules:
+    """_load_pairing_rules çıktısını arama tablolarına derle"""
+    return CompiledPairingRules(pairing_rules)
+
+
+class CompatibilityEngine:
+    """
+    Tüm yemek×alkol uyumluluk skorlarını NumPy ile toplu hesaplayan motor.
+    store verilirse özellik dizileri Food/Alcohol nesneleri üretilmeden
+    doğrudan katalog deposunun sütunlarından okunur.
+    """
+
+    def __init__(self, foods: Sequence, alcohols: Sequence, compiled_rules: CompiledPairingRules,
+                 store=None):
+        self.foods = foods
+        self.alcohols = alcohols
+        self.store = store
+        self.compiled_rules = compiled_rules
+        self.pairing_rules = compiled_rules.rules
+
+        self.base_matrix: Optional[np.ndarray] = None
+        # Profil içeriği → UserDelta; katalog değişince temizlenmelidir
+        self._user_deltas: Dict[Tuple, UserDelta] = {}
+
+        if store is None:
+            self._encode_foods()
+            self._encode_alcohols()
+        else:
+            self._encode_store()
+        self._build_rule_tables()
+
+    def _encode_foods(self):
+        """Yemek kataloğunu özellik dizilerine kodla"""
+        self.texture_index: Dict[str, int] = {}
+        self.cuisine_index: Dict[str, int] = {}
+        self.price_index: Dict[str, int] = {}
+        self.serving_index: Dict[str, int] = {}
+        self.dietary_index: Dict[str, int] = {}
+
+        self.food_intensity = np.array([f.intensity for f in self.foods], dtype=np.float64)
+        self.food_texture = _intern_codes([f.texture for f in self.foods], self.texture_index)
+        self.food_cuisine = _intern_codes([f.cuisine_type for f in self.foods], self.cuisine_index)
+        self.food_price = _intern_codes([f.price_range for f in self.foods], self.price_index)
+        self.food_serving = _intern_codes([f.serving_temp for f in self.foods], self.serving_index)
+        offsets, codes = encode_ragged([f.dietary_tags for f in self.foods], self.dietary_index)
+        self.food_dietary_bits = pack_code_rows(offsets, codes, len(self.dietary_index))
+
+    def _encode_alcohols(self):
+        """Alkol kataloğunu özellik dizilerine kodla"""
+        self.body_index: Dict[str, int] = {}
+        self.region_index: Dict[str, int] = {}
+        self.type_index: Dict[str, int] = {}
+
+        self.alcohol_strength = np.array([a.alcohol_content for a in self.alcohols], dtype=np.float64) / 5
+        self.alcohol_body = _intern_codes([a.body for a in self.alcohols], self.body_index)
+        self.alcohol_region = _intern_codes([a.region for a in self.alcohols], self.region_index)
+        self.alcohol_price = _intern_codes([a.price_range for a in self.alcohols], self.price_index)
+        self.alcohol_type = _intern_codes([a.type for a in self.alcohols], self.type_index)
+        self.alcohol_names = [a.name for a in self.alcohols]
+        self.alcohol_sweetness = np.array([a.sweetness for a in self.alcohols], dtype=np.float64)
+        self.alcohol_acidity = np.array([a.acidity for a in self.alcohols], dtype=np.float64)
+        self.alcohol_tannins = np.array([a.tannins for a in self.alcohols], dtype=np.float64)
+
+        # Lezzet sözlüğü her iki katalog eklendikten sonra sabitlenir
+        self.compiled_rules.add_flavors(f for item in self.foods + self.alcohols for f in item.flavor_profile)
+        self.flavor_index = self.compiled_rules.flavor_index
+        self.flavor_matrix = self.compiled_rules.flavor_matrix
+        self.food_flavors = self.compiled_rules.encode([f.flavor_profile for f in self.foods])
+        self.alcohol_flavors = self.compiled_rules.encode([a.flavor_profile for a in self.alcohols])
+
+        self.flavor_bit_index = dict(self.flavor_index)
+        offsets, codes = encode_ragged([a.flavor_profile for a in self.alcohols], self.flavor_bit_index)
+        self.alcohol_flavor_bits = pack_code_rows(offsets, codes, len(self.flavor_bit_index))
+
+    def _encode_store(self):
+        """Özellik dizilerini katalog deposunun sütunlarından oku"""
+        store = self.store
+
+        # Kategori kodları deponun sözlük kodlarıdır
+        self.texture_index = store.codes('texture')
+        self.cuisine_index = store.codes('cuisine_type')
+        self.price_index = store.codes('price_range')
+        self.serving_index = store.codes('serving_temp')
+        self.dietary_index = store.codes('dietary_tag')
+        self.body_index = store.codes('body')
+        self.region_index = store.codes('region')
+        self.type_index = store.codes('type')
+
+        self.food_intensity = store.column('food.intensity').astype(np.float64)
+        self.food_texture = store.column('food.texture').astype(np.int64)
+        self.food_cuisine = store.column('food.cuisine_type').astype(np.int64)
+        self.food_price = store.column('food.price_range').astype(np.int64)
+        self.food_serving = store.column('food.serving_temp').astype(np.int64)
+        self.food_dietary_bits = store.column('food.dietary_tags.bits')
+
+        self.alcohol_strength = store.abv() / 5
+        self.alcohol_body = store.column('alcohol.body').astype(np.int64)
+        self.alcohol_region = store.column('alcohol.region').astype(np.int64)
+        self.alcohol_price = store.column('alcohol.price_range').astype(np.int64)
+        self.alcohol_type = store.column('alcohol.type').astype(np.int64)
+        self.alcohol_names = store.names('alcohol')
+        self.alcohol_sweetness = store.column('alcohol.sweetness').astype(np.float64)
+        self.alcohol_acidity = store.column('alcohol.acidity').astype(np.float64)
+        self.alcohol_tannins = store.column('alcohol.tannins').astype(np.float64)
+
+        # Deponun lezzet sözlüğü yemekler önce olmak üzere ilk görülme sırasındadır
+        self.compiled_rules.add_flavors(store.vocabularies.get('flavor', []))
+        self.flavor_index = self.compiled_rules.flavor_index
+        self.flavor_matrix = self.compiled_rules.flavor_matrix
+        self.food_flavors = store.list_counts('food', 'flavor_profile', self.flavor_index)
+        self.alcohol_flavors = store.list_counts('alcohol', 'flavor_profile', self.flavor_index)
+
+        self.flavor_bit_index = store.codes('flavor')
+        self.alcohol_flavor_bits = store.column('alcohol.flavor_profile.bits')
+
+    def _build_rule_tables(self):
+        """Eşleştirme kurallarını kod tabanlı arama tablolarına dönüştür"""
+        rules = self.pairing_rules
+
+        self.texture_body_table = np.full((len(self.texture_index), len(self.body_index)), DEFAULT_TEXTURE_BODY)
+        for (texture, body), value in rules["texture_alcohol_body"].items():
+            if texture in self.texture_index and body in self.body_index:
+                self.texture_body_table[self.texture_index[texture], self.body_index[body]] = value
+
+        self.regional_table = np.full((len(self.cuisine_index), len(self.region_index)), DEFAULT_REGIONAL)
+        for (cuisine, region), value in rules["cuisine_regional"].items():
+            if cuisine in self.cuisine_index and region in self.region_index:
+                self.regional_table[self.cuisine_index[cuisine], self.region_index[region]] = value
+
+        self.serving_temperature = np.array([
+            rules["temperature_matching"].get((temp, "room-temp"), DEFAULT_TEMPERATURE)
+            for temp in self.serving_index
+        ], dtype=np.float64)
+        self.food_temperature = self.serving_temperature[self.food_serving]
+
+    def _base_scores(self, fi: np.ndarray, ai: np.ndarray) -> np.ndarray:
+        """Kullanıcıdan bağımsız ağırlıklı ham skorlar (normalize edilmemiş)"""
+        # 1. Flavor Profile Matching
+        flavor = self.food_flavors[fi] @ self.flavor_matrix @ self.alcohol_flavors[ai].T
+        score = flavor * FLAVOR_WEIGHT
+
+        # 2. Intensity Matching
+        intensity_diff = np.abs(self.food_intensity[fi][:, None] - self.alcohol_strength[ai][None, :])
+        intensity = np.maximum(0, 1 - (intensity_diff / 10)) * self.pairing_rules["intensity_matching"]
+        score = score + intensity * INTENSITY_WEIGHT
+
+        # 3. Texture and Body Matching
+        texture_body = self.texture_body_table[self.food_texture[fi][:, None], self.alcohol_body[ai][None, :]]
+        score = score + texture_body * TEXTURE_BODY_WEIGHT
+
+        # 4. Regional/Cuisine Matching
+        regional = self.regional_table[self.food_cuisine[fi][:, None], self.alcohol_region[ai][None, :]]
+        score = score + regional * REGIONAL_WEIGHT
+
+        # 5. Temperature Compatibility
+        score = score + (self.food_temperature[fi] * TEMPERATURE_WEIGHT)[:, None]
+        return score
+
+    def user_delta(self, user_profile) -> 'UserDelta':
+        """Profilin kompakt vektörlerini döndür; aynı içerikli profiller önbellekten gelir"""
+        key = UserDelta.profile_key(user_profile)
+        delta = self._user_deltas.get(key)
+        if delta is None:
+            if len(self._user_deltas) >= USER_DELTA_CACHE_SIZE:
+                self._user_deltas.clear()
+            delta = UserDelta(self, user_profile)
+            self._user_deltas[key] = delta
+        return delta
+
+    def score_matrix(self, food_indices: Optional[Sequence[int]] = None,
+                     alcohol_indices: Optional[Sequence[int]] = None,
+                     user_profile=None) -> np.ndarray:
+        """
+        Seçilen yemek ve alkoller için 0-100 arası uyumluluk skor matrisini hesapla.
+        İndeks verilmezse tüm katalog kullanılır.
+        """
+        fi = np.arange(len(self.foods)) if food_indices is None else np.asarray(food_indices, dtype=np.int64)
+        ai = np.arange(len(self.alcohols)) if alcohol_indices is None else np.asarray(alcohol_indices, dtype=np.int64)
+
+        if self.base_matrix is not None:
+            score = self.base_matrix[np.ix_(fi, ai)]
+        else:
+            score = self._base_scores(fi, ai)
+        max_score = BASE_MAX_SCORE
+
+        # 6. User Profile Matching (if available)
+        if user_profile:
+            score = score + self.user_delta(user_profile).scores(fi, ai) * USER_WEIGHT
+            max_score = USER_MAX_SCORE
+
+        # Normalize score to 0-100 scale
+        return np.clip((score / max_score) * 100, 0, 100)
+
+    def score_row(self, food_index: int, user_profile=None) -> np.ndarray:
+        """Tek bir yemek için tüm alkollerin skor satırını hesapla"""
+        return self.score_matrix([food_index], None, user_profile)[0]
+
+    def score_column(self, alcohol_index: int, user_profile=None) -> np.ndarray:
+        """Tek bir alkol için tüm yemeklerin skor sütununu hesapla"""
+        return self.score_matrix(None, [alcohol_index], user_profile)[:, 0]
+
+    def catalog_version(self) -> str:
+        """Mevcut katalog ve kurallar için içerik özetini döndür"""
+        if self.store is not None:
+            return catalog_fingerprint([], [], self.pairing_rules, self.store.content_hash)
+        return catalog_fingerprint(self.foods, self.alcohols, self.pairing_rules)
+
+    def precompute(self, cache: Optional[ScoreMatrixCache] = None, compute: bool = True):
+        """
+        Kullanıcıdan bağımsız ham skor matrisini hazırla.
+        Önbellekteki sürüm güncel katalogla eşleşirse diskten yüklenir,
+        aksi halde yeniden hesaplanıp kaydedilir. compute=False ise yalnızca
+        önbellek denenir; bulunamazsa skorlar istek başına hesaplanmaya devam eder.
+        """
+        shape = (len(self.foods), len(self.alcohols))
+        version = self.catalog_version()
+
+        if cache is not None:
+            cached = cache.load(version, shape)
+            if cached is not None:
+                self.base_matrix = cached
+                return
+        if not compute:
+            return
+
+        self.base_matrix = self._base_scores(np.arange(shape[0]), np.arange(shape[1]))
+        if cache is not None:
+            cache.save(version, self.base_matrix)
+
+
+    # --- Artımlı katalog güncellemeleri ------------------------------------
+    # Çağıran taraf self.foods / self.alcohols listesini önce günceller; bu
+    # metotlar yalnızca değişen öğenin dizi satırını ve ham matrisin ilgili
+    # satırını ya da sütununu yeniden hesaplar.
+
+    FOOD_ARRAYS = ('food_intensity', 'food_texture', 'food_cuisine', 'food_price', 'food_serving',
+                   'food_temperature', 'food_dietary_bits', 'food_flavors')
+    ALCOHOL_ARRAYS = ('alcohol_strength', 'alcohol_body', 'alcohol_region', 'alcohol_price', 'alcohol_type',
+                      'alcohol_sweetness', 'alcohol_acidity', 'alcohol_tannins', 'alcohol_flavor_bits',
+                      'alcohol_flavors')
+
+    def detach_store(self, foods: List, alcohols: List):
+        """
+        Katalog deposundan ayrıl: salt okunur sütun görünümleri ve bellek eşlemeli
+        ham matris yazılabilir kopyalara, sözlükler deponun önbelleğinden bağımsız
+        kopyalara çevrilir. Artımlı güncellemelerden önce bir kez çağrılır.
+        """
+        self.foods = foods
+        self.alcohols = alcohols
+        if self.store is None and (self.base_matrix is None or self.base_matrix.flags.writeable):
+            return
+
+        for name in self.FOOD_ARRAYS + self.ALCOHOL_ARRAYS:
+            setattr(self, name, np.array(getattr(self, name)))
+        for name in ('texture_index', 'cuisine_index', 'price_index', 'serving_index', 'dietary_index',
+                     'body_index', 'region_index', 'type_index', 'flavor_bit_index'):
+            setattr(self, name, dict(getattr(self, name)))
+        self.alcohol_names = list(self.alcohol_names)
+        if self.base_matrix is not None:
+            self.base_matrix = np.array(self.base_matrix)
+        self.store = None
+
+    def _vocabulary_sizes(self) -> Tuple[int, ...]:
+        return tuple(len(index) for index in (
+            self.texture_index, self.cuisine_index, self.serving_index, self.body_index, self.region_index))
+
+    def _flavor_counts(self, flavors: Sequence[str]) -> np.ndarray:
+        """Tek bir lezzet profilinin sayım vektörü (yeni lezzetler sözlüğe eklenir)"""
+        self.compiled_rules.add_flavors(flavors)
+        counts = np.zeros(len(self.flavor_index), dtype=np.float64)
+        for flavor in flavors:
+            counts[self.flavor_index[flavor]] += 1
+        return counts
+
+    def _code_bits(self, values: Sequence[str], vocabulary: Dict[str, int]) -> np.ndarray:
+        """Tek bir liste alanının bit maskesi satırı (yeni değerler sözlüğe eklenir)"""
+        offsets, codes = encode_ragged([values], vocabulary)
+        return pack_code_rows(offsets, codes, len(vocabulary))[0]
+
+    def _grow_vocabularies(self, rule_sizes: Tuple[int, ...]):
+        """Yeni öğeyle büyüyen sözlükler için sayım, bit maskesi ve kural tablolarını genişlet"""
+        self.flavor_matrix = self.compiled_rules.flavor_matrix
+        for name in ('food_flavors', 'alcohol_flavors'):
+            counts = getattr(self, name)
+            if counts.shape[1] < len(self.flavor_index):
+                setattr(self, name, np.pad(counts, ((0, 0), (0, len(self.flavor_index) - counts.shape[1]))))
+        for name, vocabulary in (('food_dietary_bits', self.dietary_index),
+                                 ('alcohol_flavor_bits', self.flavor_bit_index)):
+            bits = getattr(self, name)
+            if bits.shape[1] < bit_words(len(vocabulary)):
+                setattr(self, name, np.pad(bits, ((0, 0), (0, bit_words(len(vocabulary)) - bits.shape[1]))))
+        if self._vocabulary_sizes() != rule_sizes:
+            self._build_rule_tables()
+
+    def _food_row(self, food) -> Dict[str, np.ndarray]:
+        """Yemeğin özellik dizilerindeki satırı"""
+        serving = self.serving_index.setdefault(food.serving_temp, len(self.serving_index))
+        return {
+            'food_intensity': food.intensity,
+            'food_texture': self.texture_index.setdefault(food.texture, len(self.texture_index)),
+            'food_cuisine': self.cuisine_index.setdefault(food.cuisine_type, len(self.cuisine_index)),
+            'food_price': self.price_index.setdefault(food.price_range, len(self.price_index)),
+            'food_serving': serving,
+            'food_dietary_bits': self._code_bits(food.dietary_tags, self.dietary_index),
+            'food_flavors': self._flavor_counts(food.flavor_profile),
+        }
+
+    def _alcohol_row(self, alcohol) -> Dict[str, np.ndarray]:
+        """Alkolün özellik dizilerindeki satırı"""
+        return {
+            'alcohol_strength': alcohol.alcohol_content / 5,
+            'alcohol_body': self.body_index.setdefault(alcohol.body, len(self.body_index)),
+            'alcohol_region': self.region_index.setdefault(alcohol.region, len(self.region_index)),
+            'alcohol_price': self.price_index.setdefault(alcohol.price_range, len(self.price_index)),
+            'alcohol_type': self.type_index.setdefault(alcohol.type, len(self.type_index)),
+            'alcohol_sweetness': alcohol.sweetness,
+            'alcohol_acidity': alcohol.acidity,
+            'alcohol_tannins': alcohol.tannins,
+            'alcohol_flavor_bits': self._code_bits(alcohol.flavor_profile, self.flavor_bit_index),
+            'alcohol_flavors': self._flavor_counts(alcohol.flavor_profile),
+        }
+
+    def _write_rows(self, names: Sequence[str], row: Dict, position: int, insert: bool):
+        """Satırı dizilere yaz ya da araya ekle (satır sözlüklerden sonra genişletilmiş dizilere uyar)"""
+        for name in names:
+            array = getattr(self, name)
+            value = row[name]
+            if array.ndim > 1:
+                # Satır, sözlük büyümeden önce kodlanmış dar bir bit maskesi olabilir
+                value = np.zeros(array.shape[1], dtype=array.dtype)
+                value[:len(row[name])] = row[name]
+            if insert:
+                setattr(self, name, np.insert(array, position, value, axis=0))
+            else:
+                array[position] = value
+
+    def _set_food(self, position: int, food, insert: bool):
+        rule_sizes = self._vocabulary_sizes()
+        row = self._food_row(food)
+        self._grow_vocabularies(rule_sizes)
+        row['food_temperature'] = self.serving_temperature[row['food_serving']]
+        self._write_rows(self.FOOD_ARRAYS, row, position, insert)
+
+        if self.base_matrix is not None:
+            scores = self._base_scores(np.array([position]), np.arange(len(self.alcohols)))[0]
+            if insert:
+                self.base_matrix = np.insert(self.base_matrix, position, scores, axis=0)
+            else:
+                self.base_matrix[position] = scores
+        self._user_deltas.clear()
+
+    def _set_alcohol(self, position: int, alcohol, insert: bool):
+        rule_sizes = self._vocabulary_sizes()
+        row = self._alcohol_row(alcohol)
+        self._grow_vocabularies(rule_sizes)
+        self._write_rows(self.ALCOHOL_ARRAYS, row, position, insert)
+        if insert:
+            self.alcohol_names.insert(position, alcohol.name)
+        else:
+            self.alcohol_names[position] = alcohol.name
+
+        if self.base_matrix is not None:
+            scores = self._base_scores(np.arange(len(self.foods)), np.array([position]))[:, 0]
+            if insert:
+                self.base_matrix = np.insert(self.base_matrix, position, scores, axis=1)
+            else:
+                self.base_matrix[:, position] = scores
+        self._user_deltas.clear()
+
+    def insert_food(self, position: int, food):
+        """Yeni yemeğin satırını ekle ve ham matrise tek bir satır olarak skorla"""
+        self._set_food(position, food, insert=True)
+
+    def replace_food(self, position: int, food):
+        """Değişen yemeğin satırını ve ham matristeki satırını yeniden hesapla"""
+        self._set_food(position, food, insert=False)
+
+    def delete_food(self, position: int):
+        """Yemeğin satırını dizilerden ve ham matristen çıkar"""
+        for name in self.FOOD_ARRAYS:
+            setattr(self, name, np.delete(getattr(self, name), position, axis=0))
+        if self.base_matrix is not None:
+            self.base_matrix = np.delete(self.base_matrix, position, axis=0)
+        self._user_deltas.clear()
+
+    def insert_alcohol(self, position: int, alcohol):
+        """Yeni alkolün satırını ekle ve ham matrise tek bir sütun olarak skorla"""
+        self._set_alcohol(position, alcohol, insert=True)
+
+    def replace_alcohol(self, position: int, alcohol):
+        """Değişen alkolün satırını ve ham matristeki sütununu yeniden hesapla"""
+        self._set_alcohol(position, alcohol, insert=False)
+
+    def delete_alcohol(self, position: int):
+        """Alkolün satırını dizilerden ve ham matristen çıkar"""
+        for name in self.ALCOHOL_ARRAYS:
+            setattr(self, name, np.delete(getattr(self, name), position, axis=0))
+        del self.alcohol_names[position]
+        if self.base_matrix is not None:
+            self.base_matrix = np.delete(self.base_matrix, position, axis=1)
+        self._user_deltas.clear()
+
+
+class UserDelta:
+    """
+    Kullanıcı profilinin ham skora katkısı, katalog boyunca kompakt vektörler olarak.
+    Kullanıcıdan bağımsız ham matrise eklenip USER_MAX_SCORE ile normalize edildiğinde
+    calculate_compatibility_score ile birebir aynı sonucu verir.
+    """
+
+    def __init__(self, engine: CompatibilityEngine, user_profile):
+        # Preferred flavors: alkol başına tercih edilen lezzet sayısı × bonus
+        preferred_counts = np.zeros(len(engine.alcohol_names), dtype=np.float64)
+        for flavor in user_profile.preferred_flavors:
+            code = engine.flavor_bit_index.get(flavor)
+            if code is not None:
+                preferred_counts += has_code(engine.alcohol_flavor_bits, code)
+        self.alcohol_bonus = preferred_counts * PREFERRED_FLAVOR_BONUS
+
+        # Budget matching: bütçe yalnızca yemek ve alkol aynı banttaysa eklenir
+        budget = engine.price_index.get(user_profile.budget_preference, -1)
+        self.food_budget = engine.food_price == budget
+        self.alcohol_budget = engine.alcohol_price == budget
+
+        # Dietary restrictions
+        incompatible = np.zeros(len(engine.food_intensity), dtype=bool)
+        for restriction in set(user_profile.dietary_restrictions):
+            code = engine.dietary_index.get(restriction)
+            if code is not None:
+                incompatible |= has_code(engine.food_dietary_bits, code)
+        self.food_penalty = np.where(incompatible, DIETARY_PENALTY, 0.0)
+
+        # Disliked alcohols (isim ya da tür olarak)
+        disliked = set(user_profile.disliked_alcohols)
+        disliked_types = [engine.type_index[t] for t in disliked if t in engine.type_index]
+        disliked_mask = np.isin(engine.alcohol_type, disliked_types)
+        disliked_mask |= np.array([name in disliked for name in engine.alcohol_names], dtype=bool)
+        self.alcohol_penalty = np.where(disliked_mask, DISLIKED_PENALTY, 0.0)
+
+    @staticmethod
+    def profile_key(user_profile) -> Tuple:
+        """Skoru etkileyen profil alanlarından önbellek anahtarı"""
+        return (
+            tuple(user_profile.preferred_flavors),
+            user_profile.budget_preference,
+            tuple(user_profile.dietary_restrictions),
+            tuple(user_profile.disliked_alcohols),
+        )
+
+    def scores(self, fi: np.ndarray, ai: np.ndarray) -> np.ndarray:
+        """Seçilen yemek×alkol alt matrisi için ham kullanıcı skorları"""
+        # Toplama sırası referans fonksiyonla aynıdır (kayan nokta sonuçları birebir eşleşir)
+        user_score = np.broadcast_to(self.alcohol_bonus[ai], (len(fi), len(ai)))
+        budget_match = self.food_budget[fi][:, None] & self.alcohol_budget[ai][None, :]
+        user_score = user_score + np.where(budget_match, BUDGET_MATCH_BONUS, 0.0)
+        user_score = user_score - self.food_penalty[fi][:, None]
+        user_score = user_score - self.alcohol_penalty[ai][None, :]
+        return user_score
@@ -0,0 +1,218 @@
+"""
+Benzerlik İndeksi
+Yemek ve alkoller için özellik gömmeleri (embedding) oluşturur ve rastgele
+izdüşüm (random projection / SimHash) tabanlı yaklaşık en yakın komşu
+aramasıyla benzer öğeleri bulur; adaylar kesin kosinüs benzerliğiyle
+yeniden sıralanır
+"""
+
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+
+# Gömme bloklarının ağırlıkları (her blok kendi içinde birim uzunluğa getirilir)
+FLAVOR_BLOCK_WEIGHT = 0.4
+NUMERIC_BLOCK_WEIGHT = 0.35
+CATEGORY_BLOCK_WEIGHT = 0.25
+
+# Bu boyutun altındaki kataloglarda kesin (tam tarama) arama daha ucuzdur
+EXACT_SEARCH_LIMIT = 2048
+# Hedeflenen ortalama kova doluluğu; bit sayısı buna göre seçilir
+BUCKET_TARGET_SIZE = 32
+# Yeniden sıralamaya girecek en az aday sayısı (k'nin katı)
+MIN_CANDIDATE_FACTOR = 4
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getir (sıfır satırlar olduğu gibi kalır)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def _one_hot(codes: np.ndarray, size: int) -> np.ndarray:
+    """Kategori kodlarını tek-sıcak (one-hot) matrise çevir"""
+    return np.eye(size, dtype=np.float64)[codes] if size else np.zeros((len(codes), 0))
+
+
+def _combine_blocks(flavor: np.ndarray, numeric: np.ndarray, category: np.ndarray) -> np.ndarray:
+    """Blokları ağırlıklandırıp birleştir ve birim uzunluklu gömmeler üret"""
+    embedding = np.hstack([
+        _unit_rows(flavor) * FLAVOR_BLOCK_WEIGHT,
+        _unit_rows(numeric) * NUMERIC_BLOCK_WEIGHT,
+        _unit_rows(category) * CATEGORY_BLOCK_WEIGHT,
+    ])
+    return _unit_rows(embedding).astype(np.float32)
+
+
+def food_embeddings(engine, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """Yemek gömmeleri: lezzet profili, yoğunluk, doku ve mutfak (positions verilirse yalnızca o satırlar)"""
+    rows = slice(None) if positions is None else np.asarray(positions)
+    intensity = engine.food_intensity[rows]
+    # Tek sütunlu blok birim uzunlukta bilgi taşımaz; sabit sütun yoğunluğu açı olarak kodlar
+    numeric = np.column_stack([intensity / 10, np.ones(len(intensity))])
+    category = np.hstack([
+        _one_hot(engine.food_texture[rows], len(engine.texture_index)),
+        _one_hot(engine.food_cuisine[rows], len(engine.cuisine_index)),
+    ])
+    return _combine_blocks(engine.food_flavors[rows], numeric, category)
+
+
+def alcohol_embeddings(engine, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """Alkol gömmeleri: lezzet profili, güç, tatlılık, asidite, tanen, gövde ve tür (positions verilirse yalnızca o satırlar)"""
+    rows = slice(None) if positions is None else np.asarray(positions)
+    numeric = np.column_stack([
+        engine.alcohol_strength[rows] / 10,
+        engine.alcohol_sweetness[rows] / 10,
+        engine.alcohol_acidity[rows] / 10,
+        engine.alcohol_tannins[rows] / 10,
+    ])
+    category = np.hstack([
+        _one_hot(engine.alcohol_body[rows], len(engine.body_index)),
+        _one_hot(engine.alcohol_type[rows], len(engine.type_index)),
+    ])
+    return _combine_blocks(engine.alcohol_flavors[rows], numeric, category)
+
+
+class SimilarityIndex:
+    """
+    Birim uzunluklu gömmeler üzerinde çok tablolu SimHash indeksi.
+    Her tablo, gömmeyi rastgele hiper düzlemlere göre bitlere çevirir; aynı
+    kovaya düşen öğeler aday olur ve kesin benzerlikle yeniden sıralanır.
+    """
+
+    def __init__(self, vectors: np.ndarray, n_tables: int = 16, n_bits: Optional[int] = None,
+                 exact_limit: int = EXACT_SEARCH_LIMIT, seed: int = 0):
+        self.vectors = vectors
+        self.size, self.dim = vectors.shape
+        self.n_tables = n_tables
+        self.exact_limit = exact_limit
+        self.seed = seed
+        self.exact = self.size <= exact_limit
+        if self.exact:
+            return
+
+        if n_bits is None:
+            n_bits = max(1, int(np.log2(max(2, self.size / BUCKET_TARGET_SIZE))))
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_tables, n_bits, self.dim)).astype(np.float32)
+        self.bit_weights = (1 << np.arange(n_bits, dtype=np.int64))
+
+        # Her tablo için kova anahtarına göre (eşitlerde konuma göre) sıralı öğeler;
+        # bir kovanın öğeleri sıralı anahtarlarda ikili aramayla bulunan aralıktır
+        self.tables = []
+        for keys in self._hash(vectors):
+            order = np.argsort(keys, kind='stable')
+            self.tables.append((order, keys[order]))
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Gömmeleri her tablo için kova anahtarlarına çevir: (tablo, öğe)"""
+        bits = np.einsum('tbd,nd->tnb', self.planes, vectors) > 0
+        return bits.astype(np.int64) @ self.bit_weights
+
+    def _candidates(self, vector: np.ndarray, wanted: int,
+                    eligible: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        Sorgunun kovalarındaki uygun adaylar; wanted kadar uygun aday bulunamazsa
+        tek bit komşu kovalar da yoklanır
+        """
+        keys = self._hash(vector[None, :])[:, 0]
+        found: List[np.ndarray] = []
+        probes = [0] + [int(w) for w in self.bit_weights]
+        for flip in probes:
+            for (order, sorted_keys), key in zip(self.tables, keys):
+                probe = int(key) ^ flip
+                start = np.searchsorted(sorted_keys, probe, side='left')
+                end = np.searchsorted(sorted_keys, probe, side='right')
+                if end > start:
+                    found.append(order[start:end])
+            candidates = eligible(np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64))
+            if len(candidates) >= wanted:
+                break
+        return candidates
+
+    # --- Artımlı güncellemeler ---------------------------------------------
+    # Yalnızca değişen öğenin gömmesi hash'lenir; tablolar sıralı dizilere
+    # ikili aramayla eklenir ya da çıkarılır.
+
+    def _unlink(self, position: int):
+        """Konumu tüm tablolardan çıkar"""
+        for t, (order, sorted_keys) in enumerate(self.tables):
+            keep = order != position
+            self.tables[t] = (order[keep], sorted_keys[keep])
+
+    def _link(self, position: int, vector: np.ndarray):
+        """Konumu gömmenin kovalarına (kova içinde konum sırasını koruyarak) ekle"""
+        for t, ((order, sorted_keys), key) in enumerate(zip(self.tables, self._hash(vector[None, :])[:, 0])):
+            start = np.searchsorted(sorted_keys, key, side='left')
+            end = np.searchsorted(sorted_keys, key, side='right')
+            at = start + np.searchsorted(order[start:end], position)
+            self.tables[t] = (np.insert(order, at, position), np.insert(sorted_keys, at, key))
+
+    def _shift(self, position: int, step: int):
+        """position ve sonrasındaki konumları kaydır"""
+        for order, _ in self.tables:
+            order[order >= position] += step
+
+    def _rebuild(self):
+        self.__init__(self.vectors, self.n_tables, None, self.exact_limit, self.seed)
+
+    def insert(self, position: int, vector: np.ndarray):
+        """Yeni öğenin gömmesini position konumuna ekle"""
+        self.vectors = np.insert(self.vectors, position, vector, axis=0)
+        self.size += 1
+        if self.exact and self.size > self.exact_limit:
+            # Kesin arama sınırı aşıldı; kovalar ilk kez kurulur
+            self._rebuild()
+        elif not self.exact:
+            self._shift(position, 1)
+            self._link(position, vector)
+
+    def replace(self, position: int, vector: np.ndarray):
+        """Değişen öğenin gömmesini yeniden hash'le"""
+        self.vectors[position] = vector
+        if not self.exact:
+            self._unlink(position)
+            self._link(position, vector)
+
+    def delete(self, position: int):
+        """Öğeyi indeksten çıkar"""
+        self.vectors = np.delete(self.vectors, position, axis=0)
+        self.size -= 1
+        if not self.exact:
+            self._unlink(position)
+            self._shift(position + 1, -1)
+
+    def query(self, vector: np.ndarray, k: int, exclude: Optional[int] = None,
+              allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Gömmeye en benzer k öğeyi (konum, kosinüs benzerliği) olarak döndür.
+        allowed verilirse yalnızca maskede işaretli öğeler sonuçlara girer; yeterli
+        uygun öğe varsa sonuç her zaman k öğedir.
+        """
+        def eligible(candidates: np.ndarray) -> np.ndarray:
+            if allowed is not None:
+                candidates = candidates[allowed[candidates]]
+            if exclude is not None:
+                candidates = candidates[candidates != exclude]
+            return candidates
+
+        if self.exact:
+            candidates = eligible(np.arange(self.size))
+        else:
+            # Maske kovalardan gelen adaylara k'ye indirilmeden önce uygulanır
+            candidates = self._candidates(vector, (k + 1) * MIN_CANDIDATE_FACTOR, eligible)
+            if len(candidates) < k:
+                # Kovalarda yeterli uygun öğe yok (ör. sıkı filtre); uygun öğeler kesin taranır
+                candidates = eligible(np.arange(self.size))
+        if len(candidates) == 0 or k <= 0:
+            return []
+
+        similarities = self.vectors[candidates] @ vector
+        top = min(k, len(candidates))
+        best = np.argpartition(-similarities, top - 1)[:top]
+        # Eşit benzerlikte düşük konum önce gelir
+        best = best[np.lexsort((candidates[best], -similarities[best]))]
+        return [(int(candidates[i]), float(similarities[i])) for i in best]
+
+    def neighbours(self, position: int, k: int, allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Katalogdaki bir öğeye en benzer k öğe (kendisi hariç)"""
+        return self.query(self.vectors[position], k, exclude=position, allowed=allowed)
@@ -0,0 +1,303 @@
+"""
+SQLite Erişim Katmanı
+Her iş parçacığı için kalıcı bir bağlantı tutar (WAL günlüğü, synchronous=NORMAL,
+meşgul zaman aşımı). Kilit hatalarında işlem artan beklemeyle yeniden denenir;
+bağlantılar kalıcı olduğundan aynı SQL metinleri sqlite3'ün hazır ifade
+önbelleğinden yeniden kullanılır. Yoğun tek satırlık eklemeler için arka planda
+toplu yazan (write-behind) bir yazıcı da sunar.
+"""
+
+import atexit
+import queue
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+T = TypeVar('T')
+
+# Kilitli veritabanında SQLite'ın kendi içinde bekleyeceği süre
+BUSY_TIMEOUT_S = 5.0
+# Zaman aşımına rağmen kilit hatası alınırsa işlemin yeniden deneme sayısı ve ilk bekleme
+LOCK_RETRIES = 5
+LOCK_BACKOFF_S = 0.05
+# Bağlantı başına önbellekte tutulan hazır ifade sayısı
+STATEMENT_CACHE_SIZE = 128
+
+# Yazıcı dayanıklılık kipleri:
+#   sync  - her satır çağıran iş parçacığında kendi işlemiyle yazılır (kuyruk yok)
+#   group - satır kuyruğa girer, çağıran kendi toplu işlemi işlenene kadar bekler; kuyruk
+#           boşalınca beklemeden yazılır (önceki işlem sürerken gelenler birlikte işlenir)
+#   async - satır kuyruğa girer, çağıran beklemez; çökmede son yazma aralığı kaybolabilir
+DURABILITY_MODES = ('sync', 'group', 'async')
+# Tek işlemde yazılan en fazla satır ve ilk satırdan sonra toplu yazmaya kadar en fazla bekleme
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL_S = 0.05
+# Kuyruk dolduğunda ekleyenler yer açılana kadar bekler (geri basınç)
+WRITE_QUEUE_SIZE = 10000
+# Yazılamayan satırlardan metrics() içinde gösterilen en yeni kayıt sayısı
+WRITE_FAILED_KEEP = 100
+
+# Yazıcı iş parçacığını durduran kuyruk öğesi
+_STOP = object()
+
+# Bellek içi veritabanı tüm iş parçacıklarınca paylaşılsın diye adlandırılmış paylaşımlı önbellekle açılır
+_MEMORY_URI = 'file:neyenir-{}?mode=memory&cache=shared'
+
+
+def _is_lock_error(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class Database:
+    """İş parçacığı başına kalıcı bağlantılarla SQLite veritabanı"""
+
+    def __init__(self, path: Union[str, Path], busy_timeout_s: float = BUSY_TIMEOUT_S,
+                 retries: int = LOCK_RETRIES, backoff_s: float = LOCK_BACKOFF_S):
+        self.path = str(path)
+        self.busy_timeout_s = busy_timeout_s
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        if self.path == ':memory:':
+            self._target, self._uri = _MEMORY_URI.format(id(self)), True
+        else:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._target, self._uri = self.path, False
+
+    def connection(self) -> sqlite3.Connection:
+        """Bu iş parçacığının bağlantısı (ilk kullanımda açılır; kapatılmamalıdır)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Bağlantı yalnızca açan iş parçacığınca kullanılır; close() kapanışta hepsini kapatabilsin
+            conn = sqlite3.connect(self._target, timeout=self.busy_timeout_s, uri=self._uri,
+                                   cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_s * 1000)}')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def run(self, work: Callable[[sqlite3.Connection], T], write: bool = False) -> T:
+        """
+        work(bağlantı) çağrısını çalıştır; write ise tek bir işlem içinde işlenir.
+        Kilit hatalarında işlem geri alınıp artan (rastgele saçılımlı) beklemeyle yeniden denenir.
+        """
+        conn = self.connection()
+        for attempt in range(self.retries + 1):
+            try:
+                if not write:
+                    return work(conn)
+                with conn:
+                    return work(conn)
+            except sqlite3.OperationalError as e:
+                if not _is_lock_error(e) or attempt == self.retries:
+                    raise
+                if conn.in_transaction:
+                    conn.rollback()
+                time.sleep(self.backoff_s * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    def query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        """Okuma sorgusunun tüm satırları"""
+        return self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    def execute(self, sql: str, params: Sequence = ()) -> int:
+        """Tek bir yazma ifadesini işlemle çalıştır; eklenen satırın id'sini döndür"""
+        return self.run(lambda conn: conn.execute(sql, params).lastrowid, write=True)
+
+    def executemany(self, sql: str, rows: Iterable[Sequence]) -> int:
+        """Aynı ifadeyi birçok satır için tek işlemde çalıştır; etkilenen satır sayısını döndür"""
+        rows = list(rows)
+        return self.run(lambda conn: conn.executemany(sql, rows).rowcount, write=True)
+
+    def executescript(self, script: str):
+        """Şema betiğini çalıştır"""
+        self.run(lambda conn: conn.executescript(script), write=True)
+
+    def close(self):
+        """Tüm iş parçacıklarının bağlantılarını kapat (kapanışta)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class WriteBehindWriter:
+    """
+    Aynı yazma ifadesinin satırlarını sınırlı bir kuyrukta toplayıp arka plan
+    iş parçacığında executemany ile toplu işlemlerde yazar. Kuyruk boyutu veya
+    süre eşiğinde, flush() çağrısında ve süreç kapanırken boşaltılır. Toplu
+    yazma başarısız olursa satırlar tek tek yeniden denenir; yine yazılamayanlar
+    (hatasıyla birlikte) metrics() içindeki failed_rows listesinde görünür.
+    """
+
+    def __init__(self, db: Database, sql: str, durability: str = 'sync',
+                 batch_size: int = WRITE_BATCH_SIZE, flush_interval_s: float = WRITE_FLUSH_INTERVAL_S,
+                 queue_size: int = WRITE_QUEUE_SIZE):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Geçersiz dayanıklılık kipi: {durability} (beklenen: {', '.join(DURABILITY_MODES)})")
+        self.db = db
+        self.sql = sql
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # Kapanış denetimi ile kuyruğa ekleme bu kilitle bölünmez; close() da alır
+        self._submit_lock = threading.Lock()
+        self._failed_rows: deque = deque(maxlen=WRITE_FAILED_KEEP)
+        self._stats = {'submitted': 0, 'written': 0, 'failed': 0, 'batches': 0,
+                       'max_queue_depth': 0, 'last_batch_size': 0, 'last_flush_ms': 0.0}
+        self._pending = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if durability != 'sync':
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, row: Sequence):
+        """Satırı yaz (sync) ya da yazma kuyruğuna ekle; kuyruk doluysa yer açılmasını bekler"""
+        if self._thread is None:
+            self.db.execute(self.sql, row)
+            with self._lock:
+                self._stats['submitted'] += 1
+                self._stats['written'] += 1
+            return
+
+        done = Future() if self.durability == 'group' else None
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Yazıcı kapatıldı")
+            with self._lock:
+                self._stats['submitted'] += 1
+                self._pending += 1
+            self._queue.put((row, done))
+        depth = self._queue.qsize()
+        if depth > self._stats['max_queue_depth']:
+            with self._lock:
+                self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], depth)
+        if done is not None:
+            done.result()
+
+    def flush(self):
+        """O ana kadar eklenen tüm satırlar işlenene kadar bekle"""
+        if self._thread is None:
+            return
+        with self._lock:
+            pending = self._pending
+        marker = Future()
+        with self._submit_lock:
+            # Kapanmışsa close() kuyruğu zaten boşaltmıştır (ya da boşaltıyordur)
+            if pending == 0 or self._closed:
+                return
+            self._queue.put((None, marker))
+        marker.result()
+
+    def close(self):
+        """Kuyruğu boşaltıp yazıcıyı durdur (birden çok kez çağrılabilir)"""
+        if self._thread is None:
+            return
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def metrics(self) -> Dict:
+        """Kuyruk derinliği ve yazma sayaçları"""
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+            failed_rows = [{'row': list(row), 'error': error} for row, error in self._failed_rows]
+        return {
+            'durability': self.durability,
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+            'pending': pending,
+            **stats,
+            'failed_rows': failed_rows,
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            # group kipinde çağıranlar bekler; süre eşiği beklemek yalnızca gecikme katar
+            interval = 0.0 if self.durability == 'group' else self.flush_interval_s
+            deadline = time.monotonic() + interval
+            # Boyut eşiğine, süre eşiğine ya da bir boşaltma isteğine kadar topla
+            while len(batch) < self.batch_size and batch[-1][0] is not None:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+        # Durdurma isteğinden sonra gelenler de yazılır
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            self._write(leftover)
+
+    def _write(self, batch: List[Tuple[Optional[Sequence], Optional[Future]]]):
+        rows = [row for row, _ in batch if row is not None]
+        # batch sırasına göre satır hataları (hatasız satır için None)
+        errors: List[Optional[Exception]] = [None] * len(batch)
+        started = time.perf_counter()
+        if rows:
+            try:
+                self.db.executemany(self.sql, rows)
+            except Exception as e:
+                # Tek bir hatalı satır tüm grubu düşürmesin: satırları tek tek yeniden dene
+                print(f"⚠️ {len(rows)} satırlık toplu yazma başarısız, satırlar tek tek deneniyor: {e}")
+                for i, (row, _) in enumerate(batch):
+                    if row is None:
+                        continue
+                    try:
+                        self.db.execute(self.sql, row)
+                    except Exception as row_error:
+                        errors[i] = row_error
+                        print(f"⚠️ Satır yazılamadı: {row_error}")
+
+        failed = [(row, str(error)) for (row, _), error in zip(batch, errors) if error is not None]
+        with self._lock:
+            self._pending -= len(rows)
+            self._stats['written'] += len(rows) - len(failed)
+            self._stats['failed'] += len(failed)
+            self._failed_rows.extend(failed)
+            if rows:
+                self._stats['batches'] += 1
+                self._stats['last_batch_size'] = len(rows)
+                self._stats['last_flush_ms'] = (time.perf_counter() - started) * 1000
+        for (row, done), error in zip(batch, errors):
+            if done is None:
+                continue
+            if error is not None:
+                done.set_exception(error)
+            else:
+                done.set_result(None)
@@ -0,0 +1,180 @@
+"""
+Yazarken Öneri (Type-ahead) İndeksi
+İsimleri Türkçe duyarlı olarak (İ/I/ı/i ve aksanlar yok sayılarak) normalleştirir;
+ismin ve her kelimesinin önekleri bir önek ağacında (trie), yazım hatalarına
+tolerans için de karakter üçlüleri (trigram) ters indekste tutulur
+"""
+
+import bisect
+import heapq
+import itertools
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+from core.catalog import ascii_fold
+
+# Yanıt başına en fazla öneri
+MAX_SUGGESTIONS = 20
+# Her düğümde tutulan en iyi giriş sayısı (aynı öğe birden çok kelimesiyle girebilir)
+NODE_CAPACITY = 2 * MAX_SUGGESTIONS
+# Bulanık eşleşme için sorgu üçlülerinin en az bu oranı (ve en az FUZZY_MIN_COMMON tanesi) isimde bulunmalı
+FUZZY_MIN_SCORE = 1 / 3
+FUZZY_MIN_COMMON = 2
+# Bu uzunluğun altındaki sorgularda bulanık eşleşme yapılmaz
+FUZZY_MIN_QUERY = 3
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+# Sıralama anahtarı: (kelime ortasından mı, isim uzunluğu, isim, id)
+Rank = Tuple[int, int, str, int]
+
+
+def search_key(text: str) -> str:
+    """İsmi ya da sorguyu karşılaştırma anahtarına çevir ('İskender' → 'iskender', 'Mantı' → 'manti')"""
+    return _NON_WORD.sub(' ', ascii_fold(text)).strip()
+
+
+def trigrams(key: str, pad_end: bool = True) -> Set[str]:
+    """Kelime sınırlarını boşlukla işaretleyerek karakter üçlülerini çıkar"""
+    padded = f" {key} " if pad_end else f" {key}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Node:
+    __slots__ = ('children', 'best', 'ends', 'size')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        # Alt ağaçtaki en iyi NODE_CAPACITY giriş, sıralı
+        self.best: List[Rank] = []
+        # Bu düğümde biten anahtarların girişleri, sıralı
+        self.ends: List[Rank] = []
+        # Alt ağaçtaki toplam giriş sayısı
+        self.size = 0
+
+
+class NameSuggester:
+    """İsimlerden id'lere önek ve bulanık arama; sonuçlar isme göre sıralı"""
+
+    def __init__(self, items: List):
+        self.root = _Node()
+        self.keys: Dict[int, str] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        for item in items:
+            self.insert(item)
+
+    @staticmethod
+    def _entries(item_id: int, key: str) -> List[Tuple[str, Rank]]:
+        """İsmin tamamı ve sonraki her kelimesiyle başlayan son ek için (anahtar, sıra) girişleri"""
+        entries = [(key, (0, len(key), key, item_id))]
+        for match in re.finditer(r' (?=\S)', key):
+            entries.append((key[match.end():], (1, len(key), key, item_id)))
+        return entries
+
+    def insert(self, item):
+        """Öğeyi indekse ekle"""
+        key = search_key(item.name)
+        if not key or item.id in self.keys:
+            return
+        self.keys[item.id] = key
+
+        for suffix, rank in self._entries(item.id, key):
+            node = self.root
+            self._add_best(node, rank)
+            for ch in suffix:
+                node = node.children.setdefault(ch, _Node())
+                self._add_best(node, rank)
+            bisect.insort(node.ends, rank)
+
+        for gram in trigrams(key):
+            self.postings.setdefault(gram, set()).add(item.id)
+
+    def delete(self, item):
+        """Öğeyi indeksten çıkar"""
+        key = self.keys.pop(item.id, None)
+        if key is None:
+            return
+
+        for suffix, rank in self._entries(item.id, key):
+            path = [self.root]
+            for ch in suffix:
+                path.append(path[-1].children[ch])
+            ends = path[-1].ends
+            del ends[bisect.bisect_left(ends, rank)]
+            # Yalnızca anahtarın yolu, yapraktan köke doğru güncellenir; boşalan dallar budanır
+            for depth in range(len(path) - 1, -1, -1):
+                node = path[depth]
+                node.size -= 1
+                if depth > 0 and node.size == 0:
+                    del path[depth - 1].children[suffix[depth - 1]]
+                elif rank in node.best:
+                    node.best.remove(rank)
+                    if len(node.best) < min(node.size, NODE_CAPACITY):
+                        node.best = self._refill(node)
+
+        for gram in trigrams(key):
+            ids = self.postings[gram]
+            ids.discard(item.id)
+            if not ids:
+                del self.postings[gram]
+
+    def replace(self, old_item, item):
+        """Öğenin eski ismini yenisiyle değiştir"""
+        self.delete(old_item)
+        self.insert(item)
+
+    @staticmethod
+    def _add_best(node: _Node, rank: Rank):
+        node.size += 1
+        if len(node.best) < NODE_CAPACITY or rank < node.best[-1]:
+            bisect.insort(node.best, rank)
+            del node.best[NODE_CAPACITY:]
+
+    @staticmethod
+    def _refill(node: _Node) -> List[Rank]:
+        """
+        Düğümün en iyi girişlerini kendi bitenleri ve çocuklarının (güncel) en iyi
+        listelerinden yeniden kur; alt ağacın geri kalanı dolaşılmaz
+        """
+        children = (child.best for child in node.children.values())
+        return heapq.nsmallest(NODE_CAPACITY, itertools.chain(node.ends[:NODE_CAPACITY], *children))
+
+    def suggest(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Sorguyla eşleşen öğe id'leri: önce ismi ya da bir kelimesi sorguyla
+        başlayanlar, yer kalırsa yazım hatasına toleranslı üçlü eşleşmeleri
+        """
+        key = search_key(query)
+        limit = min(limit, MAX_SUGGESTIONS)
+        if not key or limit <= 0:
+            return []
+
+        results: List[int] = []
+        node: Optional[_Node] = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                break
+        if node is not None:
+            for rank in node.best:
+                if rank[3] not in results:
+                    results.append(rank[3])
+                    if len(results) == limit:
+                        return results
+
+        if len(key) >= FUZZY_MIN_QUERY:
+            results.extend(self._fuzzy(key, limit - len(results), set(results)))
+        return results
+
+    def _fuzzy(self, key: str, limit: int, exclude: Set[int]) -> List[int]:
+        """Sorgu üçlülerinin en az FUZZY_MIN_SCORE oranını içeren isimler, en iyi eşleşen önce"""
+        grams = trigrams(key, pad_end=False)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.postings.get(gram, ()))
+
+        needed = max(FUZZY_MIN_SCORE * len(grams), FUZZY_MIN_COMMON)
+        matches = [(-count, len(self.keys[item_id]), self.keys[item_id], item_id)
+                   for item_id, count in counts.items() if count >= needed and item_id not in exclude]
+        matches.sort()
+        return [match[3] for match in matches[:limit]]
@@ -0,0 +1,129 @@
+"""
+Masa Eşleştirme Optimizasyonu
+Bir masanın sipariş ettiği tüm yemekleri en iyi karşılayan k şişeyi
+skor matrisi üzerinde dal-sınır (branch and bound) aramasıyla seçer
+"""
+
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+
+# Desteklenen hedef fonksiyonları: en kötü yemeğin skoru ya da ortalama skor
+OBJECTIVES: Dict[str, Callable[..., np.ndarray]] = {
+    'min': np.min,
+    'mean': np.mean,
+}
+
+
+def _covers(better: np.ndarray, worse: np.ndarray) -> np.ndarray:
+    """covers[w, b] = better[b], worse[w]'yi her yemekte eşit ya da daha iyi karşılıyor"""
+    # Kısa yemek ekseni üzerinde indirgeme yerine yemek başına karşılaştırma çok daha hızlı
+    covers = np.ones((len(worse), len(better)), dtype=bool)
+    for dish in range(worse.shape[1]):
+        covers &= better[None, :, dish] >= worse[:, None, dish]
+    return covers
+
+
+def pareto_candidates(scores: np.ndarray, chunk_size: int = 256) -> np.ndarray:
+    """
+    Başka bir aday tarafından her yemekte eşit ya da daha iyi karşılanan
+    (baskın olunan) şişeleri ele. Baskın olunan bir şişeyi baskın olanla
+    değiştirmek hiçbir hedef değerini düşürmediği için sonuç değişmez.
+    """
+    n_candidates = scores.shape[1]
+    # Bir adaya yalnızca toplam skoru ondan yüksek (ya da eşit ve önce gelen) bir aday baskın olabilir
+    order = np.lexsort((np.arange(n_candidates), -scores.sum(axis=0)))
+    columns = scores.T[order]
+
+    front: List[int] = []
+    for start in range(0, n_candidates, chunk_size):
+        chunk = columns[start:start + chunk_size]
+        # Önce mevcut cepheye karşı toplu eleme, ardından parça içi karşılaştırma
+        if front:
+            dominated = _covers(columns[front], chunk).any(axis=1)
+            survivors = np.flatnonzero(~dominated)
+        else:
+            survivors = np.arange(len(chunk))
+
+        rest = chunk[survivors]
+        within = _covers(rest, rest)
+        kept: List[int] = []
+        for c in range(len(survivors)):
+            # Yalnızca sıralamada daha önce gelen ve elenmemiş adaylar dikkate alınır;
+            # elenmiş bir adaya baskın olan aday, onun elediklerine de baskındır
+            if not within[c, kept].any():
+                kept.append(c)
+        front.extend(start + int(survivors[c]) for c in kept)
+    return np.sort(order[front])
+
+
+def optimize_table_pairing(scores: np.ndarray, bottles: int = 1, objective: str = 'min') -> Tuple[List[int], float]:
+    """
+    scores (yemek × aday şişe) matrisinde, her yemeğin seçilen şişelerden en
+    uygun olanıyla eşleştiği varsayımıyla hedefi en büyükleyen şişe kümesini bul.
+
+    Returns:
+        (seçilen sütun indeksleri, hedef değeri)
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    aggregate = OBJECTIVES[objective]
+
+    n_dishes, n_candidates = scores.shape
+    k = min(bottles, n_candidates)
+    if n_dishes == 0 or k <= 0:
+        return [], 0.0
+
+    if k == 1:
+        values = aggregate(scores, axis=0)
+        choice = int(np.argmax(values))
+        return [choice], float(values[choice])
+
+    # Baskın olunan adaylar aramaya hiç girmez
+    candidates = pareto_candidates(scores)
+    scores = scores[:, candidates]
+    n_candidates = len(candidates)
+    k = min(k, n_candidates)
+
+    # Adaylar tek başına değerlerine göre sıralanır; en iyiler önce denenir
+    order = np.argsort(-aggregate(scores, axis=0), kind='stable')
+    ordered = scores[:, order]
+
+    # suffix_max[:, i] = i. ve sonraki adayların yemek bazında en yüksek skoru (üst sınır)
+    suffix_max = np.maximum.accumulate(ordered[:, ::-1], axis=1)[:, ::-1]
+
+    # Açgözlü çözüm başlangıç alt sınırını verir
+    best_set: List[int] = []
+    coverage = np.full(n_dishes, -np.inf)
+    for _ in range(k):
+        values = aggregate(np.maximum(coverage[:, None], ordered), axis=0)
+        values[best_set] = -np.inf
+        choice = int(np.argmax(values))
+        best_set.append(choice)
+        coverage = np.maximum(coverage, ordered[:, choice])
+    best_value = float(aggregate(coverage))
+    best_set.sort()
+
+    def search(start: int, chosen: List[int], coverage: np.ndarray):
+        nonlocal best_value, best_set
+        remaining = k - len(chosen)
+
+        if remaining == 1:
+            # Son seviye tek vektörel adımda değerlendirilir
+            if start >= n_candidates:
+                return
+            values = aggregate(np.maximum(coverage[:, None], ordered[:, start:]), axis=0)
+            choice = int(np.argmax(values))
+            if values[choice] > best_value:
+                best_value = float(values[choice])
+                best_set = chosen + [start + choice]
+            return
+
+        for i in range(start, n_candidates - remaining + 1):
+            # Üst sınır i arttıkça azalır; sınır geçilemiyorsa sonraki dallar da budanır
+            bound = aggregate(np.maximum(coverage, suffix_max[:, i]))
+            if bound <= best_value:
+                break
+            search(i + 1, chosen + [i], np.maximum(coverage, ordered[:, i]))
+
+    search(0, [], np.full(n_dishes, -np.inf))
+    return [int(candidates[order[i]]) for i in best_set], best_value
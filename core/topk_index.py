@@ -0,0 +1,172 @@
+"""
+Yemek Başına En İyi K Alkol İndeksi
+Her yemek için profilsiz skora göre en uyumlu K alkolün id'lerini (int32) ve
+skorlarını (float16) sıralı olarak tutar. Profilsiz öneriler yoğun skor
+satırı yerine bu K kayıttan sunulur; dosya katalog sürümüyle birlikte kaydedilir.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+from core.scoring import top_k_indices
+
+# Dosya düzeni değiştiğinde artırılır, eski indeksler otomatik geçersiz olur
+TOPK_INDEX_FORMAT = 1
+# Yemek başına tutulan alkol sayısı; offset + top_n bunu aşan istekler tam satırdan sunulur
+TOPK_SIZE = 50
+# Kurulumda aynı anda skorlanan en fazla yemek×alkol çifti ve alkol karosu genişliği;
+# satırlar karolar boyunca birleştirilir, yoğun skor matrisi gerekmez
+BUILD_CHUNK_PAIRS = 1 << 22
+BUILD_TILE_ALCOHOLS = 1 << 16
+# Boş sıralar için id değeri
+EMPTY_ID = -1
+# K'ncı skorla karşılaştırmada pay (float16'nın 0-100 aralığındaki yuvarlama hatası en fazla 0.031)
+SCORE_TOLERANCE = 0.0625
+
+
+def _alcohol_ids(engine) -> np.ndarray:
+    if engine.store is not None:
+        return np.asarray(engine.store.column('alcohol.id'), dtype=np.int32)
+    return np.fromiter((alcohol.id for alcohol in engine.alcohols), dtype=np.int32, count=len(engine.alcohols))
+
+
+class TopKIndex:
+    """Her satırı bir yemeğe ait, skora göre azalan (eşitlikte konuma göre artan) K alkol"""
+
+    def __init__(self, ids: np.ndarray, scores: np.ndarray):
+        self.ids = ids
+        self.scores = scores
+        self.k = ids.shape[1]
+
+    @classmethod
+    def build(cls, engine, k: int = TOPK_SIZE, tile: int = BUILD_TILE_ALCOHOLS) -> 'TopKIndex':
+        """Motorun profilsiz skorlarından indeksi karo karo kur (ham matris yüklü olmak zorunda değil)"""
+        index = cls(np.full((len(engine.foods), k), EMPTY_ID, dtype=np.int32),
+                    np.zeros((len(engine.foods), k), dtype=np.float16))
+        index._rank(engine, np.arange(len(engine.foods)), tile)
+        return index
+
+    @classmethod
+    def load(cls, path: Path, version: str, n_foods: int, k: int = TOPK_SIZE) -> Optional['TopKIndex']:
+        """Sürüm, yemek sayısı ve K eşleşirse indeksi diskten yükle"""
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path) as data:
+                if int(data['format']) != TOPK_INDEX_FORMAT or str(data['version']) != version:
+                    return None
+                ids, scores = data['ids'], data['scores']
+            if ids.shape != (n_foods, k) or scores.shape != ids.shape:
+                return None
+            return cls(ids, scores)
+        except Exception as e:
+            print(f"⚠️ En iyi K indeksi okunamadı: {e}")
+            return None
+
+    def save(self, path: Path, version: str):
+        """İndeksi sürüm bilgisiyle birlikte atomik olarak diske yaz"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, format=TOPK_INDEX_FORMAT, version=version, ids=self.ids, scores=self.scores)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ En iyi K indeksi kaydedilemedi: {e}")
+
+    def row(self, food_index: int) -> np.ndarray:
+        """Yemeğin sıralı alkol id'leri"""
+        ids = self.ids[food_index]
+        return ids[ids != EMPTY_ID]
+
+    def _rank(self, engine, rows: np.ndarray, tile: int = BUILD_TILE_ALCOHOLS):
+        """
+        Verilen yemek satırlarını tüm alkolleri karo karo skorlayarak yeniden sırala.
+        Her satırın o ana kadarki en iyi K adayı konum sırasıyla tutulur; sonraki
+        karonun konumları hep daha büyük olduğundan eşit skorlarda düşük konum önce kalır.
+        """
+        alcohol_ids = _alcohol_ids(engine)
+        n_alcohols = len(alcohol_ids)
+        tile = max(1, min(tile, n_alcohols))
+        chunk = max(1, BUILD_CHUNK_PAIRS // tile)
+        self.ids[rows] = EMPTY_ID
+        self.scores[rows] = 0
+        for start in range(0, len(rows), chunk):
+            block = rows[start:start + chunk]
+            best = [(np.empty(0, dtype=np.int64), np.empty(0)) for _ in block]
+            for a0 in range(0, n_alcohols, tile):
+                columns = np.arange(a0, min(a0 + tile, n_alcohols))
+                scores = engine.score_matrix(block, columns)
+                for i, row_scores in enumerate(scores):
+                    positions = np.concatenate((best[i][0], columns))
+                    merged = np.concatenate((best[i][1], row_scores))
+                    keep = np.sort(top_k_indices(merged, self.k))
+                    best[i] = (positions[keep], merged[keep])
+            for food_index, (positions, row_scores) in zip(block, best):
+                top = top_k_indices(row_scores, self.k)
+                self.ids[food_index, :len(top)] = alcohol_ids[positions[top]]
+                self.scores[food_index, :len(top)] = row_scores[top]
+
+    # --- Artımlı katalog güncellemeleri ------------------------------------
+    # Motor ve katalog indeksi önce güncellenir; alcohol_positions alkol
+    # id'sinden güncel konuma eşlemedir (CatalogIndex.alcohols.by_id).
+
+    def insert_food(self, engine, position: int):
+        self.ids = np.insert(self.ids, position, EMPTY_ID, axis=0)
+        self.scores = np.insert(self.scores, position, 0, axis=0)
+        self._rank(engine, np.array([position]))
+
+    def replace_food(self, engine, position: int):
+        self._rank(engine, np.array([position]))
+
+    def delete_food(self, position: int):
+        self.ids = np.delete(self.ids, position, axis=0)
+        self.scores = np.delete(self.scores, position, axis=0)
+
+    def insert_alcohol(self, engine, position: int, alcohol_positions: Dict[int, int]):
+        self._place_alcohol(engine, position, alcohol_positions)
+
+    def replace_alcohol(self, engine, position: int, old_id: int, alcohol_positions: Dict[int, int]):
+        self._remove_alcohol(engine, old_id)
+        self._place_alcohol(engine, position, alcohol_positions)
+
+    def delete_alcohol(self, engine, old_id: int):
+        self._remove_alcohol(engine, old_id)
+
+    def _remove_alcohol(self, engine, alcohol_id: int):
+        """
+        Alkolün eski halini içeren satırlar tam satırdan yeniden sıralanır:
+        boşalan sıraya girecek en iyi dış aday indekste tutulmaz
+        """
+        self._rank(engine, np.flatnonzero((self.ids == alcohol_id).any(axis=1)))
+
+    def _write_row(self, food_index: int, ids: np.ndarray, scores: np.ndarray):
+        self.ids[food_index] = EMPTY_ID
+        self.scores[food_index] = 0
+        self.ids[food_index, :len(ids)] = ids
+        self.scores[food_index, :len(ids)] = scores
+
+    def _place_alcohol(self, engine, position: int, alcohol_positions: Dict[int, int]):
+        """
+        Yeni skor sütununu her satırın K'ncı skoruyla karşılaştır; yalnızca
+        sıralamaya girebilecek satırlar kesin skorlarla yeniden birleştirilir
+        """
+        alcohol_id = engine.alcohols[position].id
+        column = engine.score_column(position)
+        filled = (self.ids != EMPTY_ID).sum(axis=1)
+        threshold = self.scores[np.arange(len(self.ids)), np.maximum(filled - 1, 0)].astype(np.float64)
+        candidates = np.flatnonzero((filled < self.k) | (column >= threshold - SCORE_TOLERANCE))
+
+        for food_index in candidates:
+            ids = self.row(food_index)
+            ids = ids[ids != alcohol_id]
+            positions = np.fromiter((alcohol_positions[i] for i in ids), dtype=np.int64, count=len(ids))
+            positions = np.append(positions, position)
+            scores = engine.score_matrix([food_index], positions)[0]
+            top = np.lexsort((positions, -scores))[:self.k]
+            self._write_row(food_index, np.append(ids, alcohol_id)[top], scores[top])
@@ -72,11 +72,26 @@ def setup_database():
     
     try:
         from main import AIFoodAlcoholMatcher
-        matcher = AIFoodAlcoholMatcher()
+        from app.config import Config
+        matcher = AIFoodAlcoholMatcher(database_path=Config.DATABASE_PATH)
         print("✅ Veritabanı başarıyla başlatıldı!")
     except Exception as e:
         print(f"❌ Veritabanı kurulurken hata: {e}")
 
+def precompute_scores(workers=None, tile_size=None, force=False):
+    """Skor matrisini çok süreçli olarak önceden hesapla"""
+    print("🧮 Skor matrisi ön hesaplaması başlatılıyor...")
+    
+    try:
+        from core.matcher import AIFoodAlcoholMatcher
+        from app.config import Config
+        from core.precompute import DEFAULT_TILE_SIZE
+        matcher = AIFoodAlcoholMatcher(precompute=False, database_path=Config.DATABASE_PATH)
+        matcher.precompute_scores(workers, tile_size or DEFAULT_TILE_SIZE, force)
+    except Exception as e:
+        print(f"❌ Ön hesaplama sırasında hata: {e}")
+        sys.exit(1)
+
 def show_system_info():
     """Sistem bilgilerini ve istatistiklerini göster"""
     print("📊 AI Food & Alcohol Pairing System Information")
@@ -84,7 +99,8 @@ def show_system_info():
     
     try:
         from core.matcher import AIFoodAlcoholMatcher
-        matcher = AIFoodAlcoholMatcher()
+        from app.config import Config
+        matcher = AIFoodAlcoholMatcher(database_path=Config.DATABASE_PATH)
         
         print(f"🍽️ Available Foods: {len(matcher.foods)}")
         print(f"🍺 Available Alcohols: {len(matcher.alcohols)}")
@@ -95,21 +111,12 @@ def show_system_info():
         print(f"📱 Mobile Support: Responsive design")
         
         # Show database statistics
-        import sqlite3
-        conn = sqlite3.connect('food_alcohol_system.db')
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM users")
-        user_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM pairings")
-        pairing_count = cursor.fetchone()[0]
+        user_count = matcher.db.query("SELECT COUNT(*) FROM users")[0][0]
+        pairing_count = matcher.db.query("SELECT COUNT(*) FROM pairings")[0][0]
         
         print(f"👤 Registered Users: {user_count}")
         print(f"⭐ Total Ratings: {pairing_count}")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error getting system info: {e}")
 
@@ -124,6 +131,7 @@ def main():
   python run.py web --port 8080 # Web sürümünü 8080 portunda çalıştır
   python run.py setup           # Veritabanını başlat
   python run.py info            # Sistem bilgilerini göster
+  python run.py precompute --workers 8  # Skor matrisini 8 süreçle önceden hesapla
         """
     )
     
@@ -131,7 +139,7 @@ def main():
         'mode', 
         nargs='?', 
         default='web',
-        choices=['console', 'web', 'setup', 'info'],
+        choices=['console', 'web', 'setup', 'info', 'precompute'],
         help='Uygulama modu (varsayılan: web)'
     )
     
@@ -154,6 +162,26 @@ def main():
         help='Web sunucusu için debug modunu devre dışı bırak'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Ön hesaplama işçi süreç sayısı (varsayılan: CPU sayısı)'
+    )
+    
+    parser.add_argument(
+        '--tile-size',
+        type=int,
+        default=None,
+        help='Ön hesaplama karo kenar uzunluğu (varsayılan: 2048)'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Önbellek güncel olsa bile skor matrisini yeniden hesapla'
+    )
+    
     args = parser.parse_args()
     
     print("🍷 NeYenir - AI Destekli Yemek & Alkol Eşleştirme Sistemi")
@@ -168,6 +196,8 @@ def main():
         setup_database()
     elif args.mode == 'info':
         show_system_info()
+    elif args.mode == 'precompute':
+        precompute_scores(args.workers, args.tile_size, args.force)
     elif args.mode == 'console':
         run_console_app()
     elif args.mode == 'web':
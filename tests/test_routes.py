@@ -0,0 +1,117 @@
+"""
+Web API uç noktası testleri
+Veritabanı ve türetilen dosyalar geçici bir dizinde oluşturulur.
+Çalıştırma: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+
+_DATA_DIR = tempfile.mkdtemp(prefix="neyenir-test-")
+os.environ['DATABASE_PATH'] = os.path.join(_DATA_DIR, 'food_alcohol_system.db')
+
+from app import create_app  # noqa: E402  (DATABASE_PATH uygulama yüklenmeden ayarlanmalı)
+from app.routes import matcher  # noqa: E402
+
+
+class TablePairingRouteTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+
+    def _table_pairing(self, foods, bottles):
+        response = self.client.post('/api/table_pairing', json={'foods': foods, 'bottles': bottles})
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()['bottles']
+
+    def test_single_bottle_lists_every_dish(self):
+        foods = [food.name for food in matcher.foods[:4]]
+        bottles = self._table_pairing(foods, 1)
+
+        self.assertEqual(len(bottles), 1)
+        self.assertTrue(bottles[0]['dishes'])
+        self.assertEqual(sorted(dish['food'] for dish in bottles[0]['dishes']), sorted(foods))
+
+    def test_each_dish_is_assigned_to_a_selected_bottle(self):
+        foods = [food.name for food in matcher.foods[:6]]
+        bottles = self._table_pairing(foods, 2)
+
+        self.assertTrue(bottles)
+        assigned = sorted(dish['food'] for bottle in bottles for dish in bottle['dishes'])
+        self.assertEqual(assigned, sorted(foods))
+
+
+
+class BatchRecommendationRouteTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+
+    def test_non_integer_top_n_is_rejected(self):
+        for top_n in ('abc', None, [3]):
+            response = self.client.post('/api/recommendations/batch',
+                                        json={'foods': [matcher.foods[0].name], 'top_n': top_n})
+            self.assertEqual(response.status_code, 400, top_n)
+
+    def test_top_n_limits_each_result(self):
+        response = self.client.post('/api/recommendations/batch',
+                                    json={'foods': [matcher.foods[0].name], 'top_n': '2'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['results'][0]['ai_recommendations']), 2)
+
+
+class FoodPageRouteTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+
+    def test_pages_cover_the_catalog_once(self):
+        names, offset = [], 0
+        while True:
+            response = self.client.get(f'/api/foods?offset={offset}&limit=7')
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            names.extend(food['name'] for food in data['foods'])
+            if not data['pagination']['has_more']:
+                break
+            offset = data['pagination']['next_offset']
+        self.assertEqual(names, [food.name for food in matcher.foods])
+
+    def test_recommend_page_renders_only_the_first_page(self):
+        from app.routes import DEFAULT_FOOD_PAGE_LIMIT
+        html = self.client.get('/recommend').get_data(as_text=True)
+        self.assertEqual(html.count('onclick="selectFood('),
+                         min(DEFAULT_FOOD_PAGE_LIMIT, len(matcher.foods)))
+
+
+class FilterValidationRouteTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+        cls.food = matcher.foods[0].name
+
+    def test_unknown_query_filter_value_is_rejected(self):
+        response = self.client.get(f'/api/recommendations/{self.food}?type=bogus')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['unknown_filters'], {'type': ['bogus']})
+
+    def test_known_query_filter_value_is_applied(self):
+        alcohol_type = matcher.alcohols[0].type
+        response = self.client.get(f'/api/recommendations/{self.food}?type={alcohol_type}&limit=50')
+        self.assertEqual(response.status_code, 200)
+        recommendations = response.get_json()['ai_recommendations']
+        self.assertTrue(recommendations)
+        self.assertEqual(len(recommendations), sum(1 for a in matcher.alcohols if a.type == alcohol_type))
+
+    def test_unknown_json_filter_value_is_rejected(self):
+        response = self.client.post('/api/recommendations/batch',
+                                    json={'foods': [self.food], 'filters': {'abv': ['bogus']}})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Vektörel skorlama motoru testleri
+CompatibilityEngine ve UserDelta sonuçları, gönderilen kataloğun tamamında
+calculate_compatibility_score ile karşılaştırılır.
+Çalıştırma: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+
+import numpy as np
+
+from core.matcher import AIFoodAlcoholMatcher, UserProfile
+from core.scoring import top_k_indices
+from core.topk_index import TopKIndex
+
+
+def _profile(**fields) -> UserProfile:
+    values = dict(user_id=1, name='test', age=30, alcohol_tolerance='medium', preferred_flavors=(),
+                  dietary_restrictions=(), budget_preference='mid-range', favorite_cuisines=(),
+                  disliked_alcohols=(), previous_pairings=())
+    values.update(fields)
+    return UserProfile(**values)
+
+
+class _CatalogTestCase(unittest.TestCase):
+    """Gönderilen katalogla kurulan eşleştirici ve referans karşılaştırması"""
+
+    @classmethod
+    def setUpClass(cls):
+        data_dir = tempfile.mkdtemp(prefix="neyenir-test-")
+        cls.matcher = AIFoodAlcoholMatcher(database_path=os.path.join(data_dir, 'food_alcohol_system.db'))
+        cls.engine = cls.matcher.scoring_engine
+        # Açılış ham matrisi hesaplamaz; önceden hesaplanmış matris yolu da sınansın
+        cls.engine.precompute()
+
+    def _reference(self, user_profile=None) -> np.ndarray:
+        return np.array([[self.matcher.calculate_compatibility_score(food, alcohol, user_profile)
+                          for alcohol in self.matcher.alcohols]
+                         for food in self.matcher.foods])
+
+    def _assert_matches_reference(self, user_profile=None):
+        # Motor referans fonksiyonla aynı sırada toplar; sonuçlar birebir eşit olmalı
+        expected = self._reference(user_profile)
+        np.testing.assert_array_equal(self.engine.score_matrix(None, None, user_profile), expected)
+        # Önceden hesaplanmış matris olmadan da (ham skorlar doğrudan hesaplanır)
+        base_matrix, self.engine.base_matrix = self.engine.base_matrix, None
+        try:
+            np.testing.assert_array_equal(self.engine.score_matrix(None, None, user_profile), expected)
+        finally:
+            self.engine.base_matrix = base_matrix
+
+
+class CompatibilityEngineTest(_CatalogTestCase):
+
+    def test_full_catalog_without_profile(self):
+        self._assert_matches_reference()
+
+    def test_full_catalog_with_profile(self):
+        alcohol = self.matcher.alcohols[0]
+        self._assert_matches_reference(_profile(
+            preferred_flavors=tuple(alcohol.flavor_profile[:2]), budget_preference=alcohol.price_range,
+            dietary_restrictions=('vegan',), disliked_alcohols=(alcohol.type,)))
+
+    def test_rows_and_columns_match_matrix(self):
+        profile = _profile(preferred_flavors=('fruity',))
+        matrix = self.engine.score_matrix(None, None, profile)
+        np.testing.assert_array_equal(self.engine.score_row(3, profile), matrix[3])
+        np.testing.assert_array_equal(self.engine.score_column(5, profile), matrix[:, 5])
+
+
+class TopKIndexTest(_CatalogTestCase):
+
+    def test_tiled_build_matches_full_rows(self):
+        base_matrix, self.engine.base_matrix = self.engine.base_matrix, None
+        try:
+            # Karolar yedi alkol genişliğinde; sıralamalar karolar arasında birleştirilir
+            index = TopKIndex.build(self.engine, tile=7)
+        finally:
+            self.engine.base_matrix = base_matrix
+        alcohol_ids = np.array([alcohol.id for alcohol in self.matcher.alcohols])
+        matrix = self.engine.score_matrix()
+        for food_index, row_scores in enumerate(matrix):
+            top = top_k_indices(row_scores, index.k)
+            np.testing.assert_array_equal(index.row(food_index), alcohol_ids[top])
+            np.testing.assert_array_equal(index.scores[food_index, :len(top)], row_scores[top].astype(np.float16))
+
+    def test_startup_serves_without_dense_matrix(self):
+        matcher = AIFoodAlcoholMatcher(database_path=self.matcher.db.path)
+        self.assertIsNone(matcher.scoring_engine.base_matrix)
+        self.assertIsNotNone(matcher.top_k)
+        food = matcher.foods[0]
+        self.assertEqual(matcher.get_recommendations(food.name, top_n=5)['ai_recommendations'],
+                         self.matcher.get_recommendations(food.name, top_n=5)['ai_recommendations'])
+        matcher.close()
+
+
+class UserDeltaTest(_CatalogTestCase):
+    """Ham matris + profil farkı, kişiselleştirilmiş referans skorla aynı olmalı"""
+
+    def test_preferred_flavors(self):
+        flavors = sorted({flavor for alcohol in self.matcher.alcohols for flavor in alcohol.flavor_profile})
+        self._assert_matches_reference(_profile(preferred_flavors=tuple(flavors[:3]) + ('bilinmeyen',)))
+
+    def test_disliked_alcohols_by_name_and_type(self):
+        alcohols = self.matcher.alcohols
+        self._assert_matches_reference(_profile(
+            disliked_alcohols=(alcohols[1].name, alcohols[-1].type, 'bilinmeyen')))
+
+    def test_dietary_restrictions(self):
+        for restrictions in (('vegan',), ('vegetarian', 'vegan'), ('halal',)):
+            with self.subTest(restrictions=restrictions):
+                self._assert_matches_reference(_profile(dietary_restrictions=restrictions))
+
+    def test_budget_preferences(self):
+        for budget in ('budget', 'mid-range', 'premium'):
+            with self.subTest(budget=budget):
+                self._assert_matches_reference(_profile(budget_preference=budget))
+
+    def test_previous_pairings_do_not_change_scores(self):
+        food, alcohol = self.matcher.foods[0], self.matcher.alcohols[0]
+        profile = _profile(preferred_flavors=('sweet',), dietary_restrictions=('vegetarian',),
+                           disliked_alcohols=(alcohol.name,))
+        rated = replace(profile, previous_pairings=((food.id, alcohol.id, 5), (food.id, alcohol.id, 1)))
+        self._assert_matches_reference(rated)
+        np.testing.assert_array_equal(self.engine.score_matrix(None, None, rated),
+                                      self.engine.score_matrix(None, None, profile))
+
+
+if __name__ == '__main__':
+    unittest.main()